@@ -39,7 +39,9 @@ from server.models import (
     tipo_contato_model,
     vinculo_perfil_interesse_model,
     vinculo_perfil_curso_model,
-    usuario_model
+    usuario_model,
+    arquivo_model,
+    arquivo_variante_model
 )
 
 
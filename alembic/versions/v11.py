@@ -0,0 +1,29 @@
+"""Índice da paginação por cursor de perfis
+
+Revision ID: 5c2e8a91d4f7
+Revises: 0b71e18a1efe
+Create Date: 2022-05-02 21:14:08.318842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2e8a91d4f7'
+down_revision = '0b71e18a1efe'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_tb_perfil_nome_exibicao_id',
+        'tb_perfil',
+        [sa.text("coalesce(nome_exibicao, '')"), 'id'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_tb_perfil_nome_exibicao_id', table_name='tb_perfil')
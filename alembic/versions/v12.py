@@ -0,0 +1,32 @@
+"""Índice trigram para a busca por nome de exibição
+
+Revision ID: 8e41b7c03a5d
+Revises: 5c2e8a91d4f7
+Create Date: 2022-05-03 19:42:51.027615
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e41b7c03a5d'
+down_revision = '5c2e8a91d4f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_tb_perfil_nome_exibicao_normalized_trgm',
+        'tb_perfil',
+        ['nome_exibicao_normalized'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'nome_exibicao_normalized': 'gin_trgm_ops'}
+    )
+
+
+def downgrade():
+    op.drop_index('ix_tb_perfil_nome_exibicao_normalized_trgm', table_name='tb_perfil')
@@ -0,0 +1,57 @@
+"""Busca textual de perfis
+
+Revision ID: b37d1f6a9c02
+Revises: 8e41b7c03a5d
+Create Date: 2022-05-05 22:08:17.664310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b37d1f6a9c02'
+down_revision = '8e41b7c03a5d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    op.add_column('tb_perfil', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # Preenche o documento da busca textual dos perfis existentes
+    op.execute(
+        """
+        UPDATE tb_perfil SET search_vector =
+            setweight(to_tsvector('portuguese'::regconfig, coalesce(tb_perfil.nome_exibicao_normalized, '')), 'A') ||
+            setweight(to_tsvector('portuguese'::regconfig, unaccent(concat_ws(' ',
+                (
+                    SELECT string_agg(tb_curso.nome_exibicao, ' ')
+                    FROM tb_curso JOIN tb_vinculo_perfil_curso ON tb_vinculo_perfil_curso.id_curso = tb_curso.id
+                    WHERE tb_vinculo_perfil_curso.id_perfil = tb_perfil.id
+                ),
+                (
+                    SELECT string_agg(tb_interesse.nome_exibicao, ' ')
+                    FROM tb_interesse JOIN tb_vinculo_perfil_interesse
+                        ON tb_vinculo_perfil_interesse.id_interesse = tb_interesse.id
+                    WHERE tb_vinculo_perfil_interesse.id_perfil = tb_perfil.id
+                )
+            ))), 'B') ||
+            setweight(to_tsvector('portuguese'::regconfig, unaccent(coalesce(tb_perfil.bio, ''))), 'C')
+        """
+    )
+
+    op.create_index(
+        'ix_tb_perfil_search_vector',
+        'tb_perfil',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin'
+    )
+
+
+def downgrade():
+    op.drop_index('ix_tb_perfil_search_vector', table_name='tb_perfil')
+    op.drop_column('tb_perfil', 'search_vector')
@@ -0,0 +1,39 @@
+"""Variantes de imagens dos arquivos
+
+Revision ID: 3d9a6f21c4e8
+Revises: b37d1f6a9c02
+Create Date: 2022-05-09 21:14:32.418207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d9a6f21c4e8'
+down_revision = 'b37d1f6a9c02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tb_arquivo_variante',
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('created_by', sa.String(), nullable=True),
+    sa.Column('updated_by', sa.String(), nullable=True),
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('id_arquivo', sa.BigInteger(), nullable=False),
+    sa.Column('nome_variante', sa.String(), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('file_type', sa.String(), nullable=True),
+    sa.Column('largura', sa.Integer(), nullable=True),
+    sa.Column('altura', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['id_arquivo'], ['tb_arquivo.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id_arquivo', 'nome_variante')
+    )
+
+
+def downgrade():
+    op.drop_table('tb_arquivo_variante')
@@ -0,0 +1,26 @@
+"""Hash do conteúdo dos arquivos
+
+Revision ID: 8c2e47b1d5a3
+Revises: 3d9a6f21c4e8
+Create Date: 2022-05-11 19:42:07.531964
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c2e47b1d5a3'
+down_revision = '3d9a6f21c4e8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('tb_arquivo', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_tb_arquivo_content_hash', 'tb_arquivo', ['content_hash'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_tb_arquivo_content_hash', table_name='tb_arquivo')
+    op.drop_column('tb_arquivo', 'content_hash')
@@ -0,0 +1,41 @@
+"""ON DELETE CASCADE nas entidades do perfil
+
+Revision ID: 5f1b9c3e7a24
+Revises: 8c2e47b1d5a3
+Create Date: 2022-05-18 10:14:52.218390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f1b9c3e7a24'
+down_revision = '8c2e47b1d5a3'
+branch_labels = None
+depends_on = None
+
+
+PERFIL_CHILD_TABLES = [
+    'tb_vinculo_perfil_interesse',
+    'tb_vinculo_perfil_curso',
+    'tb_perfil_phone',
+    'tb_perfil_email',
+]
+
+
+def recreate_perfil_foreign_keys(ondelete):
+    for table_name in PERFIL_CHILD_TABLES:
+        constraint_name = f'{table_name}_id_perfil_fkey'
+        op.drop_constraint(constraint_name, table_name, type_='foreignkey')
+        op.create_foreign_key(
+            constraint_name, table_name, 'tb_perfil', ['id_perfil'], ['id'], ondelete=ondelete
+        )
+
+
+def upgrade():
+    recreate_perfil_foreign_keys('CASCADE')
+
+
+def downgrade():
+    recreate_perfil_foreign_keys(None)
@@ -0,0 +1,28 @@
+"""Deduplicação dos arquivos por usuário
+
+Revision ID: a7d3e91c5b62
+Revises: 5f1b9c3e7a24
+Create Date: 2022-05-24 16:08:31.604117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e91c5b62'
+down_revision = '5f1b9c3e7a24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_tb_arquivo_content_hash', table_name='tb_arquivo')
+    op.create_index(
+        'ix_tb_arquivo_created_by_content_hash', 'tb_arquivo', ['created_by', 'content_hash'], unique=True
+    )
+
+
+def downgrade():
+    op.drop_index('ix_tb_arquivo_created_by_content_hash', table_name='tb_arquivo')
+    op.create_index('ix_tb_arquivo_content_hash', 'tb_arquivo', ['content_hash'], unique=True)
@@ -0,0 +1,128 @@
+"""
+    Benchmark da busca de perfis por nome de exibição
+
+    Mede a latência dos filtros de nome (ILIKE '%termo%' e word similarity do pg_trgm)
+    com e sem o índice trigram, para tabelas com 10 mil, 100 mil e 1 milhão de perfis.
+
+    Os perfis são gerados em uma tabela temporária com a mesma estrutura e índices de
+    tb_perfil, portanto o banco de dados apontado pelas variáveis de migração deve estar
+    atualizado (alembic upgrade head). Nenhum dado de tb_perfil é alterado.
+
+    Uso: python -m benchmarks.display_name_search [tamanho ...]
+"""
+
+import sys
+import time
+import statistics
+import psycopg2
+from server.configuration.environment import MigrationEnvironment
+
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+REPETITIONS = 20
+SEARCH_TERMS = ['ana', 'silva', 'joao pedro', 'mariana souza']
+
+FIRST_NAMES = [
+    'Ana', 'Bruno', 'Carla', 'Daniel', 'Eduarda', 'Felipe', 'Gabriela', 'Henrique',
+    'Isabela', 'Joao', 'Karina', 'Lucas', 'Mariana', 'Nicolas', 'Olivia', 'Pedro',
+    'Rafaela', 'Samuel', 'Tatiana', 'Vinicius'
+]
+LAST_NAMES = [
+    'Silva', 'Souza', 'Costa', 'Santos', 'Oliveira', 'Pereira', 'Rodrigues', 'Almeida',
+    'Nascimento', 'Lima', 'Araujo', 'Fernandes', 'Carvalho', 'Gomes', 'Martins', 'Rocha'
+]
+
+QUERIES = {
+    'ilike': (
+        "SELECT id FROM bench_perfil WHERE nome_exibicao_normalized ILIKE %(pattern)s "
+        "ORDER BY id LIMIT 10"
+    ),
+    'word_similarity': (
+        "SELECT id FROM bench_perfil WHERE %(term)s <%% nome_exibicao_normalized "
+        "ORDER BY word_similarity(%(term)s, nome_exibicao_normalized) DESC, id LIMIT 10"
+    ),
+}
+
+
+def get_connection():
+    environment = MigrationEnvironment()
+    return psycopg2.connect(
+        environment.get_db_conn_default(
+            db_host=environment.MIGRATION_DB_HOST,
+            db_name=environment.MIGRATION_DB_NAME,
+            db_port=environment.MIGRATION_DB_PORT,
+            db_pass=environment.MIGRATION_DB_PASS,
+            db_user=environment.MIGRATION_DB_USER
+        )
+    )
+
+
+def create_profiles_table(cursor, size: int):
+    cursor.execute("DROP TABLE IF EXISTS bench_perfil")
+    cursor.execute("CREATE TEMP TABLE bench_perfil (LIKE tb_perfil INCLUDING DEFAULTS INCLUDING INDEXES)")
+    cursor.execute(
+        """
+        INSERT INTO bench_perfil (id, guid, guid_usuario, nome_exibicao, nome_exibicao_normalized)
+        SELECT
+            n,
+            md5(n::text)::uuid,
+            md5('u' || n::text)::uuid,
+            nome,
+            nome
+        FROM (
+            SELECT
+                n,
+                (%(first_names)s::text[])[1 + (n * 7) %% array_length(%(first_names)s::text[], 1)] || ' ' ||
+                (%(last_names)s::text[])[1 + (n * 13) %% array_length(%(last_names)s::text[], 1)] || ' ' ||
+                (%(last_names)s::text[])[1 + (n / 3) %% array_length(%(last_names)s::text[], 1)] AS nome
+            FROM generate_series(1, %(size)s) AS n
+        ) AS nomes
+        """,
+        {'first_names': FIRST_NAMES, 'last_names': LAST_NAMES, 'size': size}
+    )
+    cursor.execute("ANALYZE bench_perfil")
+
+
+def set_index_usage(cursor, enabled: bool):
+    value = 'on' if enabled else 'off'
+    cursor.execute(f"SET enable_bitmapscan = {value}")
+    cursor.execute(f"SET enable_indexscan = {value}")
+
+
+def measure(cursor, query: str, term: str) -> float:
+    params = {'term': term, 'pattern': f'%{term}%'}
+    timings = []
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        cursor.execute(query, params)
+        cursor.fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(sizes):
+    connection = get_connection()
+    connection.autocommit = True
+    cursor = connection.cursor()
+
+    print(f"{'perfis':>10} | {'query':<16} | {'termo':<14} | {'sem índice (ms)':>16} | {'com índice (ms)':>16}")
+    try:
+        for size in sizes:
+            create_profiles_table(cursor, size)
+            for query_name, query in QUERIES.items():
+                for term in SEARCH_TERMS:
+                    set_index_usage(cursor, False)
+                    without_index = measure(cursor, query, term)
+                    set_index_usage(cursor, True)
+                    with_index = measure(cursor, query, term)
+                    print(
+                        f"{size:>10} | {query_name:<16} | {term:<14} | "
+                        f"{without_index:>16.2f} | {with_index:>16.2f}"
+                    )
+    finally:
+        cursor.execute("DROP TABLE IF EXISTS bench_perfil")
+        connection.close()
+
+
+if __name__ == '__main__':
+    run([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES)
@@ -7,6 +7,8 @@ from server.controllers.curso_controller import curso_router
 from server.controllers.interesse_controller import interesse_router
 from server.controllers.tipo_contato_controller import tipo_contato_router
 from server.controllers.arquivo_controller import arquivo_router
+from server.controllers.permissao_controller import permissao_router
+from server.controllers.catalogo_controller import catalogo_router
 from starlette_context.middleware import RawContextMiddleware
 from starlette_context import plugins
 from server.configuration.custom_logging import MICROSERVICE_LOGGER_KWARGS, Logger
@@ -14,6 +16,13 @@ from server.middleware.plugins import custom_request_plugin
 from server.configuration import db
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
+from server.dependencies.get_permission_cache import get_permission_cache
+from server.dependencies.get_profile_cache import get_profile_cache
+from server.dependencies.get_catalog_cache import get_catalog_cache
+from server.dependencies.get_environment_cached import get_environment_cached
+from server.repository.permissao_repository import PermissaoRepository
+from server.configuration.custom_logging import get_main_logger
+import asyncio
 
 
 routers = [
@@ -23,7 +32,9 @@ routers = [
     curso_router,
     interesse_router,
     tipo_contato_router,
-    arquivo_router
+    arquivo_router,
+    permissao_router,
+    catalogo_router
 ]
 
 
@@ -33,6 +44,10 @@ def _init_app():
     app = configura_middlewares(app)
     configura_logger()
     configura_routers(app)
+    configura_db(app)
+    configura_permission_cache(app)
+    configura_catalog_cache(app)
+    configura_profile_cache(app)
     return app
 
 
@@ -78,6 +93,105 @@ def configura_exception_handlers(app):
     return app
 
 
+def configura_db(app):
+
+    """
+        Constrói o sessionmaker único do processo na inicialização da aplicação
+        e libera o pool de conexões no seu encerramento
+    """
+
+    @app.on_event("startup")
+    async def build_session_maker():
+        db.get_async_session_maker_cached()
+
+    @app.on_event("shutdown")
+    async def dispose_engine():
+        await db.create_async_engine_cached().dispose()
+
+
+def configura_permission_cache(app):
+
+    """
+        Carrega o cache de permissões na inicialização da aplicação e agenda
+        a sua recarga periódica, cancelada no encerramento da aplicação
+    """
+
+    refresh_task = {}
+
+    @app.on_event("startup")
+    async def load_permission_cache():
+        environment = get_environment_cached()
+        permission_cache = get_permission_cache()
+        session_maker = db.get_async_session_maker_cached()
+        try:
+            async with session_maker() as session:
+                await permission_cache.load_all(PermissaoRepository(session))
+        except Exception:
+            get_main_logger().warning(
+                "Não foi possível carregar o cache de permissões na inicialização",
+                exc_info=True
+            )
+        refresh_task['task'] = asyncio.create_task(
+            permission_cache.refresh_periodically(
+                session_maker, environment.PERMISSION_CACHE_REFRESH_INTERVAL_IN_SECONDS
+            )
+        )
+
+    @app.on_event("shutdown")
+    async def stop_permission_cache_refresh():
+        task = refresh_task.pop('task', None)
+        if task:
+            task.cancel()
+
+
+def configura_catalog_cache(app):
+
+    """
+        Carrega o cache de catálogos (cursos, interesses e tipos de contato) na inicialização
+        da aplicação e agenda a sua recarga periódica, cancelada no encerramento da aplicação
+    """
+
+    refresh_task = {}
+
+    @app.on_event("startup")
+    async def load_catalog_cache():
+        environment = get_environment_cached()
+        catalog_cache = get_catalog_cache()
+        session_maker = db.get_async_session_maker_cached()
+        try:
+            async with session_maker() as session:
+                await catalog_cache.load_all(session)
+        except Exception:
+            get_main_logger().warning(
+                "Não foi possível carregar o cache de catálogos na inicialização",
+                exc_info=True
+            )
+        refresh_task['task'] = asyncio.create_task(
+            catalog_cache.refresh_periodically(
+                session_maker, environment.CATALOG_CACHE_REFRESH_INTERVAL_IN_SECONDS
+            )
+        )
+
+    @app.on_event("shutdown")
+    async def stop_catalog_cache_refresh():
+        task = refresh_task.pop('task', None)
+        if task:
+            task.cancel()
+
+
+def configura_profile_cache(app):
+
+    """
+        Fecha as conexões com o Redis do cache de perfis no encerramento da aplicação
+    """
+
+    @app.on_event("shutdown")
+    async def close_profile_cache():
+        profile_cache = get_profile_cache()
+        if profile_cache:
+            await profile_cache.close()
+
+
 def configura_routers(app):
     for router in routers:
         app.include_router(**router),
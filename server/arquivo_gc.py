@@ -0,0 +1,56 @@
+"""
+    Coleta de arquivos órfãos (tb_arquivo e objetos do S3 sob o prefixo 'u/')
+
+    Remove os arquivos que não são referenciados por nenhum perfil e os objetos do bucket
+    que não estão registrados no banco de dados, e imprime o relatório do que foi removido.
+    Deve ser executada periodicamente, fora dos processos da API.
+
+    Uso: python -m server.arquivo_gc [--dry-run] [--min-age-in-seconds N]
+"""
+
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from server.configuration.db import get_async_session_maker_cached, create_async_engine_cached
+from server.dependencies.get_environment_cached import get_environment_cached
+from server.dependencies.get_s3_file_uploader_service import get_s3_file_uploader_client_cached
+from server.services.arquivo_gc_service import ArquivoGarbageCollectorService
+from server.services.file_uploader.s3_uploader.s3_uploader_service import S3FileUploaderService
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Coleta de arquivos órfãos')
+    parser.add_argument(
+        '--dry-run', action='store_true',
+        help='Apenas relata o que seria removido'
+    )
+    parser.add_argument(
+        '--min-age-in-seconds', type=int, default=None,
+        help='Idade mínima dos arquivos removidos (padrão: ARQUIVO_GC_MIN_AGE_IN_SECONDS)'
+    )
+    return parser.parse_args()
+
+
+async def run(dry_run: bool, min_age_in_seconds: int):
+    environment = get_environment_cached()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='arquivo-gc') as executor:
+        gc_service = ArquivoGarbageCollectorService(
+            S3FileUploaderService(
+                environment,
+                _client=get_s3_file_uploader_client_cached(),
+                _executor=executor,
+                _timeout_in_seconds=environment.S3_UPLOAD_TIMEOUT_IN_SECONDS
+            ),
+            get_async_session_maker_cached(),
+            environment
+        )
+        try:
+            report = await gc_service.collect(dry_run, min_age_in_seconds)
+        finally:
+            await create_async_engine_cached().dispose()
+    print(report.json(indent=4))
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    asyncio.run(run(args.dry_run, args.min_age_in_seconds))
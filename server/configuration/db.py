@@ -1,11 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from functools import lru_cache
+from typing import Awaitable, Callable
 from server.dependencies.get_environment_cached import get_environment_cached
 
 
 Base = declarative_base()
 
+AFTER_COMMIT_CALLBACKS_KEY = 'after_commit_callbacks'
+
 
 @lru_cache
 def create_async_engine_cached():
@@ -19,10 +22,31 @@ def create_async_engine_cached():
     )
 
 
-def build_async_session_maker():
+@lru_cache
+def get_async_session_maker_cached():
+    """
+        Único sessionmaker do processo, construído na inicialização da aplicação
+        e compartilhado por todas as requisições
+    """
     return sessionmaker(
         create_async_engine_cached(),
         expire_on_commit=False,
         class_=AsyncSession
     )
 
+
+def add_after_commit_callback(session: AsyncSession, callback: Callable[[], Awaitable]):
+    """
+        Agenda uma rotina assíncrona para ser executada após o commit da sessão.
+        As rotinas são executadas por run_after_commit_callbacks e descartadas no rollback
+    """
+    session.info.setdefault(AFTER_COMMIT_CALLBACKS_KEY, []).append(callback)
+
+
+async def run_after_commit_callbacks(session: AsyncSession):
+    for callback in session.info.pop(AFTER_COMMIT_CALLBACKS_KEY, []):
+        await callback()
+
+
+def discard_after_commit_callbacks(session: AsyncSession):
+    session.info.pop(AFTER_COMMIT_CALLBACKS_KEY, None)
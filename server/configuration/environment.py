@@ -1,5 +1,6 @@
 import re
 import pathlib
+from typing import Optional, List
 from pydantic import BaseSettings, EmailStr, Field
 
 
@@ -29,12 +30,63 @@ class Environment(BaseSettings):
     CURSOR_TOKEN_SECRET_KEY: str
     CURSOR_TOKEN_ALGORITHM: str
 
+    # Configurações da busca de perfis
+
+    PROFILE_NAME_SEARCH_MIN_LENGTH: int = 3
+    PROFILE_NAME_SEARCH_MAX_RESULTS: int = 50
+    PROFILE_BATCH_MAX_SIZE: int = 300
+    PROFILE_IMPORT_MAX_SIZE: int = 1000
+
+    # Configurações do cache de permissões
+
+    PERMISSION_CACHE_TTL_IN_SECONDS: int = 900
+    PERMISSION_CACHE_REFRESH_INTERVAL_IN_SECONDS: int = 300
+
+    # Configurações do cache de catálogos (cursos, interesses e tipos de contato)
+
+    CATALOG_CACHE_REFRESH_INTERVAL_IN_SECONDS: int = 600
+
+    # Configurações do cache de tokens de acesso verificados
+
+    VERIFIED_TOKEN_CACHE_MAX_SIZE: int = 10000
+    VERIFIED_TOKEN_CACHE_MAX_TTL_IN_SECONDS: int = 1800
+
+    # Configurações do cache de perfis (Redis). Sem REDIS_URL, o cache é desativado
+
+    REDIS_URL: Optional[str] = None
+    REDIS_SOCKET_TIMEOUT_IN_SECONDS: float = 0.5
+    PROFILE_CACHE_TTL_IN_SECONDS: int = 300
+
     # Configurações AWS
 
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_KEY: str
     AWS_REGION_NAME: str
     AWS_S3_BUCKET: str
+    AWS_S3_ENDPOINT_URL: Optional[str] = None
+    AWS_S3_CONNECT_TIMEOUT_IN_SECONDS: int = 5
+    AWS_S3_READ_TIMEOUT_IN_SECONDS: int = 30
+    AWS_S3_MAX_POOL_CONNECTIONS: int = 10
+    AWS_S3_MAX_ATTEMPTS: int = 3
+
+    S3_UPLOAD_MAX_CONCURRENCY: int = 8
+    S3_UPLOAD_TIMEOUT_IN_SECONDS: int = 60
+    S3_MULTIPART_PART_SIZE_IN_BYTES: int = 5 * 1024 * 1024  # Mínimo do S3 para as partes, exceto a última
+    MAX_UPLOAD_FILE_SIZE_IN_BYTES: int = 10 * 1024 * 1024
+    S3_PRESIGNED_UPLOAD_EXPIRES_IN_SECONDS: int = 900
+
+    # Configurações das variantes de imagens (miniaturas e versões comprimidas)
+
+    IMAGE_VARIANT_THUMBNAIL_SIZES: List[int] = [64, 256]
+    IMAGE_VARIANT_COMPRESSED_MAX_SIZE: int = 1024
+    IMAGE_VARIANT_WEBP_QUALITY: int = 80
+    IMAGE_VARIANT_MAX_WORKERS: int = 2
+
+    # Configurações da coleta de arquivos órfãos (python -m server.arquivo_gc)
+
+    ARQUIVO_GC_MIN_AGE_IN_SECONDS: int = 24 * 60 * 60  # Protege uploads ainda em andamento
+    ARQUIVO_GC_BATCH_SIZE: int = 500  # Máximo de 1000, limite do DeleteObjects do S3
+    ARQUIVO_GC_BATCH_INTERVAL_IN_SECONDS: float = 1.0
 
     @staticmethod
     def get_db_conn_async(database_url: str):
@@ -42,6 +42,72 @@ class UnprocessableEntityException(ApiBaseException):
         super().__init__(status_code, error_id, message, detail)
 
 
+class InvalidCursorException(ApiBaseException):
+    def __init__(
+        self,
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        error_id='INVALID_CURSOR',
+        message='Cursor de paginação inválido',
+        detail=''
+    ) -> None:
+        super().__init__(status_code, error_id, message, detail)
+
+
+class InvalidSortFieldException(ApiBaseException):
+    def __init__(
+        self,
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        error_id='INVALID_SORT_FIELD',
+        message='Campo de ordenação inválido',
+        detail=''
+    ) -> None:
+        super().__init__(status_code, error_id, message, detail)
+
+
+class SearchTermTooShortException(ApiBaseException):
+    def __init__(
+        self,
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        error_id='SEARCH_TERM_TOO_SHORT',
+        message='O termo de busca é muito curto',
+        detail=''
+    ) -> None:
+        super().__init__(status_code, error_id, message, detail)
+
+
+class InvalidProfileFieldsException(ApiBaseException):
+    def __init__(
+        self,
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        error_id='INVALID_PROFILE_FIELDS',
+        message='Os campos do perfil solicitados são inválidos',
+        detail=''
+    ) -> None:
+        super().__init__(status_code, error_id, message, detail)
+
+
+class ProfileImportTooLargeException(ApiBaseException):
+    def __init__(
+        self,
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        error_id='PROFILE_IMPORT_TOO_LARGE',
+        message='A quantidade de perfis importados excede o limite',
+        detail=''
+    ) -> None:
+        super().__init__(status_code, error_id, message, detail)
+
+
+class ProfileBatchTooLargeException(ApiBaseException):
+    def __init__(
+        self,
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        error_id='PROFILE_BATCH_TOO_LARGE',
+        message='A quantidade de perfis buscados excede o limite',
+        detail=''
+    ) -> None:
+        super().__init__(status_code, error_id, message, detail)
+
+
 class EmailAlreadyConfirmedException(ApiBaseException):
     def __init__(
         self,
@@ -229,6 +295,28 @@ class InterestNotFoundException(ApiBaseException):
         super().__init__(status_code, error_id, message, detail)
 
 
+class UploadedFileNotFoundException(ApiBaseException):
+    def __init__(
+        self,
+        status_code=status.HTTP_404_NOT_FOUND,
+        error_id='UPLOADED_FILE_NOT_FOUND',
+        message='O arquivo não foi encontrado no armazenamento',
+        detail=''
+    ) -> None:
+        super().__init__(status_code, error_id, message, detail)
+
+
+class FileKeyNotAllowedException(ApiBaseException):
+    def __init__(
+        self,
+        status_code=status.HTTP_403_FORBIDDEN,
+        error_id='FILE_KEY_NOT_ALLOWED',
+        message='A chave do arquivo não pertence ao usuário',
+        detail=''
+    ) -> None:
+        super().__init__(status_code, error_id, message, detail)
+
+
 class InvalidUsernamePasswordException(ApiBaseException):
     def __init__(
         self,
@@ -262,6 +350,28 @@ class NotEnoughPermissionsException(ApiBaseException):
         super().__init__(status_code, error_id, message, detail)
 
 
+class FileUploadTimeoutException(ApiBaseException):
+    def __init__(
+        self,
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        error_id='FILE_UPLOAD_TIMEOUT',
+        message='O upload do arquivo excedeu o tempo limite',
+        detail=''
+    ) -> None:
+        super().__init__(status_code, error_id, message, detail)
+
+
+class FileTooLargeException(ApiBaseException):
+    def __init__(
+        self,
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        error_id='FILE_TOO_LARGE',
+        message='O arquivo excede o tamanho máximo permitido',
+        detail=''
+    ) -> None:
+        super().__init__(status_code, error_id, message, detail)
+
+
 def generic_exception_handler(_: Request, exception: Exception):
     return api_base_exception_handler(_, ApiBaseException())
 
@@ -6,9 +6,12 @@
 """
 
 from server.configuration.exceptions import ApiBaseException
-from server.configuration.db import AsyncSession
+from server.configuration.db import AsyncSession, run_after_commit_callbacks, discard_after_commit_callbacks
 from server.configuration.custom_logging import get_main_logger
+from server import utils
 from functools import wraps
+from typing import Optional
+from fastapi import Request, Response, status
 
 
 MAIN_LOGGER = get_main_logger()
@@ -28,7 +31,6 @@ def endpoint_exception_handler(func):
             MAIN_LOGGER.info("Fim da rotina do endpoint. Commit da sessão do banco de dados acionado")
             if session:
                 await session.commit()
-            return result
         except ApiBaseException as ex:
             MAIN_LOGGER.warning(
                 "Ocorreu um problema no endpoint. O problema foi detectado, mas não tratado. " 
@@ -37,6 +39,7 @@ def endpoint_exception_handler(func):
             )
             if session:
                 await session.rollback()
+                discard_after_commit_callbacks(session)
             raise ex
         except Exception as ex:
             MAIN_LOGGER.error(
@@ -46,12 +49,55 @@ def endpoint_exception_handler(func):
             )
             if session:
                 await session.rollback()
+                discard_after_commit_callbacks(session)
             raise ex
         finally:
+            # A sessão pertence à requisição e é fechada pela dependência get_session
             MAIN_LOGGER.info(
-                "Fim do endpoint e da sessão do banco de dados"
+                "Fim do endpoint e da transação do banco de dados"
             )
-            if session:
-                await session.close()
+
+        # Rotinas pós-commit (como invalidações de cache) são best-effort: uma falha
+        # não pode transformar em erro uma escrita que já foi confirmada
+        if session:
+            try:
+                await run_after_commit_callbacks(session)
+            except Exception:
+                MAIN_LOGGER.warning("Falha nas rotinas executadas após o commit", exc_info=True)
+        return result
     return wrapper
 
+
+def is_not_modified(request: Request, etag: str) -> bool:
+
+    """
+        Avalia a pré-condição If-None-Match da requisição (RFC 7232)
+    """
+
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is None:
+        return False
+    # If-None-Match usa a comparação fraca: W/"x" corresponde a "x"
+    etags = {tag.strip().replace('W/', '', 1) for tag in if_none_match.split(',')}
+    return '*' in etags or etag in etags
+
+
+def get_conditional_response(
+    request: Request, content: bytes, etag: Optional[str] = None, cache_control: str = 'no-cache'
+) -> Response:
+
+    """
+        Resposta JSON com o cabeçalho ETag. Se a pré-condição da requisição indicar
+        que o cliente já possui o conteúdo, retorna 304 (Not Modified) sem corpo
+
+        Last-Modified não é enviado: remoções (ou inserções com updated_at antigo)
+        não alteram o maior updated_at do conteúdo, e If-Modified-Since resultaria
+        em 304 para um conteúdo alterado
+    """
+
+    etag = etag or utils.get_strong_etag(content)
+    headers = {'ETag': etag, 'Cache-Control': cache_control}
+
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=content, media_type='application/json', headers=headers)
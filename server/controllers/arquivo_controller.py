@@ -3,7 +3,7 @@ from fastapi import APIRouter
 from server.dependencies.session import get_session
 from server.dependencies.get_environment_cached import get_environment_cached
 from server.configuration.db import AsyncSession
-from fastapi import Depends, Security, Query
+from fastapi import Depends, Security, Query, File, UploadFile, BackgroundTasks
 from server.controllers import endpoint_exception_handler
 from typing import List, Optional
 from server.dependencies.get_current_user import get_current_user
@@ -12,7 +12,11 @@ from server.configuration.environment import Environment
 from server.services.arquivo_service import ArquivoService
 from server.services.file_uploader.uploader import FileUploaderService
 from server.dependencies.get_s3_file_uploader_service import get_s3_file_uploader_service
-from server.schemas.arquivo_schema import ArquivoInput, ArquivoOutput
+from server.dependencies.get_image_variant_service import get_image_variant_service
+from server.services.image_variant_service import ImageVariantService
+from server.schemas.arquivo_schema import (
+    ArquivoInput, ArquivoOutput, PresignedUploadInput, PresignedUploadOutput, PresignedUploadCompleteInput
+)
 from server.repository.arquivo_repository import ArquivoRepository
 
 
@@ -44,10 +48,12 @@ arquivo_router = dict(
 @endpoint_exception_handler
 async def upload_file(
     file_input: ArquivoInput,
+    background_tasks: BackgroundTasks,
     current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
-    file_uploader_service: FileUploaderService = Depends(get_s3_file_uploader_service)
+    file_uploader_service: FileUploaderService = Depends(get_s3_file_uploader_service),
+    image_variant_service: ImageVariantService = Depends(get_image_variant_service)
 ):
 
     """
@@ -72,7 +78,199 @@ async def upload_file(
     arquivo_service = ArquivoService(
         arquivo_repo=ArquivoRepository(session, environment),
         environment=environment,
-        file_uploader_service=file_uploader_service
+        file_uploader_service=file_uploader_service,
+        image_variant_service=image_variant_service,
+        background_tasks=background_tasks
     )
 
     return await arquivo_service.upload_arquivo(file_input, current_user)
+
+
+@router.post(
+    "/upload/multipart",
+    response_model=ArquivoOutput,
+    summary='Faz o upload de um arquivo enviado via multipart/form-data',
+    response_description='Retorna o arquivo criado no banco de dados junto com a URL do arquivo',
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        413: {
+            'model': error_schema.ErrorOutput413,
+        },
+        422: {
+            'model': error_schema.ErrorOutput422,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        },
+        504: {
+            'model': error_schema.ErrorOutput504
+        }
+    }
+)
+@endpoint_exception_handler
+async def upload_file_multipart(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
+    session: AsyncSession = Depends(get_session),
+    environment: Environment = Depends(get_environment_cached),
+    file_uploader_service: FileUploaderService = Depends(get_s3_file_uploader_service),
+    image_variant_service: ImageVariantService = Depends(get_image_variant_service)
+):
+
+    """
+        # Descrição
+
+        Faz o upload de um arquivo enviado no campo 'file' de um formulário multipart/form-data.
+        O nome e o tipo do arquivo são obtidos do próprio formulário.
+
+        Diferente do upload em BASE 64, o arquivo é enviado ao armazenamento em partes, sem
+        ser mantido inteiro em memória.
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(FILE_TOO_LARGE, 413)**: O arquivo excede o tamanho máximo permitido.
+        - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
+        no formato de string, contendo os erros de validação encontrados.
+        - **(FILE_UPLOAD_TIMEOUT, 504)**: O upload do arquivo excedeu o tempo limite.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+    """
+
+    arquivo_service = ArquivoService(
+        arquivo_repo=ArquivoRepository(session, environment),
+        environment=environment,
+        file_uploader_service=file_uploader_service,
+        image_variant_service=image_variant_service,
+        background_tasks=background_tasks
+    )
+
+    return await arquivo_service.upload_arquivo_stream(file, current_user)
+
+
+@router.post(
+    "/presigned-upload",
+    response_model=PresignedUploadOutput,
+    summary='Gera os dados para o upload de um arquivo diretamente no armazenamento',
+    response_description='Retorna a URL e os campos do formulário que devem ser enviados ao armazenamento',
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        422: {
+            'model': error_schema.ErrorOutput422,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        }
+    }
+)
+@endpoint_exception_handler
+async def create_presigned_upload(
+    presigned_upload_input: PresignedUploadInput,
+    current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
+    environment: Environment = Depends(get_environment_cached),
+    file_uploader_service: FileUploaderService = Depends(get_s3_file_uploader_service)
+):
+
+    """
+        # Descrição
+
+        Gera os dados para que o cliente faça o upload de um arquivo diretamente no armazenamento (S3),
+        sem que o conteúdo do arquivo passe pela API.
+
+        O cliente deve enviar um POST multipart/form-data para a **url** retornada, com todos os campos
+        de **fields** seguidos do campo 'file' com o conteúdo do arquivo. O tipo do arquivo deve ser o
+        mesmo informado nesta requisição e o tamanho é limitado pelo armazenamento.
+
+        Após o upload, o arquivo deve ser registrado pelo endpoint **/files/presigned-upload/complete**,
+        informando a **key** retornada.
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
+        no formato de string, contendo os erros de validação encontrados.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+    """
+
+    arquivo_service = ArquivoService(
+        environment=environment,
+        file_uploader_service=file_uploader_service
+    )
+
+    return await arquivo_service.create_presigned_upload(presigned_upload_input, current_user)
+
+
+@router.post(
+    "/presigned-upload/complete",
+    response_model=ArquivoOutput,
+    summary='Registra um arquivo enviado diretamente ao armazenamento',
+    response_description='Retorna o arquivo criado no banco de dados junto com a URL do arquivo',
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        403: {
+            'model': error_schema.ErrorOutput403,
+        },
+        404: {
+            'model': error_schema.ErrorOutput404,
+        },
+        422: {
+            'model': error_schema.ErrorOutput422,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        }
+    }
+)
+@endpoint_exception_handler
+async def complete_presigned_upload(
+    presigned_upload_complete_input: PresignedUploadCompleteInput,
+    background_tasks: BackgroundTasks,
+    current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
+    session: AsyncSession = Depends(get_session),
+    environment: Environment = Depends(get_environment_cached),
+    file_uploader_service: FileUploaderService = Depends(get_s3_file_uploader_service),
+    image_variant_service: ImageVariantService = Depends(get_image_variant_service)
+):
+
+    """
+        # Descrição
+
+        Verifica se o arquivo de chave **key**, gerada pelo endpoint **/files/presigned-upload**,
+        foi enviado ao armazenamento e o registra no banco de dados.
+
+        O arquivo registrado pode ser utilizado como imagem de perfil a partir do campo
+        'id_imagem_perfil' da atualização de perfil. Repetir a requisição para uma chave
+        já registrada retorna o arquivo existente.
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(FILE_KEY_NOT_ALLOWED, 403)**: A chave do arquivo não pertence ao usuário atual
+        ou pertence a uma variante gerada pelo sistema.
+        - **(UPLOADED_FILE_NOT_FOUND, 404)**: O arquivo não foi encontrado no armazenamento.
+        - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
+        no formato de string, contendo os erros de validação encontrados.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+    """
+
+    arquivo_service = ArquivoService(
+        arquivo_repo=ArquivoRepository(session, environment),
+        environment=environment,
+        file_uploader_service=file_uploader_service,
+        image_variant_service=image_variant_service,
+        background_tasks=background_tasks
+    )
+
+    return await arquivo_service.complete_presigned_upload(presigned_upload_complete_input, current_user)
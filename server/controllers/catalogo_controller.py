@@ -0,0 +1,101 @@
+from server.schemas import usuario_schema
+from fastapi import APIRouter, Response
+from fastapi import Depends, Security, status
+from server.dependencies.get_current_user import get_current_user
+from server.dependencies.get_catalog_cache import get_catalog_cache
+from server.schemas import error_schema
+from server.schemas.catalogo_schema import CatalogCacheStatsOutput
+from server.services.catalogo_cache_service import CatalogoCacheService
+from server.constants.permission import RoleBasedPermission
+
+
+router = APIRouter()
+catalogo_router = dict(
+    router=router,
+    prefix="/catalog",
+    tags=["Catálogos"],
+)
+
+
+@router.get(
+    "/cache/stats",
+    response_model=CatalogCacheStatsOutput,
+    summary='Retorna as estatísticas do cache de catálogos',
+    response_description='Retorna as estatísticas do cache de catálogos',
+    include_in_schema=False,
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        }
+    }
+)
+async def get_catalog_cache_stats(
+    _: usuario_schema.CurrentUserToken = Security(
+        get_current_user, scopes=[RoleBasedPermission.ANY_OP.value]),
+    catalog_cache: CatalogoCacheService = Depends(get_catalog_cache)
+):
+
+    """
+        # Descrição
+
+        Retorna os contadores de acertos (hits) e faltas (misses) do cache de catálogos
+        deste processo, além da quantidade de cursos, interesses e tipos de contato
+        armazenados (nulo para um catálogo não carregado). Apenas usuários com cargos com
+        permissão 'ANY_OP' (Qualquer operação) possuem a autorização para acessar essa requisição.
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(NOT_ENOUGH_PERMISSION, 401)**: O usuário não possui a permissão 'ANY_OP'.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+
+    """
+
+    return catalog_cache.get_stats()
+
+
+@router.delete(
+    "/cache",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary='Invalida o cache de catálogos',
+    include_in_schema=False,
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        }
+    }
+)
+async def invalidate_catalog_cache(
+    _: usuario_schema.CurrentUserToken = Security(
+        get_current_user, scopes=[RoleBasedPermission.ANY_OP.value]),
+    catalog_cache: CatalogoCacheService = Depends(get_catalog_cache)
+):
+
+    """
+        # Descrição
+
+        Descarta os catálogos de cursos, interesses e tipos de contato do cache deste
+        processo. Os catálogos serão lidos novamente do banco de dados na próxima consulta.
+        Deve ser chamado após alterações nessas tabelas. Apenas usuários com cargos com
+        permissão 'ANY_OP' (Qualquer operação) possuem a autorização para acessar essa requisição.
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(NOT_ENOUGH_PERMISSION, 401)**: O usuário não possui a permissão 'ANY_OP'.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+
+    """
+
+    catalog_cache.invalidate()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,12 +1,14 @@
 from server.schemas import usuario_schema
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from server.dependencies.session import get_session
 from server.dependencies.get_environment_cached import get_environment_cached
 from server.configuration.db import AsyncSession
 from fastapi import Depends, Security, Query
-from server.controllers import endpoint_exception_handler
+from server.controllers import endpoint_exception_handler, get_conditional_response
 from typing import List, Optional
 from server.dependencies.get_current_user import get_current_user
+from server.dependencies.get_catalog_cache import get_catalog_cache
+from server.services.catalogo_cache_service import CatalogoCacheService
 from server.schemas import error_schema
 from server.configuration.environment import Environment
 from server.schemas.curso_schema import CursoOutput
@@ -41,9 +43,11 @@ curso_router = dict(
 )
 @endpoint_exception_handler
 async def get_all_courses(
+    request: Request,
     _: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    catalogo_cache: CatalogoCacheService = Depends(get_catalog_cache),
 ):
 
     """
@@ -51,6 +55,9 @@ async def get_all_courses(
 
         Retorna todos os cursos cadastrados no sistema.
 
+        A resposta inclui o cabeçalho ETag (hash do conteúdo). Requisições com If-None-Match
+        correspondente recebem 304 (Not Modified), sem corpo
+
         # Erros
 
         Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
@@ -67,8 +74,10 @@ async def get_all_courses(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        catalogo_cache=catalogo_cache
     )
 
-    return await curso_service.get_all_courses()
+    snapshot = await curso_service.get_all_courses_snapshot()
+    return get_conditional_response(request, snapshot.content, snapshot.etag)
 
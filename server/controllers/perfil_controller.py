@@ -3,9 +3,9 @@ from fastapi import APIRouter, Response
 from server.dependencies.session import get_session
 from server.dependencies.get_environment_cached import get_environment_cached
 from server.configuration.db import AsyncSession
-from fastapi import Depends, Security
-from server.controllers import endpoint_exception_handler
-from typing import List, Optional
+from fastapi import Depends, Security, File, UploadFile, BackgroundTasks
+from server.controllers import endpoint_exception_handler, get_conditional_response
+from typing import List, Optional, Set
 from server.dependencies.get_current_user import get_current_user
 from server.schemas import error_schema
 from server.schemas import perfil_schema
@@ -17,8 +17,11 @@ from server.repository.curso_repository import CursoRepository
 from server.repository.interesse_repository import InteresseRepository
 from server.schemas.perfil_schema import (
     PaginatedPerfilOutput, PerfilOutput, PerfilPostInput,
-    PerfilPatchInput, PerfilUsuarioPostInput
+    PerfilPatchInput, PerfilUsuarioPostInput, PerfilBatchInput, PerfilBatchOutput,
+    VinculosPerfilPutInput, VinculosPerfilPatchInput, PerfilUsuarioImportInput, PerfilUsuarioImportOutput
 )
+from server.schemas.curso_schema import CursoOutput
+from server.schemas.interesse_schema import InteresseOutput
 from fastapi import Request, status
 from uuid import UUID as GUID
 from server.schemas.perfil_email_schema import PerfilEmailPatchInput, PerfilEmailOutput, PerfilEmailPostInput
@@ -26,21 +29,43 @@ from server.schemas.perfil_phone_schema import PerfilPhoneOutput, PerfilPhonePat
 from server.repository.tipo_contato_repository import TipoContatoRepository
 from server.services.file_uploader.uploader import FileUploaderService
 from server.dependencies.get_s3_file_uploader_service import get_s3_file_uploader_service
+from server.dependencies.get_image_variant_service import get_image_variant_service
+from server.services.image_variant_service import ImageVariantService
 from server.repository.arquivo_repository import ArquivoRepository
 from server.services.arquivo_service import ArquivoService
 from server.constants.permission import RoleBasedPermission
 from server.repository.usuario_repository import UsuarioRepository
+from server.dependencies.get_profile_cache import get_profile_cache
+from server.services.perfil_cache_service import PerfilCacheService
+from server.dependencies.get_catalog_cache import get_catalog_cache
+from server.services.catalogo_cache_service import CatalogoCacheService
 
 
 async def all_profiles_query_params(
     interests_in: Optional[List[int]] = perfil_schema.InterestQuery,
     courses_in: Optional[List[int]] = perfil_schema.CourseQuery,
-    display_name_ilike: Optional[str] = perfil_schema.DisplayNameIlikeQuery
+    display_name_ilike: Optional[str] = perfil_schema.DisplayNameIlikeQuery,
+    search: Optional[str] = perfil_schema.SearchQuery
 ):
     return {
         "interests_in": interests_in,
         "courses_in": courses_in,
-        "display_name_ilike": display_name_ilike
+        "display_name_ilike": display_name_ilike,
+        "search": search
+    }
+
+
+async def profile_fields_query_params(
+    fields: Optional[str] = perfil_schema.FieldsQuery
+):
+    return PerfilService.get_fields_by_param(fields)
+
+
+async def profiles_sort_query_params(
+    sort_by: Optional[str] = perfil_schema.SortByQuery
+):
+    return {
+        "sort_by": sort_by
     }
 
 
@@ -55,6 +80,7 @@ perfil_router = dict(
 @router.get(
     "",
     response_model=PaginatedPerfilOutput,
+    response_model_exclude_unset=True,
     summary='Retorna todos os perfis a partir de filtros contidos na query string',
     response_description='Retorna todos os perfis a partir de filtros contidos na query string',
     responses={
@@ -74,7 +100,9 @@ async def get_all_profiles(
     request: Request,
     _: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     profiles_query_params: dict = Depends(all_profiles_query_params),
+    sort_params: dict = Depends(profiles_sort_query_params),
     pagination_params: dict = Depends(pagination_parameters),
+    fields: Optional[Set[str]] = Depends(profile_fields_query_params),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
 ):
@@ -90,11 +118,21 @@ async def get_all_profiles(
         preenchido na query string na próxima requisição. Para facilitar, o formato da nova
         URL de busca também é preenchida na resposta, no campo 'next_url'.
 
+        Da mesma forma, o campo 'previous_cursor' (e 'previous_url') permite voltar para a
+        página anterior. A ordenação é definida pelo parâmetro 'sort_by', sempre desempatada
+        pelo ID do perfil, de forma que nenhum perfil é repetido ou pulado entre as páginas.
+
+        O parâmetro 'search' faz uma busca textual nos nomes de exibição, bios, cursos e
+        interesses dos perfis. Nesse caso, os perfis são ordenados pela relevância por padrão.
+
         # Erros
 
         Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
 
         - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(INVALID_CURSOR, 422)**: Cursor de paginação inválido.
+        - **(INVALID_SORT_FIELD, 422)**: Campo de ordenação inválido.
+        - **(INVALID_PROFILE_FIELDS, 422)**: Campo do perfil inexistente no parâmetro 'fields'.
         - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
         no formato de string, contendo os erros de validação encontrados.
         - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
@@ -102,8 +140,9 @@ async def get_all_profiles(
     """
 
     filter_params_dict = profiles_query_params
+    sort_field_key = sort_params['sort_by']
     limit = pagination_params['limit']
-    offset = pagination_params['cursor']
+    cursor = pagination_params['cursor']
 
     perfil_service = PerfilService(
         perfil_repo=PerfilRepository(
@@ -114,9 +153,70 @@ async def get_all_profiles(
     )
 
     return await perfil_service.get_all_profiles_paginated(
-        filter_params_dict, request, limit, offset
+        filter_params_dict, request, limit, cursor, sort_field_key, fields
+    )
+
+
+@router.get(
+    "/search/display-name",
+    response_model=List[PerfilOutput],
+    response_model_exclude_unset=True,
+    summary='Busca perfis pelo nome de exibição, ordenados pela semelhança com o termo',
+    response_description='Retorna os perfis com nome de exibição mais semelhante ao termo buscado',
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        422: {
+            'model': error_schema.ErrorOutput422,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        }
+    }
+)
+@endpoint_exception_handler
+async def search_profiles_by_display_name(
+    term: str = perfil_schema.DisplayNameSearchQuery,
+    page_size: int = perfil_schema.DisplayNameSearchPageSizeQuery,
+    _: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
+    fields: Optional[Set[str]] = Depends(profile_fields_query_params),
+    session: AsyncSession = Depends(get_session),
+    environment: Environment = Depends(get_environment_cached),
+):
+
+    """
+        # Descrição
+
+        Busca perfis a partir do nome de exibição, tolerando erros de digitação e acentos.
+        Os resultados são ordenados pela semelhança do nome de exibição com o termo buscado.
+
+        O termo deve ter um tamanho mínimo (3 caracteres, por padrão) e a quantidade de
+        resultados é limitada pelo parâmetro 'page_size'.
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(SEARCH_TERM_TOO_SHORT, 422)**: O termo de busca é menor que o tamanho mínimo.
+        - **(INVALID_PROFILE_FIELDS, 422)**: Campo do perfil inexistente no parâmetro 'fields'.
+        - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
+        no formato de string, contendo os erros de validação encontrados.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+
+    """
+
+    perfil_service = PerfilService(
+        perfil_repo=PerfilRepository(
+            db_session=session,
+            environment=environment
+        ),
+        environment=environment
     )
 
+    return await perfil_service.search_profiles_by_display_name(term, page_size, fields)
+
 
 @router.post(
     "",
@@ -181,9 +281,144 @@ async def insert_profile(
     )
 
 
+@router.post(
+    "/import",
+    response_model=PerfilUsuarioImportOutput,
+    summary='Importa, em lote, perfis e usuários na tabela de usuário (neste microserviço)',
+    response_description='Retorna a situação da importação de cada perfil',
+    include_in_schema=False,
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        422: {
+            'model': error_schema.ErrorOutput422,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        }
+    }
+)
+@endpoint_exception_handler
+async def import_profiles(
+    perfil_usuario_import_input: PerfilUsuarioImportInput,
+    _: usuario_schema.CurrentUserToken = Security(
+        get_current_user, scopes=[RoleBasedPermission.ANY_OP.value]),
+    session: AsyncSession = Depends(get_session),
+    environment: Environment = Depends(get_environment_cached),
+):
+
+    """
+        # Descrição
+
+        Importa, em lote, perfis e usuários (tb_usuario). Apenas usuários com cargos com permissão
+        'ANY_OP' (Qualquer operação) possuem a autorização para acessar essa requisição.
+
+        Os usuários e os perfis são inseridos com um único INSERT para cada tabela. Retorna,
+        para cada item, a situação da importação:
+
+        - **created**: O perfil foi criado
+        - **already_exists**: Já existia um perfil para o usuário
+        - **user_conflict**: O usuário conflita com outro usuário (username ou e-mail) e o perfil não foi criado
+
+        O 'guid_usuario' de cada perfil deve ser igual ao 'guid' do usuário do mesmo item. A imagem
+        de perfil ('id_imagem_perfil' e 'imagem_perfil') não é aceita na importação.
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(PROFILE_IMPORT_TOO_LARGE, 422)**: A quantidade de perfis excede o limite.
+        - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
+        no formato de string, contendo os erros de validação encontrados.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+
+    """
+
+    perfil_service = PerfilService(
+        usuario_repo=UsuarioRepository(
+            db_session=session,
+            environment=environment
+        ),
+        perfil_repo=PerfilRepository(
+            db_session=session,
+            environment=environment
+        ),
+        environment=environment
+    )
+
+    return await perfil_service.import_profiles(perfil_usuario_import_input.items)
+
+
+@router.post(
+    "/batch",
+    response_model=PerfilBatchOutput,
+    response_model_exclude_unset=True,
+    summary='Retorna vários perfis a partir dos GUIDs dos perfis ou dos usuários',
+    response_description='Retorna os perfis encontrados e os GUIDs sem perfil',
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        422: {
+            'model': error_schema.ErrorOutput422,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        }
+    }
+)
+@endpoint_exception_handler
+async def get_profiles_batch(
+    perfil_batch_input: PerfilBatchInput,
+    _: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
+    fields: Optional[Set[str]] = Depends(profile_fields_query_params),
+    session: AsyncSession = Depends(get_session),
+    environment: Environment = Depends(get_environment_cached),
+):
+
+    """
+        # Descrição
+
+        Retorna, em uma única requisição, os perfis a partir de listas de GUIDs de perfis
+        ('guids') e de GUIDs de usuários ('guids_usuario'). Substitui várias chamadas aos
+        endpoints de busca de um perfil, como na montagem de listas de cartões de perfil.
+
+        Os perfis são retornados na ordem das listas, sem repetições. Os GUIDs que não
+        possuem perfil são retornados nos campos 'not_found_guids' e 'not_found_guids_usuario'.
+        A quantidade total de GUIDs é limitada (300, por padrão).
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(PROFILE_BATCH_TOO_LARGE, 422)**: A quantidade de GUIDs excede o limite.
+        - **(INVALID_PROFILE_FIELDS, 422)**: Campo do perfil inexistente no parâmetro 'fields'.
+        - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
+        no formato de string, contendo os erros de validação encontrados.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+
+    """
+
+    perfil_service = PerfilService(
+        perfil_repo=PerfilRepository(
+            db_session=session,
+            environment=environment
+        ),
+        environment=environment
+    )
+
+    return await perfil_service.get_profiles_batch(
+        perfil_batch_input.guids, perfil_batch_input.guids_usuario, fields
+    )
+
+
 @router.get(
     "/{guid_perfil}",
     response_model=PerfilOutput,
+    response_model_exclude_unset=True,
     summary='Retorna o perfil a partir de seu GUID',
     response_description='Retorna o perfil criado a partir do seu GUID',
     responses={
@@ -205,8 +440,10 @@ async def insert_profile(
 async def get_profile_by_guid(
     guid_perfil: GUID,
     _: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
+    fields: Optional[Set[str]] = Depends(profile_fields_query_params),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
 ):
 
     """
@@ -220,6 +457,7 @@ async def get_profile_by_guid(
 
         - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
         - **(PROFILE_NOT_FOUND, 404)**: Perfil não encontrado no sistema.
+        - **(INVALID_PROFILE_FIELDS, 422)**: Campo do perfil inexistente no parâmetro 'fields'.
         - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
         no formato de string, contendo os erros de validação encontrados.
         - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
@@ -231,15 +469,17 @@ async def get_profile_by_guid(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        perfil_cache=perfil_cache
     )
 
-    return await perfil_service.get_profile_by_guid(str(guid_perfil))
+    return await perfil_service.get_profile_by_guid(str(guid_perfil), fields)
 
 
 @router.get(
     "/user/find-user-by-guid/{guid_usuario}",
     response_model=PerfilOutput,
+    response_model_exclude_unset=True,
     summary='Retorna o perfil a partir do GUID do usuário',
     response_description='Retorna o perfil a partir do GUID do usuário',
     responses={
@@ -261,8 +501,10 @@ async def get_profile_by_guid(
 async def get_profile_by_guid_usuario(
     guid_usuario: GUID,
     _: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
+    fields: Optional[Set[str]] = Depends(profile_fields_query_params),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
 ):
 
     """
@@ -276,6 +518,7 @@ async def get_profile_by_guid_usuario(
 
         - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
         - **(PROFILE_NOT_FOUND, 404)**: Perfil não encontrado no sistema.
+        - **(INVALID_PROFILE_FIELDS, 422)**: Campo do perfil inexistente no parâmetro 'fields'.
         - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
         no formato de string, contendo os erros de validação encontrados.
         - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
@@ -287,15 +530,17 @@ async def get_profile_by_guid_usuario(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        perfil_cache=perfil_cache
     )
 
-    return await perfil_service.get_profile_by_guid_usuario(str(guid_usuario))
+    return await perfil_service.get_profile_by_guid_usuario(str(guid_usuario), fields)
 
 
 @router.get(
     "/user/me",
     response_model=PerfilOutput,
+    response_model_exclude_unset=True,
     summary='Busca o perfil do usuário atual',
     response_description='Retorna o perfil do usuário atual',
     responses={
@@ -315,9 +560,12 @@ async def get_profile_by_guid_usuario(
 )
 @endpoint_exception_handler
 async def get_own_profile(
+    request: Request,
     current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
+    fields: Optional[Set[str]] = Depends(profile_fields_query_params),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
 ):
 
     """
@@ -326,11 +574,15 @@ async def get_own_profile(
         Busca o perfil do usuário atual, além de todas as relações com as demais entidades
         vinculadas ao perfil
 
+        A resposta inclui o cabeçalho ETag (hash do conteúdo). Requisições com If-None-Match
+        correspondente recebem 304 (Not Modified), sem corpo
+
         # Erros
 
         Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
 
         - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(INVALID_PROFILE_FIELDS, 422)**: Campo do perfil inexistente no parâmetro 'fields'.
         - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
         no formato de string, contendo os erros de validação encontrados.
         - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
@@ -342,12 +594,16 @@ async def get_own_profile(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        perfil_cache=perfil_cache
     )
 
     guid_usuario = current_user.guid
 
-    return await perfil_service.get_profile_by_guid_usuario(guid_usuario)
+    perfil = await perfil_service.get_profile_by_guid_usuario(guid_usuario, fields)
+    return get_conditional_response(
+        request, PerfilService.get_profile_json_content(perfil), cache_control='private, no-cache'
+    )
 
 
 @router.post(
@@ -373,10 +629,12 @@ async def get_own_profile(
 @endpoint_exception_handler
 async def post_own_profile(
     perfil_input: PerfilPostInput,
+    background_tasks: BackgroundTasks,
     current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
-    file_uploader_service: FileUploaderService = Depends(get_s3_file_uploader_service)
+    file_uploader_service: FileUploaderService = Depends(get_s3_file_uploader_service),
+    image_variant_service: ImageVariantService = Depends(get_image_variant_service)
 ):
 
     """
@@ -402,7 +660,9 @@ async def post_own_profile(
     arquivo_service = ArquivoService(
         arquivo_repo=ArquivoRepository(session, environment),
         environment=environment,
-        file_uploader_service=file_uploader_service
+        file_uploader_service=file_uploader_service,
+        image_variant_service=image_variant_service,
+        background_tasks=background_tasks
     )
 
     perfil_service = PerfilService(
@@ -420,6 +680,7 @@ async def post_own_profile(
 @router.patch(
     "/user/me",
     response_model=PerfilOutput,
+    response_model_exclude_unset=True,
     summary='Atualiza o perfil do usuário atual.',
     response_description='O perfil é atualizado e são retornadas as informações atualizadas',
     responses={
@@ -440,10 +701,14 @@ async def post_own_profile(
 @endpoint_exception_handler
 async def patch_own_profile(
     perfil_input: PerfilPatchInput,
+    background_tasks: BackgroundTasks,
+    fields: Optional[Set[str]] = Depends(profile_fields_query_params),
     current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
-    file_uploader_service: FileUploaderService = Depends(get_s3_file_uploader_service)
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
+    file_uploader_service: FileUploaderService = Depends(get_s3_file_uploader_service),
+    image_variant_service: ImageVariantService = Depends(get_image_variant_service)
 ):
 
     """
@@ -456,12 +721,16 @@ async def patch_own_profile(
         É possível fazer upload de imagem de perfil nesse endpoint, a partir do campo
         'imagem_perfil'
 
+        Com o parâmetro 'fields', a resposta é montada a partir dos dados retornados pela
+        atualização e o perfil só é relido se algum relacionamento for solicitado
+
         # Erros
 
         Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
 
         - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
         - **(PROFILE_NOT_FOUND, 404)**: Perfil não encontrado no sistema.
+        - **(INVALID_PROFILE_FIELDS, 422)**: Campo do perfil inexistente no parâmetro 'fields'.
         - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
         no formato de string, contendo os erros de validação encontrados.
         - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
@@ -471,7 +740,9 @@ async def patch_own_profile(
     arquivo_service = ArquivoService(
         arquivo_repo=ArquivoRepository(session, environment),
         environment=environment,
-        file_uploader_service=file_uploader_service
+        file_uploader_service=file_uploader_service,
+        image_variant_service=image_variant_service,
+        background_tasks=background_tasks
     )
 
     perfil_service = PerfilService(
@@ -480,10 +751,98 @@ async def patch_own_profile(
             environment=environment
         ),
         environment=environment,
-        arquivo_service=arquivo_service
+        arquivo_service=arquivo_service,
+        perfil_cache=perfil_cache
+    )
+
+    return await perfil_service.patch_profile_by_guid_usuario(current_user, perfil_input, fields)
+
+
+@router.put(
+    "/user/me/image",
+    response_model=PerfilOutput,
+    response_model_exclude_unset=True,
+    summary='Atualiza a imagem de perfil do usuário atual a partir de um arquivo multipart/form-data',
+    response_description='A imagem de perfil é atualizada e são retornadas as informações atualizadas do perfil',
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        404: {
+            'model': error_schema.ErrorOutput404,
+        },
+        413: {
+            'model': error_schema.ErrorOutput413,
+        },
+        422: {
+            'model': error_schema.ErrorOutput422,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        },
+        504: {
+            'model': error_schema.ErrorOutput504
+        }
+    }
+)
+@endpoint_exception_handler
+async def put_own_profile_image(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    fields: Optional[Set[str]] = Depends(profile_fields_query_params),
+    current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
+    session: AsyncSession = Depends(get_session),
+    environment: Environment = Depends(get_environment_cached),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
+    file_uploader_service: FileUploaderService = Depends(get_s3_file_uploader_service),
+    image_variant_service: ImageVariantService = Depends(get_image_variant_service)
+):
+
+    """
+        # Descrição
+
+        Atualiza a imagem de perfil do usuário atual a partir do arquivo enviado no campo 'file'
+        de um formulário multipart/form-data.
+
+        O arquivo é enviado ao armazenamento em partes, sem ser mantido inteiro em memória.
+
+        Com o parâmetro 'fields', a resposta é montada a partir dos dados retornados pela
+        atualização e o perfil só é relido se algum relacionamento for solicitado
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(PROFILE_NOT_FOUND, 404)**: Perfil não encontrado no sistema.
+        - **(FILE_TOO_LARGE, 413)**: O arquivo excede o tamanho máximo permitido.
+        - **(INVALID_PROFILE_FIELDS, 422)**: Campo do perfil inexistente no parâmetro 'fields'.
+        - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
+        no formato de string, contendo os erros de validação encontrados.
+        - **(FILE_UPLOAD_TIMEOUT, 504)**: O upload do arquivo excedeu o tempo limite.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+
+    """
+
+    arquivo_service = ArquivoService(
+        arquivo_repo=ArquivoRepository(session, environment),
+        environment=environment,
+        file_uploader_service=file_uploader_service,
+        image_variant_service=image_variant_service,
+        background_tasks=background_tasks
     )
 
-    return await perfil_service.patch_profile_by_guid_usuario(current_user, perfil_input)
+    perfil_service = PerfilService(
+        perfil_repo=PerfilRepository(
+            db_session=session,
+            environment=environment
+        ),
+        environment=environment,
+        arquivo_service=arquivo_service,
+        perfil_cache=perfil_cache
+    )
+
+    return await perfil_service.update_profile_image_by_guid_usuario(current_user, file, fields)
 
 
 @router.delete(
@@ -510,6 +869,7 @@ async def delete_profile(
     current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
 ):
 
     """
@@ -534,7 +894,8 @@ async def delete_profile(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        perfil_cache=perfil_cache
     )
 
     guid_usuario = current_user.guid
@@ -577,6 +938,8 @@ async def link_course_to_own_profile(
     current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    catalogo_cache: CatalogoCacheService = Depends(get_catalog_cache),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
 ):
 
     """
@@ -607,7 +970,9 @@ async def link_course_to_own_profile(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        catalogo_cache=catalogo_cache,
+        perfil_cache=perfil_cache
     )
 
     guid_usuario = current_user.guid
@@ -645,6 +1010,8 @@ async def delete_link_course_to_own_profile(
     current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    catalogo_cache: CatalogoCacheService = Depends(get_catalog_cache),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
 ):
 
     """
@@ -675,7 +1042,9 @@ async def delete_link_course_to_own_profile(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        catalogo_cache=catalogo_cache,
+        perfil_cache=perfil_cache
     )
 
     guid_usuario = current_user.guid
@@ -684,6 +1053,147 @@ async def delete_link_course_to_own_profile(
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+@router.put(
+    "/user/me/courses",
+    tags=["VinculoCursoPerfil"],
+    response_model=List[CursoOutput],
+    summary='Substitui os cursos vinculados ao perfil do usuário atual',
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        404: {
+            'model': error_schema.ErrorOutput404,
+        },
+        422: {
+            'model': error_schema.ErrorOutput422,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        }
+    }
+)
+@endpoint_exception_handler
+async def replace_own_profile_courses(
+    vinculos_input: VinculosPerfilPutInput,
+    current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
+    session: AsyncSession = Depends(get_session),
+    environment: Environment = Depends(get_environment_cached),
+    catalogo_cache: CatalogoCacheService = Depends(get_catalog_cache),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
+):
+
+    """
+        # Descrição
+
+        Substitui o conjunto de cursos vinculados ao perfil do usuário atual pelos
+        cursos informados em **ids**, em uma única transação. Retorna os cursos vinculados
+        ao perfil após a operação
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(PROFILE_NOT_FOUND, 404)**: Perfil não encontrado no sistema.
+        - **(COURSE_NOT_FOUND, 404)**: Algum dos cursos informados não foi encontrado no sistema
+        - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
+        no formato de string, contendo os erros de validação encontrados.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+
+    """
+
+    perfil_service = PerfilService(
+        perfil_repo=PerfilRepository(
+            db_session=session,
+            environment=environment
+        ),
+        curso_repo=CursoRepository(
+            db_session=session,
+            environment=environment
+        ),
+        environment=environment,
+        catalogo_cache=catalogo_cache,
+        perfil_cache=perfil_cache
+    )
+
+    guid_usuario = current_user.guid
+
+    return await perfil_service.replace_profile_courses(guid_usuario, vinculos_input.ids)
+
+
+@router.patch(
+    "/user/me/courses",
+    tags=["VinculoCursoPerfil"],
+    response_model=List[CursoOutput],
+    summary='Adiciona e remove cursos vinculados ao perfil do usuário atual',
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        404: {
+            'model': error_schema.ErrorOutput404,
+        },
+        422: {
+            'model': error_schema.ErrorOutput422,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        }
+    }
+)
+@endpoint_exception_handler
+async def patch_own_profile_courses(
+    vinculos_input: VinculosPerfilPatchInput,
+    current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
+    session: AsyncSession = Depends(get_session),
+    environment: Environment = Depends(get_environment_cached),
+    catalogo_cache: CatalogoCacheService = Depends(get_catalog_cache),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
+):
+
+    """
+        # Descrição
+
+        Vincula ao perfil do usuário atual os cursos de **add** e remove os vínculos
+        dos cursos de **remove**, em uma única transação. Vínculos já existentes em **add**
+        e inexistentes em **remove** são ignorados. Retorna os cursos vinculados
+        ao perfil após a operação
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(PROFILE_NOT_FOUND, 404)**: Perfil não encontrado no sistema.
+        - **(COURSE_NOT_FOUND, 404)**: Algum dos cursos informados não foi encontrado no sistema
+        - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
+        no formato de string, contendo os erros de validação encontrados.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+
+    """
+
+    perfil_service = PerfilService(
+        perfil_repo=PerfilRepository(
+            db_session=session,
+            environment=environment
+        ),
+        curso_repo=CursoRepository(
+            db_session=session,
+            environment=environment
+        ),
+        environment=environment,
+        catalogo_cache=catalogo_cache,
+        perfil_cache=perfil_cache
+    )
+
+    guid_usuario = current_user.guid
+
+    return await perfil_service.patch_profile_courses(
+        guid_usuario, vinculos_input.add, vinculos_input.remove
+    )
+
+
 """
     VinculoPerfilInteresse
 """
@@ -718,6 +1228,8 @@ async def link_interest_to_own_profile(
     current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    catalogo_cache: CatalogoCacheService = Depends(get_catalog_cache),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
 ):
 
     """
@@ -748,7 +1260,9 @@ async def link_interest_to_own_profile(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        catalogo_cache=catalogo_cache,
+        perfil_cache=perfil_cache
     )
 
     guid_usuario = current_user.guid
@@ -786,6 +1300,8 @@ async def delete_link_course_to_own_profile(
     current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    catalogo_cache: CatalogoCacheService = Depends(get_catalog_cache),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
 ):
 
     """
@@ -816,7 +1332,9 @@ async def delete_link_course_to_own_profile(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        catalogo_cache=catalogo_cache,
+        perfil_cache=perfil_cache
     )
 
     guid_usuario = current_user.guid
@@ -825,6 +1343,147 @@ async def delete_link_course_to_own_profile(
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+@router.put(
+    "/user/me/interests",
+    tags=["VinculoInteressePerfil"],
+    response_model=List[InteresseOutput],
+    summary='Substitui os interesses vinculados ao perfil do usuário atual',
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        404: {
+            'model': error_schema.ErrorOutput404,
+        },
+        422: {
+            'model': error_schema.ErrorOutput422,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        }
+    }
+)
+@endpoint_exception_handler
+async def replace_own_profile_interests(
+    vinculos_input: VinculosPerfilPutInput,
+    current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
+    session: AsyncSession = Depends(get_session),
+    environment: Environment = Depends(get_environment_cached),
+    catalogo_cache: CatalogoCacheService = Depends(get_catalog_cache),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
+):
+
+    """
+        # Descrição
+
+        Substitui o conjunto de interesses vinculados ao perfil do usuário atual pelos
+        interesses informados em **ids**, em uma única transação. Retorna os interesses vinculados
+        ao perfil após a operação
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(PROFILE_NOT_FOUND, 404)**: Perfil não encontrado no sistema.
+        - **(INTEREST_NOT_FOUND, 404)**: Algum dos interesses informados não foi encontrado no sistema
+        - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
+        no formato de string, contendo os erros de validação encontrados.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+
+    """
+
+    perfil_service = PerfilService(
+        perfil_repo=PerfilRepository(
+            db_session=session,
+            environment=environment
+        ),
+        interesse_repo=InteresseRepository(
+            db_session=session,
+            environment=environment
+        ),
+        environment=environment,
+        catalogo_cache=catalogo_cache,
+        perfil_cache=perfil_cache
+    )
+
+    guid_usuario = current_user.guid
+
+    return await perfil_service.replace_profile_interests(guid_usuario, vinculos_input.ids)
+
+
+@router.patch(
+    "/user/me/interests",
+    tags=["VinculoInteressePerfil"],
+    response_model=List[InteresseOutput],
+    summary='Adiciona e remove interesses vinculados ao perfil do usuário atual',
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        404: {
+            'model': error_schema.ErrorOutput404,
+        },
+        422: {
+            'model': error_schema.ErrorOutput422,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        }
+    }
+)
+@endpoint_exception_handler
+async def patch_own_profile_interests(
+    vinculos_input: VinculosPerfilPatchInput,
+    current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
+    session: AsyncSession = Depends(get_session),
+    environment: Environment = Depends(get_environment_cached),
+    catalogo_cache: CatalogoCacheService = Depends(get_catalog_cache),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
+):
+
+    """
+        # Descrição
+
+        Vincula ao perfil do usuário atual os interesses de **add** e remove os vínculos
+        dos interesses de **remove**, em uma única transação. Vínculos já existentes em **add**
+        e inexistentes em **remove** são ignorados. Retorna os interesses vinculados
+        ao perfil após a operação
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(PROFILE_NOT_FOUND, 404)**: Perfil não encontrado no sistema.
+        - **(INTEREST_NOT_FOUND, 404)**: Algum dos interesses informados não foi encontrado no sistema
+        - **(REQUEST_VALIDATION_ERROR, 422)**: Validação padrão da requisição. O detalhamento é um JSON,
+        no formato de string, contendo os erros de validação encontrados.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+
+    """
+
+    perfil_service = PerfilService(
+        perfil_repo=PerfilRepository(
+            db_session=session,
+            environment=environment
+        ),
+        interesse_repo=InteresseRepository(
+            db_session=session,
+            environment=environment
+        ),
+        environment=environment,
+        catalogo_cache=catalogo_cache,
+        perfil_cache=perfil_cache
+    )
+
+    guid_usuario = current_user.guid
+
+    return await perfil_service.patch_profile_interests(
+        guid_usuario, vinculos_input.add, vinculos_input.remove
+    )
+
+
 """
     PerfilEmail
 """
@@ -856,6 +1515,7 @@ async def insert_email_to_own_profile(
     current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
 ):
 
     """
@@ -880,7 +1540,8 @@ async def insert_email_to_own_profile(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        perfil_cache=perfil_cache
     )
 
     guid_usuario = current_user.guid
@@ -918,6 +1579,7 @@ async def patch_email_to_own_profile(
     _: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
 ):
 
     """
@@ -943,7 +1605,8 @@ async def patch_email_to_own_profile(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        perfil_cache=perfil_cache
     )
 
     return await perfil_service.patch_email_profile_by_guid(
@@ -978,6 +1641,7 @@ async def delete_email_to_own_profile(
     _: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
 ):
 
     """
@@ -1002,7 +1666,8 @@ async def delete_email_to_own_profile(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        perfil_cache=perfil_cache
     )
 
     await perfil_service.delete_email_profile_by_guid(
@@ -1042,6 +1707,8 @@ async def insert_phone_to_own_profile(
     current_user: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    catalogo_cache: CatalogoCacheService = Depends(get_catalog_cache),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
 ):
 
     """
@@ -1070,7 +1737,9 @@ async def insert_phone_to_own_profile(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        catalogo_cache=catalogo_cache,
+        perfil_cache=perfil_cache
     )
 
     guid_usuario = current_user.guid
@@ -1108,6 +1777,8 @@ async def update_phone_own_profile(
     _: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    catalogo_cache: CatalogoCacheService = Depends(get_catalog_cache),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
 ):
 
     """
@@ -1137,7 +1808,9 @@ async def update_phone_own_profile(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        catalogo_cache=catalogo_cache,
+        perfil_cache=perfil_cache
     )
 
     return await perfil_service.patch_phone_profile_by_guid(
@@ -1172,6 +1845,7 @@ async def delete_phone_own_profile(
     _: usuario_schema.CurrentUserToken = Security(get_current_user, scopes=[]),
     session: AsyncSession = Depends(get_session),
     environment: Environment = Depends(get_environment_cached),
+    perfil_cache: Optional[PerfilCacheService] = Depends(get_profile_cache),
 ):
 
     """
@@ -1196,7 +1870,8 @@ async def delete_phone_own_profile(
             db_session=session,
             environment=environment
         ),
-        environment=environment
+        environment=environment,
+        perfil_cache=perfil_cache
     )
 
     await perfil_service.delete_phone_profile_by_guid(
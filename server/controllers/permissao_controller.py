@@ -0,0 +1,146 @@
+from server.schemas import usuario_schema
+from fastapi import APIRouter, Response
+from fastapi import Depends, Security, status
+from server.dependencies.get_current_user import get_current_user
+from server.dependencies.get_permission_cache import get_permission_cache
+from server.schemas import error_schema
+from server.schemas.permissao_schema import PermissionCacheStatsOutput
+from server.services.permissao_cache_service import PermissaoCacheService
+from server.constants.permission import RoleBasedPermission
+from server.dependencies.get_token_cache import get_token_cache
+from server.schemas.token_shema import TokenCacheStatsOutput
+from server.services.token_cache_service import TokenCacheService
+
+
+router = APIRouter()
+permissao_router = dict(
+    router=router,
+    prefix="/permissions",
+    tags=["Permissões"],
+)
+
+
+@router.get(
+    "/cache/stats",
+    response_model=PermissionCacheStatsOutput,
+    summary='Retorna as estatísticas do cache de permissões',
+    response_description='Retorna as estatísticas do cache de permissões',
+    include_in_schema=False,
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        }
+    }
+)
+async def get_permission_cache_stats(
+    _: usuario_schema.CurrentUserToken = Security(
+        get_current_user, scopes=[RoleBasedPermission.ANY_OP.value]),
+    permission_cache: PermissaoCacheService = Depends(get_permission_cache)
+):
+
+    """
+        # Descrição
+
+        Retorna os contadores de acertos (hits) e faltas (misses) do cache de permissões
+        deste processo, além da quantidade de entradas armazenadas. Apenas usuários com
+        cargos com permissão 'ANY_OP' (Qualquer operação) possuem a autorização para acessar
+        essa requisição.
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(NOT_ENOUGH_PERMISSION, 401)**: O usuário não possui a permissão 'ANY_OP'.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+
+    """
+
+    return permission_cache.get_stats()
+
+
+@router.get(
+    "/token-cache/stats",
+    response_model=TokenCacheStatsOutput,
+    summary='Retorna as estatísticas do cache de tokens de acesso verificados',
+    response_description='Retorna as estatísticas do cache de tokens de acesso verificados',
+    include_in_schema=False,
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        }
+    }
+)
+async def get_token_cache_stats(
+    _: usuario_schema.CurrentUserToken = Security(
+        get_current_user, scopes=[RoleBasedPermission.ANY_OP.value]),
+    token_cache: TokenCacheService = Depends(get_token_cache)
+):
+
+    """
+        # Descrição
+
+        Retorna os contadores de acertos (hits), faltas (misses) e descartes (evictions)
+        do cache de tokens de acesso verificados deste processo, além da quantidade de
+        entradas armazenadas e do tamanho máximo do cache. Apenas usuários com cargos com
+        permissão 'ANY_OP' (Qualquer operação) possuem a autorização para acessar essa requisição.
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(NOT_ENOUGH_PERMISSION, 401)**: O usuário não possui a permissão 'ANY_OP'.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+
+    """
+
+    return token_cache.get_stats()
+
+
+@router.delete(
+    "/cache",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary='Invalida o cache de permissões',
+    include_in_schema=False,
+    responses={
+        401: {
+            'model': error_schema.ErrorOutput401,
+        },
+        500: {
+            'model': error_schema.ErrorOutput500
+        }
+    }
+)
+async def invalidate_permission_cache(
+    _: usuario_schema.CurrentUserToken = Security(
+        get_current_user, scopes=[RoleBasedPermission.ANY_OP.value]),
+    permission_cache: PermissaoCacheService = Depends(get_permission_cache)
+):
+
+    """
+        # Descrição
+
+        Remove todas as entradas do cache de permissões deste processo. As permissões
+        serão consultadas novamente no banco de dados nas próximas requisições. Apenas
+        usuários com cargos com permissão 'ANY_OP' (Qualquer operação) possuem a
+        autorização para acessar essa requisição.
+
+        # Erros
+
+        Segue a lista de erros, por (**error_id**, **status_code**), que podem ocorrer nesse endpoint:
+
+        - **(INVALID_OR_EXPIRED_TOKEN, 401)**: Token de acesso inválido ou expirado.
+        - **(NOT_ENOUGH_PERMISSION, 401)**: O usuário não possui a permissão 'ANY_OP'.
+        - **(INTERNAL_SERVER_ERROR, 500)**: Erro interno no sistema
+
+    """
+
+    permission_cache.invalidate()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,7 @@
+from functools import lru_cache
+from server.services.catalogo_cache_service import CatalogoCacheService
+
+
+@lru_cache
+def get_catalog_cache():
+    return CatalogoCacheService()
@@ -0,0 +1,33 @@
+from fastapi import Depends
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from server.dependencies.get_environment_cached import get_environment_cached
+from server.dependencies.get_s3_file_uploader_service import get_s3_file_uploader_service
+from server.dependencies.session import get_session_maker
+from server.configuration.environment import Environment
+from server.services.file_uploader.uploader import FileUploaderService
+from server.services.image_variant_service import ImageVariantService
+
+
+@lru_cache
+def get_image_variant_executor_cached():
+    """
+        Pool de processos do processo utilizado na geração das variantes de imagens,
+        de forma que o processamento das imagens não concorra com o event loop
+    """
+    environment = get_environment_cached()
+    return ProcessPoolExecutor(max_workers=environment.IMAGE_VARIANT_MAX_WORKERS)
+
+
+async def get_image_variant_service(
+    environment: Environment = Depends(get_environment_cached),
+    file_uploader_service: FileUploaderService = Depends(get_s3_file_uploader_service),
+    session_maker=Depends(get_session_maker)
+) -> ImageVariantService:
+
+    return ImageVariantService(
+        file_uploader_service=file_uploader_service,
+        session_maker=session_maker,
+        executor=get_image_variant_executor_cached(),
+        environment=environment
+    )
@@ -0,0 +1,9 @@
+from functools import lru_cache
+from server.dependencies.get_environment_cached import get_environment_cached
+from server.services.permissao_cache_service import PermissaoCacheService
+
+
+@lru_cache
+def get_permission_cache():
+    environment = get_environment_cached()
+    return PermissaoCacheService(ttl_in_seconds=environment.PERMISSION_CACHE_TTL_IN_SECONDS)
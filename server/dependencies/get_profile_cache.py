@@ -0,0 +1,23 @@
+import aioredis
+from functools import lru_cache
+from server.dependencies.get_environment_cached import get_environment_cached
+from server.services.perfil_cache_service import PerfilCacheService
+
+
+@lru_cache
+def get_profile_cache():
+    """
+        Cache de perfis do processo. Retorna None, desativando o cache, se REDIS_URL não foi definida
+    """
+    environment = get_environment_cached()
+    if not environment.REDIS_URL:
+        return None
+    return PerfilCacheService(
+        aioredis.from_url(
+            environment.REDIS_URL,
+            decode_responses=True,
+            socket_timeout=environment.REDIS_SOCKET_TIMEOUT_IN_SECONDS,
+            socket_connect_timeout=environment.REDIS_SOCKET_TIMEOUT_IN_SECONDS
+        ),
+        ttl_in_seconds=environment.PROFILE_CACHE_TTL_IN_SECONDS
+    )
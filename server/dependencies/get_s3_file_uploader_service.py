@@ -1,16 +1,44 @@
 from fastapi import Depends
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from server.configuration.custom_logging import get_main_logger
 from server.dependencies.get_environment_cached import get_environment_cached
 from server.configuration.environment import Environment
 from server.services.file_uploader.s3_uploader.s3_uploader_service import S3FileUploaderService
+from server.services.file_uploader.s3_uploader.client import FIleUploaderClient
 
 
 MAIN_LOGGER = get_main_logger()
 
 
+@lru_cache
+def get_s3_upload_executor_cached():
+    """
+        Pool de threads do processo utilizado pelos uploads no S3. O número de threads
+        é o limite de uploads simultâneos
+    """
+    environment = get_environment_cached()
+    return ThreadPoolExecutor(
+        max_workers=environment.S3_UPLOAD_MAX_CONCURRENCY,
+        thread_name_prefix='s3-upload'
+    )
+
+
+@lru_cache
+def get_s3_file_uploader_client_cached():
+    """
+        Cliente do S3 do processo. O cliente boto3 só é criado no primeiro upload
+    """
+    return FIleUploaderClient(get_environment_cached())
+
+
 async def get_s3_file_uploader_service(
     environment: Environment = Depends(get_environment_cached)
 ) -> S3FileUploaderService:
 
-    return S3FileUploaderService(environment)
-
+    return S3FileUploaderService(
+        environment,
+        _client=get_s3_file_uploader_client_cached(),
+        _executor=get_s3_upload_executor_cached(),
+        _timeout_in_seconds=environment.S3_UPLOAD_TIMEOUT_IN_SECONDS
+    )
@@ -0,0 +1,12 @@
+from functools import lru_cache
+from server.dependencies.get_environment_cached import get_environment_cached
+from server.services.token_cache_service import TokenCacheService
+
+
+@lru_cache
+def get_token_cache():
+    environment = get_environment_cached()
+    return TokenCacheService(
+        max_size=environment.VERIFIED_TOKEN_CACHE_MAX_SIZE,
+        max_ttl_in_seconds=environment.VERIFIED_TOKEN_CACHE_MAX_TTL_IN_SECONDS
+    )
@@ -1,8 +1,17 @@
-from server.configuration.db import AsyncSession, build_async_session_maker
+from server.configuration.db import AsyncSession, get_async_session_maker_cached
 
 
 async def get_session() -> AsyncSession:
-    session_maker = build_async_session_maker()
-    async with session_maker() as session:
+    """
+        Sessão do banco de dados da requisição (unit of work)
+
+        O cache de dependências do FastAPI garante que todas as dependências de uma
+        mesma requisição recebam a mesma sessão. O commit ou rollback da transação é
+        feito por endpoint_exception_handler e a sessão é fechada apenas ao fim da requisição
+    """
+    async with get_async_session_maker_cached()() as session:
         yield session
 
+
+def get_session_maker():
+    return get_async_session_maker_cached()
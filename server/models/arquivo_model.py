@@ -1,7 +1,9 @@
-from sqlalchemy import Column, BigInteger, String
+from sqlalchemy import Column, BigInteger, String, Index
 from server.models import AuthenticatorBase
 from server.configuration import db
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from server.models.arquivo_variante_model import ArquivoVariante
 import uuid
 
 
@@ -18,4 +20,15 @@ class Arquivo(db.Base, AuthenticatorBase):
     url = Column(String)
     file_type = Column(String)
     file_name = Column(String)
+    content_hash = Column(String(64))  # SHA-256 do conteúdo, utilizado na deduplicação dos uploads de cada usuário
 
+    variantes = relationship(
+        "ArquivoVariante",
+        back_populates="arquivo",
+        order_by=ArquivoVariante.id,
+        passive_deletes=True
+    )
+
+    __table_args__ = (
+        Index('ix_tb_arquivo_created_by_content_hash', 'created_by', 'content_hash', unique=True),
+    )
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, BigInteger, String, Integer, ForeignKey, UniqueConstraint
+from server.models import AuthenticatorBase
+from server.configuration import db
+from sqlalchemy.orm import relationship
+
+
+class ArquivoVariante(db.Base, AuthenticatorBase):
+
+    """
+        Variantes geradas a partir de um arquivo de imagem, como miniaturas
+        e versões comprimidas, armazenadas junto ao arquivo original
+    """
+
+    def __init__(self, **kwargs):
+        super(ArquivoVariante, self).__init__(**kwargs)
+
+    __tablename__ = "tb_arquivo_variante"
+
+    __table_args__ = (
+        UniqueConstraint('id_arquivo', 'nome_variante'),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id_arquivo = Column(BigInteger, ForeignKey("tb_arquivo.id", ondelete="CASCADE"), nullable=False)
+
+    nome_variante = Column(String, nullable=False)
+    url = Column(String, nullable=False)
+    file_type = Column(String)
+    largura = Column(Integer)
+    altura = Column(Integer)
+
+    arquivo = relationship("Arquivo", back_populates="variantes")
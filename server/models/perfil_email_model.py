@@ -16,6 +16,6 @@ class PerfilEmail(db.Base, AuthenticatorBase):
 
     guid = Column(UUID(as_uuid=True), nullable=False, unique=True, default=uuid.uuid4)
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    id_perfil = Column(BigInteger, ForeignKey("tb_perfil.id"), nullable=False)
+    id_perfil = Column(BigInteger, ForeignKey("tb_perfil.id", ondelete="CASCADE"), nullable=False)
     email = Column(String())
 
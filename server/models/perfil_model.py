@@ -1,8 +1,8 @@
-from sqlalchemy import Column, BigInteger, String, ForeignKey
+from sqlalchemy import Column, BigInteger, String, ForeignKey, Index, func, literal_column
 from server.models import AuthenticatorBase
 from server.configuration import db
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 import uuid
 from server.models.perfil_email_model import PerfilEmail
 from server.models.perfil_phone_model import PerfilPhone
@@ -25,6 +25,9 @@ class Perfil(db.Base, AuthenticatorBase):
     nome_exibicao = Column(String())
     nome_exibicao_normalized = Column(String())
 
+    # Documento da busca textual (nome, bio, cursos e interesses), mantido pelo PerfilService
+    search_vector = deferred(Column(TSVECTOR))
+
     url_imagem = Column(String())  # deprecated
     id_imagem_perfil = Column(BigInteger, ForeignKey("tb_arquivo.id"), nullable=True)
     imagem_perfil = relationship("Arquivo", primaryjoin=(id_imagem_perfil == Arquivo.id), uselist=False)
@@ -33,23 +36,44 @@ class Perfil(db.Base, AuthenticatorBase):
         "PerfilEmail",
         primaryjoin=(
             id == PerfilEmail.id_perfil
-        )
+        ),
+        passive_deletes=True
     )
 
     phones = relationship(
         "PerfilPhone",
         primaryjoin=(
             id == PerfilPhone.id_perfil
-        )
+        ),
+        passive_deletes=True
     )
 
     vinculos_perfil_interesse = relationship(
         'VinculoPerfilInteresse',
-        back_populates='perfil'
+        back_populates='perfil',
+        passive_deletes=True
     )
 
     vinculos_perfil_curso = relationship(
         'VinculoPerfilCurso',
-        back_populates='perfil'
+        back_populates='perfil',
+        passive_deletes=True
+    )
+
+    __table_args__ = (
+        # Índice da chave (nome_exibicao, id) usada na paginação por cursor
+        Index(
+            'ix_tb_perfil_nome_exibicao_id',
+            func.coalesce(nome_exibicao, literal_column("''")),
+            id
+        ),
+        # Índice trigram (pg_trgm) usado pelas buscas por nome de exibição
+        Index(
+            'ix_tb_perfil_nome_exibicao_normalized_trgm',
+            nome_exibicao_normalized,
+            postgresql_using='gin',
+            postgresql_ops={'nome_exibicao_normalized': 'gin_trgm_ops'}
+        ),
+        Index('ix_tb_perfil_search_vector', search_vector, postgresql_using='gin'),
     )
 
@@ -17,7 +17,7 @@ class PerfilPhone(db.Base, AuthenticatorBase):
 
     guid = Column(UUID(as_uuid=True), nullable=False, unique=True, default=uuid.uuid4)
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    id_perfil = Column(BigInteger, ForeignKey("tb_perfil.id"), nullable=False)
+    id_perfil = Column(BigInteger, ForeignKey("tb_perfil.id", ondelete="CASCADE"), nullable=False)
     phone = Column(String())
 
     id_tipo_contato = Column(BigInteger, ForeignKey("tb_tipo_contato.id"))
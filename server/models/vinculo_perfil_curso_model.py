@@ -20,7 +20,7 @@ class VinculoPerfilCurso(db.Base, AuthenticatorBase):
     )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    id_perfil = Column(BigInteger, ForeignKey("tb_perfil.id"))
+    id_perfil = Column(BigInteger, ForeignKey("tb_perfil.id", ondelete="CASCADE"))
     id_curso = Column(BigInteger, ForeignKey("tb_curso.id"))
 
     perfil = relationship('Perfil', back_populates='vinculos_perfil_curso')
@@ -20,7 +20,7 @@ class VinculoPerfilInteresse(db.Base, AuthenticatorBase):
     )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    id_perfil = Column(BigInteger, ForeignKey("tb_perfil.id"))
+    id_perfil = Column(BigInteger, ForeignKey("tb_perfil.id", ondelete="CASCADE"))
     id_interesse = Column(BigInteger, ForeignKey("tb_interesse.id"))
 
     perfil = relationship('Perfil', back_populates='vinculos_perfil_interesse')
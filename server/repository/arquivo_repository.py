@@ -1,8 +1,13 @@
 from server.configuration.db import AsyncSession
-from typing import Optional
+from typing import Optional, List, Set
+from datetime import datetime
 from server.configuration.environment import Environment
 from server.models.arquivo_model import Arquivo
-from sqlalchemy import insert, literal_column
+from sqlalchemy import insert, select, update, delete, exists, union, literal_column, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import selectinload
+from server.models.arquivo_variante_model import ArquivoVariante
+from server.models.perfil_model import Perfil
 
 
 class ArquivoRepository:
@@ -21,3 +26,145 @@ class ArquivoRepository:
         row_to_dict = dict(query.fetchone())
         return Arquivo(**row_to_dict)
 
+    async def insere_arquivo_if_hash_not_exists(self, arquivo_input_dict: dict) -> Optional[Arquivo]:
+        """
+            Insere o arquivo apenas se o mesmo usuário (created_by) não tiver outro com o
+            mesmo content_hash. Retorna None caso o arquivo já exista
+        """
+        stmt = (
+            pg_insert(Arquivo).
+            values(**arquivo_input_dict).
+            on_conflict_do_nothing(index_elements=['created_by', 'content_hash']).
+            returning(literal_column('*'))
+        )
+        query = await self.db_session.execute(stmt)
+        row = query.fetchone()
+        return Arquivo(**dict(row)) if row else None
+
+    async def find_arquivo_by_content_hash(self, created_by: str, content_hash: str) -> Optional[Arquivo]:
+        stmt = (
+            select(Arquivo).
+            options(selectinload(Arquivo.variantes)).
+            where(
+                Arquivo.created_by == created_by,
+                Arquivo.content_hash == content_hash
+            )
+        )
+        query = await self.db_session.execute(stmt)
+        return query.scalars().first()
+
+    async def find_arquivo_by_url(self, created_by: str, url: str) -> Optional[Arquivo]:
+        stmt = (
+            select(Arquivo).
+            options(selectinload(Arquivo.variantes)).
+            where(
+                Arquivo.created_by == created_by,
+                Arquivo.url == url
+            ).
+            order_by(Arquivo.id)
+        )
+        query = await self.db_session.execute(stmt)
+        return query.scalars().first()
+
+    async def atualiza_updated_at_arquivo(self, id_arquivo: int) -> bool:
+        """
+            Marca o arquivo como reutilizado, adiando sua remoção pela coleta de arquivos
+            sem referências. Retorna False se o arquivo não existe mais
+        """
+        stmt = (
+            update(Arquivo).
+            where(Arquivo.id == id_arquivo).
+            values(updated_at=datetime.now()).
+            returning(Arquivo.id).
+            execution_options(synchronize_session=False)
+        )
+        query = await self.db_session.execute(stmt)
+        return query.scalar() is not None
+
+    async def insere_variantes_arquivo(self, id_arquivo: int, variantes_input_dicts: List[dict]):
+        """
+            Insere as variantes do arquivo. Variantes já existentes (mesmo nome) são mantidas
+        """
+        if not variantes_input_dicts:
+            return
+        stmt = (
+            pg_insert(ArquivoVariante).
+            values([
+                dict(variante_input_dict, id_arquivo=id_arquivo)
+                for variante_input_dict in variantes_input_dicts
+            ]).
+            on_conflict_do_nothing(index_elements=['id_arquivo', 'nome_variante'])
+        )
+        await self.db_session.execute(stmt)
+
+    @staticmethod
+    def get_unreferenced_arquivo_filter():
+        """
+            Um arquivo é referenciado pelo ID (id_imagem_perfil) ou pela URL
+            (url_imagem, deprecated, mas ainda preenchida por alguns clientes)
+        """
+        return and_(
+            ~exists().where(Perfil.id_imagem_perfil == Arquivo.id),
+            ~exists().where(Perfil.url_imagem == Arquivo.url)
+        )
+
+    async def find_unreferenced_arquivos(
+        self, updated_before: datetime, after_id: int, limit: int
+    ) -> List[Arquivo]:
+        """
+            Retorna, em ordem de ID, os arquivos atualizados (ou reutilizados) antes de updated_before
+            que não são referenciados por nenhum perfil (paginação por keyset em after_id)
+        """
+        stmt = (
+            select(Arquivo).
+            where(
+                Arquivo.id > after_id,
+                Arquivo.updated_at < updated_before,
+                self.get_unreferenced_arquivo_filter()
+            ).
+            order_by(Arquivo.id).
+            limit(limit)
+        )
+        query = await self.db_session.execute(stmt)
+        return query.scalars().all()
+
+    async def find_variantes_by_ids_arquivo(self, ids_arquivo: List[int]) -> List[ArquivoVariante]:
+        stmt = (
+            select(ArquivoVariante).
+            where(ArquivoVariante.id_arquivo.in_(ids_arquivo))
+        )
+        query = await self.db_session.execute(stmt)
+        return query.scalars().all()
+
+    async def delete_unreferenced_arquivos_by_ids(
+        self, ids_arquivo: List[int], updated_before: datetime
+    ) -> List[int]:
+        """
+            Remove os arquivos informados que continuam sem referências, e não foram reutilizados,
+            no momento da remoção. As variantes são removidas em cascata. Retorna os IDs removidos
+        """
+        stmt = (
+            delete(Arquivo).
+            where(
+                Arquivo.id.in_(ids_arquivo),
+                Arquivo.updated_at < updated_before,
+                self.get_unreferenced_arquivo_filter()
+            ).
+            returning(Arquivo.id).
+            execution_options(synchronize_session=False)
+        )
+        query = await self.db_session.execute(stmt)
+        return query.scalars().all()
+
+    async def find_known_urls(self, urls: List[str]) -> Set[str]:
+        """
+            Retorna as URLs informadas que estão registradas em tb_arquivo ou tb_arquivo_variante
+        """
+        if not urls:
+            return set()
+        stmt = union(
+            select(Arquivo.url).where(Arquivo.url.in_(urls)),
+            select(ArquivoVariante.url).where(ArquivoVariante.url.in_(urls))
+        )
+        query = await self.db_session.execute(stmt)
+        return set(query.scalars().all())
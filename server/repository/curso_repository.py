@@ -7,12 +7,6 @@ from server.models.curso_model import Curso
 
 class CursoRepository:
 
-    @staticmethod
-    def get_courses_in_filter(courses: List[int]):
-        return [
-            Curso.id.in_(courses)
-        ]
-
     def __init__(self, db_session: AsyncSession, environment: Optional[Environment] = None):
         self.db_session = db_session
         self.environment = environment
@@ -8,12 +8,6 @@ from sqlalchemy import select
 
 class InteresseRepository:
 
-    @staticmethod
-    def get_interests_in_filter(interests: List[int]):
-        return [
-            Interesse.id.in_(interests)
-        ]
-
     def __init__(self, db_session: AsyncSession, environment: Optional[Environment] = None):
         self.db_session = db_session
         self.environment = environment
@@ -1,11 +1,13 @@
 from server.configuration.db import AsyncSession
 from server.models.permissao_model import Permissao
 from server.models.vinculo_permissao_funcao_model import VinculoPermissaoFuncao
-from sqlalchemy import select, update, insert, delete, literal_column
-from typing import List, Optional
+from sqlalchemy import select, update, insert, delete, literal, literal_column, func, tuple_
+from typing import List, Optional, Set
 from server.configuration.environment import Environment
-from sqlalchemy.orm import selectinload
-from sqlalchemy import and_
+from sqlalchemy.orm import selectinload, noload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy import and_, or_
 from server.models.perfil_model import Perfil
 from server.models.vinculo_perfil_interesse_model import VinculoPerfilInteresse
 from server.models.vinculo_perfil_curso_model import VinculoPerfilCurso
@@ -16,21 +18,15 @@ from server.models.perfil_phone_model import PerfilPhone
 from server.models.perfil_email_model import PerfilEmail
 from server.models.curso_model import Curso
 from server import utils
-from sqlalchemy.sql import operators
-from server.configuration.exceptions import ProfileNotFoundException
+from server.configuration.exceptions import ProfileNotFoundException, InvalidSortFieldException
 from server.models.tipo_contato_model import TipoContato
+from server.models.arquivo_model import Arquivo
 
 
-class PerfilRepository:
+TEXT_SEARCH_CONFIG = literal_column("'portuguese'::regconfig")
 
-    @staticmethod
-    def get_operator_dictionary():
-        return {
-            'ge': operators.ge,
-            'gt': operators.gt,
-            'le': operators.le,
-            'lt': operators.lt
-        }
+
+class PerfilRepository:
 
     @staticmethod
     def get_name_ilike_filter(nome_exibicao: str):
@@ -41,68 +37,171 @@ class PerfilRepository:
         ]
 
     @staticmethod
-    def get_default_cursor_filter(sort_field_key, cursor_value, _operator):
-        return _operator(getattr(Perfil, sort_field_key), cursor_value)
+    def get_courses_in_filter(courses: List[int]):
+        # Semi-join: o perfil é selecionado uma única vez, independente de quantos
+        # vínculos satisfazem o filtro, dispensando o DISTINCT
+        return [
+            select(VinculoPerfilCurso.id).where(
+                VinculoPerfilCurso.id_perfil == Perfil.id,
+                VinculoPerfilCurso.id_curso.in_(courses)
+            ).exists()
+        ]
 
     @staticmethod
-    def get_int_cursor_filter(sort_field_key, cursor_value, _operator):
-        return _operator(getattr(Perfil, sort_field_key), int(cursor_value))
+    def get_interests_in_filter(interests: List[int]):
+        return [
+            select(VinculoPerfilInteresse.id).where(
+                VinculoPerfilInteresse.id_perfil == Perfil.id,
+                VinculoPerfilInteresse.id_interesse.in_(interests)
+            ).exists()
+        ]
 
     @staticmethod
-    def get_cursor_filter_factory():
-        return {
-            "int": PerfilRepository.get_int_cursor_filter,
-            "str": PerfilRepository.get_default_cursor_filter
+    def get_search_tsquery(search: str):
+        return func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, func.unaccent(search))
+
+    @staticmethod
+    def get_full_text_search_filter(search: str):
+        return [
+            Perfil.search_vector.op('@@')(PerfilRepository.get_search_tsquery(search))
+        ]
+
+    @staticmethod
+    def get_search_vector_expression():
+        """
+            Documento da busca textual do perfil: nome de exibição (peso A),
+            nomes dos cursos e interesses vinculados (peso B) e bio (peso C)
+        """
+
+        def weighted_vector(text, weight):
+            return func.setweight(func.to_tsvector(TEXT_SEARCH_CONFIG, text), literal_column(f"'{weight}'"))
+
+        nomes_cursos = (
+            select(func.string_agg(Curso.nome_exibicao, literal_column("' '")))
+            .join(VinculoPerfilCurso, VinculoPerfilCurso.id_curso == Curso.id)
+            .where(VinculoPerfilCurso.id_perfil == Perfil.id)
+            .scalar_subquery()
+        )
+        nomes_interesses = (
+            select(func.string_agg(Interesse.nome_exibicao, literal_column("' '")))
+            .join(VinculoPerfilInteresse, VinculoPerfilInteresse.id_interesse == Interesse.id)
+            .where(VinculoPerfilInteresse.id_perfil == Perfil.id)
+            .scalar_subquery()
+        )
+
+        return (
+            weighted_vector(func.coalesce(Perfil.nome_exibicao_normalized, literal_column("''")), 'A')
+            .op('||')(weighted_vector(
+                func.unaccent(func.concat_ws(literal_column("' '"), nomes_cursos, nomes_interesses)), 'B'
+            ))
+            .op('||')(weighted_vector(
+                func.unaccent(func.coalesce(Perfil.bio, literal_column("''"))), 'C'
+            ))
+        )
+
+    @staticmethod
+    def get_sortable_fields(search: Optional[str] = None):
+        """
+            Campos que podem ser usados na ordenação da paginação por cursor
+
+            Cada campo define a expressão ordenada no banco de dados, o sentido da
+            ordenação e como converter o valor armazenado no cursor de volta para o
+            tipo da expressão. O ID do perfil é sempre usado como critério de desempate,
+            formando a chave (campo, id) usada na comparação por tupla.
+
+            A relevância só está disponível quando há um termo de busca textual
+        """
+        sortable_fields = {
+            "nome_exibicao": {
+                "expression": func.coalesce(Perfil.nome_exibicao, literal_column("''")),
+                "from_cursor_value": str,
+                "descending": False
+            },
+            "id": {
+                "expression": Perfil.id,
+                "from_cursor_value": int,
+                "descending": False
+            }
         }
+        if search:
+            sortable_fields["relevance"] = {
+                "expression": func.ts_rank(Perfil.search_vector, PerfilRepository.get_search_tsquery(search)),
+                "from_cursor_value": float,
+                "descending": True
+            }
+        return sortable_fields
 
     @staticmethod
-    def build_cursor_filter(cursor: Cursor):
-        # Factory e builder descrevem como construir o filtro
-        cursor_field_factory = PerfilRepository.get_cursor_filter_factory()
-        cursor_operator_factory = PerfilRepository.get_operator_dictionary()
-        cursor_field_type = cursor.sort_field_type
-        cursor_field_builder = cursor_field_factory[cursor_field_type]
-        # Retornando o resultado usando o builder com os argumentos
-        cursor_field_key = cursor.sort_field_key
-        cursor_value = cursor.value
-        cursor_operator = cursor_operator_factory[cursor.operator]
-        return cursor_field_builder(cursor_field_key, cursor_value, cursor_operator)
+    def get_sortable_field(sort_field_key: str, search: Optional[str] = None):
+        sortable_fields = PerfilRepository.get_sortable_fields(search)
+        if sort_field_key not in sortable_fields:
+            raise InvalidSortFieldException(
+                detail=f"O campo '{sort_field_key}' não pode ser usado na ordenação. "
+                       f"Campos disponíveis: {', '.join(sortable_fields.keys())}"
+            )
+        return sortable_fields[sort_field_key]
 
     @staticmethod
-    def get_all_entities_select_statement():
-        stmt = (
-            select(Perfil)
-            .distinct()
-            .outerjoin(
-                VinculoPerfilCurso,
-                VinculoPerfilCurso.id_perfil == Perfil.id,
-            ).outerjoin(
-                Curso,
-                VinculoPerfilCurso.id_curso == Curso.id,
-            ).outerjoin(
-                VinculoPerfilInteresse,
-                VinculoPerfilInteresse.id_perfil == Perfil.id,
-            ).outerjoin(
-                Interesse,
-                VinculoPerfilInteresse.id_interesse == Interesse.id
-            ).options(
-                (
-                    selectinload(Perfil.vinculos_perfil_curso).
-                    selectinload(VinculoPerfilCurso.curso)
-                ),
-                (
-                    selectinload(Perfil.vinculos_perfil_interesse).
-                    selectinload(VinculoPerfilInteresse.interesse)
-                ),
-                (
-                    selectinload(Perfil.phones).
-                    selectinload(PerfilPhone.tipo_contato)
-                ),
-                selectinload(Perfil.emails),
-                selectinload(Perfil.imagem_perfil)
+    def is_ascending_scan(sortable_field: dict, cursor: Optional[Cursor]):
+        # A página anterior é buscada no sentido inverso da ordenação e reordenada após a query
+        is_previous_page = cursor is not None and cursor.direction == 'previous'
+        return sortable_field['descending'] == is_previous_page
+
+    @staticmethod
+    def build_cursor_filter(sortable_field: dict, cursor: Cursor):
+        # Comparação por tupla (campo, id): a página seguinte começa logo após o cursor
+        # e a página anterior termina logo antes dele
+        cursor_key = tuple_(sortable_field['expression'], Perfil.id)
+        cursor_value = tuple_(sortable_field['from_cursor_value'](cursor.value), cursor.id)
+        if PerfilRepository.is_ascending_scan(sortable_field, cursor):
+            return cursor_key > cursor_value
+        return cursor_key < cursor_value
+
+    @staticmethod
+    def build_cursor_order_by(sortable_field: dict, cursor: Optional[Cursor]):
+        if PerfilRepository.is_ascending_scan(sortable_field, cursor):
+            return sortable_field['expression'].asc(), Perfil.id.asc()
+        return sortable_field['expression'].desc(), Perfil.id.desc()
+
+    @staticmethod
+    def get_relationship_loaders():
+        """
+            Relacionamentos do perfil, indexados pelo campo de PerfilOutput que os utiliza
+        """
+        return {
+            "cursos": (
+                Perfil.vinculos_perfil_curso,
+                selectinload(Perfil.vinculos_perfil_curso).selectinload(VinculoPerfilCurso.curso)
+            ),
+            "interesses": (
+                Perfil.vinculos_perfil_interesse,
+                selectinload(Perfil.vinculos_perfil_interesse).selectinload(VinculoPerfilInteresse.interesse)
+            ),
+            "phones": (
+                Perfil.phones,
+                selectinload(Perfil.phones).selectinload(PerfilPhone.tipo_contato)
+            ),
+            "emails": (
+                Perfil.emails,
+                selectinload(Perfil.emails)
+            ),
+            "imagem_perfil": (
+                Perfil.imagem_perfil,
+                selectinload(Perfil.imagem_perfil).selectinload(Arquivo.variantes)
             )
-        )
-        return stmt
+        }
+
+    @staticmethod
+    def get_all_entities_select_statement(fields: Optional[Set[str]] = None):
+        """
+            Seleciona os perfis com os relacionamentos usados pelos campos informados
+            (todos, se nenhum campo for informado). Os demais relacionamentos não são
+            carregados (noload) e ficam vazios
+        """
+        options = []
+        for field, (relationship, loader) in PerfilRepository.get_relationship_loaders().items():
+            options.append(loader if fields is None or field in fields else noload(relationship))
+        return select(Perfil).options(*options)
 
     @staticmethod
     def get_default_select_statement():
@@ -120,9 +219,11 @@ class PerfilRepository:
             algorithm=self.environment.CURSOR_TOKEN_ALGORITHM
         )
 
-    async def find_profile_by_guid(self, guid_perfil: str, load_all_entities=True) -> Perfil:
+    async def find_profile_by_guid(
+        self, guid_perfil: str, load_all_entities=True, fields: Optional[Set[str]] = None
+    ) -> Perfil:
         stmt = (
-            PerfilRepository.get_all_entities_select_statement()
+            PerfilRepository.get_all_entities_select_statement(fields)
             if load_all_entities
             else PerfilRepository.get_default_select_statement()
         ).where(
@@ -137,10 +238,12 @@ class PerfilRepository:
             )
         return perfil
 
-    async def find_profile_by_guid_usuario(self, guid_usuario: str, load_all_entities=True) -> Perfil:
+    async def find_profile_by_guid_usuario(
+        self, guid_usuario: str, load_all_entities=True, fields: Optional[Set[str]] = None
+    ) -> Perfil:
 
         stmt = (
-            PerfilRepository.get_all_entities_select_statement()
+            PerfilRepository.get_all_entities_select_statement(fields)
             if load_all_entities
             else PerfilRepository.get_default_select_statement()
         ).where(
@@ -151,46 +254,218 @@ class PerfilRepository:
         perfil = query.scalars().unique().first()
         return perfil
 
+    async def load_profile_relationships(self, perfil: Perfil, fields: Set[str]) -> Perfil:
+        """
+            Carrega, no perfil construído a partir de uma escrita (RETURNING), apenas os
+            relacionamentos usados pelos campos informados, com uma query por relacionamento.
+            Os valores são atribuídos sem eventos de backref, de forma que o perfil não seja
+            incluído na sessão
+        """
+        relationship_statements = {
+            "cursos": (
+                'vinculos_perfil_curso',
+                select(VinculoPerfilCurso).
+                options(selectinload(VinculoPerfilCurso.curso)).
+                where(VinculoPerfilCurso.id_perfil == perfil.id)
+            ),
+            "interesses": (
+                'vinculos_perfil_interesse',
+                select(VinculoPerfilInteresse).
+                options(selectinload(VinculoPerfilInteresse.interesse)).
+                where(VinculoPerfilInteresse.id_perfil == perfil.id)
+            ),
+            "phones": (
+                'phones',
+                select(PerfilPhone).
+                options(selectinload(PerfilPhone.tipo_contato)).
+                where(PerfilPhone.id_perfil == perfil.id)
+            ),
+            "emails": (
+                'emails',
+                select(PerfilEmail).
+                where(PerfilEmail.id_perfil == perfil.id)
+            )
+        }
+
+        for field, (attribute, stmt) in relationship_statements.items():
+            if field in fields:
+                query = await self.db_session.execute(stmt)
+                set_committed_value(perfil, attribute, query.scalars().all())
+
+        if 'imagem_perfil' in fields:
+            imagem_perfil = None
+            if perfil.id_imagem_perfil is not None:
+                stmt = (
+                    select(Arquivo).
+                    options(selectinload(Arquivo.variantes)).
+                    where(Arquivo.id == perfil.id_imagem_perfil)
+                )
+                query = await self.db_session.execute(stmt)
+                imagem_perfil = query.scalars().first()
+            set_committed_value(perfil, 'imagem_perfil', imagem_perfil)
+
+        return perfil
+
+    def encode_profile_cursor(self, id_perfil: int, sort_value, sort_field_key: str, direction: str):
+        return self.encode_cursor({
+            'sort_field_key': sort_field_key,
+            'value': sort_value,
+            'id': id_perfil,
+            'direction': direction
+        })
+
+    async def find_profiles_by_ids(self, ids: List[int], fields: Optional[Set[str]] = None) -> List[Perfil]:
+        """
+            Carrega os perfis e todas as entidades vinculadas a partir dos IDs,
+            mantendo a ordem da lista de IDs
+        """
+
+        if not ids:
+            return []
+
+        stmt = PerfilRepository.get_all_entities_select_statement(fields).where(
+            Perfil.id.in_(ids)
+        )
+        query = await self.db_session.execute(stmt)
+
+        perfis_by_id = {perfil.id: perfil for perfil in query.scalars().all()}
+        return [perfis_by_id[id_perfil] for id_perfil in ids if id_perfil in perfis_by_id]
+
+    async def find_profiles_by_guids(
+        self, guids: List[str], guids_usuario: List[str], fields: Optional[Set[str]] = None
+    ) -> List[Perfil]:
+        """
+            Carrega, em uma única query, os perfis a partir dos GUIDs dos perfis ou dos usuários.
+            As entidades vinculadas são carregadas em uma query por relacionamento (selectinload)
+        """
+
+        if not guids and not guids_usuario:
+            return []
+
+        stmt = PerfilRepository.get_all_entities_select_statement(fields).where(
+            or_(
+                Perfil.guid.in_(guids),
+                Perfil.guid_usuario.in_(guids_usuario)
+            )
+        )
+        query = await self.db_session.execute(stmt)
+        return query.scalars().all()
+
+    async def find_profiles_by_name_similarity(
+        self, normalized_term: str, limit: int, fields: Optional[Set[str]] = None
+    ) -> List[Perfil]:
+        """
+            Busca os perfis com nome de exibição semelhante ao termo, ordenados pela
+            semelhança. O operador '<%' (word similarity do pg_trgm) é atendido pelo
+            índice trigram de nome_exibicao_normalized
+        """
+
+        similarity = func.word_similarity(normalized_term, Perfil.nome_exibicao_normalized)
+
+        stmt = (
+            select(Perfil.id)
+        ).where(
+            literal(normalized_term).op('<%')(Perfil.nome_exibicao_normalized)
+        ).order_by(
+            similarity.desc(), Perfil.id.asc()
+        ).limit(limit)
+
+        query = await self.db_session.execute(stmt)
+        return await self.find_profiles_by_ids(query.scalars().all(), fields)
+
     async def find_profiles_by_filters_paginated(
-        self, limit, encoded_cursor: str, cursor: Cursor, filters
+        self, limit, encoded_cursor: Optional[str], cursor: Optional[Cursor],
+        filters, sort_field_key: str, search: Optional[str] = None,
+        fields: Optional[Set[str]] = None
     ) -> dict:
 
-        # Offset a partir do cursor, geralmente é pelo ID
-        # Limit + 1 para capturar o ultimo perfil. Esse último perfil será usado no cursor
+        sortable_field = PerfilRepository.get_sortable_field(sort_field_key, search)
+        is_previous_page = cursor is not None and cursor.direction == 'previous'
+
+        # Paginação por chave (keyset): a página começa na tupla (campo, id) do cursor
+        # Limit + 1 para verificar se existem mais perfis além da página atual
         if cursor:
-            filters.append(PerfilRepository.build_cursor_filter(cursor))
-            filters.append(Perfil.id != cursor.id)
+            filters.append(PerfilRepository.build_cursor_filter(sortable_field, cursor))
 
+        # Primeira fase: busca apenas os IDs da página, sem joins
         stmt = (
-            PerfilRepository.get_all_entities_select_statement()
-        ).where(*filters).limit(limit+1).order_by(
-            Perfil.nome_exibicao.asc()
-        )
+            select(Perfil.id, sortable_field['expression'].label('sort_value'))
+        ).where(*filters).order_by(
+            *PerfilRepository.build_cursor_order_by(sortable_field, cursor)
+        ).limit(limit+1)
 
         # Executando a query
         query = await self.db_session.execute(stmt)
-        perfis = query.scalars().unique().all()
-
-        # Capturando o ultimo perfil e setando o next_cursor
-        next_cursor = None
-        if len(perfis) == (limit+1):
-            last_profile: Perfil = perfis[limit]
-            next_cursor = {
-                'previous_encoded_cursor': encoded_cursor,
-                'sort_field_key': cursor.sort_field_key if cursor else 'nome_exibicao',
-                'sort_field_type': cursor.sort_field_type if cursor else 'str',
-                'operator': 'ge',
-                'value': last_profile.nome_exibicao,
-                'id': last_profile.id
-            }
+        rows = query.all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if is_previous_page:
+            rows = list(reversed(rows))
+
+        # Segunda fase: carrega os perfis da página com as entidades vinculadas
+        perfis = await self.find_profiles_by_ids([row.id for row in rows], fields)
+
+        # Ao voltar uma página sempre existe uma página seguinte, e ao avançar
+        # sempre existe uma anterior
+        has_next = True if is_previous_page else has_more
+        has_previous = has_more if is_previous_page else cursor is not None
+
+        next_cursor = (
+            self.encode_profile_cursor(rows[-1].id, rows[-1].sort_value, sort_field_key, 'next')
+            if has_next and rows else None
+        )
+        previous_cursor = (
+            self.encode_profile_cursor(rows[0].id, rows[0].sort_value, sort_field_key, 'previous')
+            if has_previous and rows else None
+        )
 
         return {
-            "items": perfis[:limit],
+            "items": perfis,
             "current_cursor": encoded_cursor,
-            "next_cursor": self.encode_cursor(next_cursor) if next_cursor else None,
-            "count": len(perfis[:limit])
+            "next_cursor": next_cursor,
+            "previous_cursor": previous_cursor,
+            "count": len(perfis)
         }
 
+    async def atualiza_search_vector(self, id_perfil) -> None:
+        """
+            Recalcula o documento da busca textual do perfil. Deve ser chamado
+            sempre que o nome, a bio ou os vínculos com cursos e interesses mudarem
+        """
+        stmt = (
+            update(Perfil).
+            where(Perfil.id == id_perfil).
+            values(search_vector=PerfilRepository.get_search_vector_expression())
+        )
+        await self.db_session.execute(stmt)
+
+    async def atualiza_search_vector_by_ids(self, ids_perfil: List[int]) -> None:
+        if not ids_perfil:
+            return
+        stmt = (
+            update(Perfil).
+            where(Perfil.id.in_(ids_perfil)).
+            values(search_vector=PerfilRepository.get_search_vector_expression())
+        )
+        await self.db_session.execute(stmt)
+
+    async def insere_perfis_if_not_exist(self, perfil_dicts: List[dict]):
+        """
+            Insere os perfis em um único INSERT ... ON CONFLICT (guid_usuario) DO NOTHING.
+            Retorna (id, guid, guid_usuario) dos perfis inseridos
+        """
+        if not perfil_dicts:
+            return []
+        stmt = (
+            pg_insert(Perfil).
+            values(perfil_dicts).
+            on_conflict_do_nothing(index_elements=['guid_usuario']).
+            returning(Perfil.id, Perfil.guid, Perfil.guid_usuario)
+        )
+        query = await self.db_session.execute(stmt)
+        return query.fetchall()
+
     async def insere_perfil(self, perfil_dict: dict) -> Perfil:
         stmt = (
             insert(Perfil).
@@ -237,140 +512,154 @@ class PerfilRepository:
         perfil = Perfil(**row_to_dict)
         return perfil
 
-    async def delete_vinculos_curso_perfil(self, id_perfil: str):
-        stmt = (
-            delete(VinculoPerfilCurso).
-            where(VinculoPerfilCurso.id_perfil == id_perfil)
-        )
-        await self.db_session.execute(stmt)
-
-    async def delete_vinculos_interesse_perfil(self, id_perfil: str):
-        stmt = (
-            delete(VinculoPerfilInteresse).
-            where(VinculoPerfilInteresse.id_perfil == id_perfil)
-        )
-        await self.db_session.execute(stmt)
-
-    async def delete_phones_perfil(self, id_perfil: str):
-        stmt = (
-            delete(PerfilPhone).
-            where(PerfilPhone.id_perfil == id_perfil)
-        )
-        await self.db_session.execute(stmt)
-
-    async def delete_emails_perfil(self, id_perfil: str):
-        stmt = (
-            delete(PerfilEmail).
-            where(PerfilEmail.id_perfil == id_perfil)
-        )
-        await self.db_session.execute(stmt)
-
-    async def delete_perfil_by_id(self, id_perfil) -> None:
+    async def delete_perfil_by_guid_usuario(self, guid_usuario) -> Optional[int]:
+        """
+            Remove o perfil em um único DELETE ... RETURNING. Os vínculos, e-mails e telefones
+            do perfil são removidos pelo banco de dados (ON DELETE CASCADE).
+            Retorna o ID do perfil removido ou None se o perfil não existe
+        """
         stmt = (
             delete(Perfil).
-            where(Perfil.id == id_perfil)
-        )
-        await self.db_session.execute(stmt)
-
-    async def delete_perfil_by_guid(self, guid_perfil) -> None:
-
-        # Capturando o ID do perfil
-        perfil = await self.find_profile_by_guid(guid_perfil, load_all_entities=False)
-        id_perfil = perfil.id
-
-        # Deletando as entidades relacionadas
-        await self.delete_vinculos_interesse_perfil(id_perfil)
-        await self.delete_vinculos_curso_perfil(id_perfil)
-        await self.delete_phones_perfil(id_perfil)
-        await self.delete_emails_perfil(id_perfil)
-
-        # Deleta a entidade principal
-        await self.delete_perfil_by_id(id_perfil)
-
-    async def delete_perfil(self, id_perfil) -> None:
-        # Deletando as entidades relacionadas
-        await self.delete_vinculos_interesse_perfil(id_perfil)
-        await self.delete_vinculos_curso_perfil(id_perfil)
-        await self.delete_phones_perfil(id_perfil)
-        await self.delete_emails_perfil(id_perfil)
-
-        # Deleta a entidade principal
-        await self.delete_perfil_by_id(id_perfil)
-
-    async def find_vinculo_perfil_curso(self, id_curso, id_perfil):
-        stmt = (
-            select(VinculoPerfilCurso).
-            where(
-                VinculoPerfilCurso.id_perfil == id_perfil,
-                VinculoPerfilCurso.id_curso == id_curso
-            )
+            where(Perfil.guid_usuario == guid_usuario).
+            returning(Perfil.id)
         )
 
         # Executando a query
         query = await self.db_session.execute(stmt)
-        return query.scalars().unique().first()
+        return query.scalar()
 
-    async def insert_vinculo_perfil_curso(self, id_curso, id_perfil):
+    async def insert_vinculo_perfil_curso(self, id_curso, id_perfil) -> bool:
+        """
+            Insere o vínculo em um único INSERT ... ON CONFLICT DO NOTHING RETURNING.
+            Retorna False se o vínculo já existia
+        """
         stmt = (
-            insert(VinculoPerfilCurso).
+            pg_insert(VinculoPerfilCurso).
             values(
                 id_curso=id_curso,
                 id_perfil=id_perfil
-            )
+            ).
+            on_conflict_do_nothing(index_elements=['id_perfil', 'id_curso']).
+            returning(VinculoPerfilCurso.id)
         )
 
         # Executando a query
-        await self.db_session.execute(stmt)
+        query = await self.db_session.execute(stmt)
+        return query.scalar() is not None
 
-    async def delete_vinculo_perfil_curso(self, id_curso, id_perfil):
+    async def delete_vinculo_perfil_curso(self, id_curso, id_perfil) -> bool:
+        """
+            Remove o vínculo em um único DELETE ... RETURNING.
+            Retorna False se o vínculo não existia
+        """
         stmt = (
             delete(VinculoPerfilCurso).
             where(
                 VinculoPerfilCurso.id_perfil == id_perfil,
                 VinculoPerfilCurso.id_curso == id_curso
-            )
+            ).
+            returning(VinculoPerfilCurso.id)
         )
 
         # Executando a query
-        await self.db_session.execute(stmt)
+        query = await self.db_session.execute(stmt)
+        return query.scalar() is not None
+
+    async def insert_vinculo_perfil_interesse(self, id_interesse, id_perfil) -> bool:
+        """
+            Insere o vínculo em um único INSERT ... ON CONFLICT DO NOTHING RETURNING.
+            Retorna False se o vínculo já existia
+        """
+        stmt = (
+            pg_insert(VinculoPerfilInteresse).
+            values(
+                id_interesse=id_interesse,
+                id_perfil=id_perfil
+            ).
+            on_conflict_do_nothing(index_elements=['id_perfil', 'id_interesse']).
+            returning(VinculoPerfilInteresse.id)
+        )
+
+        # Executando a query
+        query = await self.db_session.execute(stmt)
+        return query.scalar() is not None
 
-    async def find_vinculo_perfil_interesse(self, id_interesse, id_perfil):
+    async def delete_vinculo_perfil_interesse(self, id_interesse, id_perfil) -> bool:
+        """
+            Remove o vínculo em um único DELETE ... RETURNING.
+            Retorna False se o vínculo não existia
+        """
         stmt = (
-            select(VinculoPerfilInteresse).
+            delete(VinculoPerfilInteresse).
             where(
                 VinculoPerfilInteresse.id_perfil == id_perfil,
                 VinculoPerfilInteresse.id_interesse == id_interesse
-            )
+            ).
+            returning(VinculoPerfilInteresse.id)
         )
 
         # Executando a query
         query = await self.db_session.execute(stmt)
-        return query.scalars().unique().first()
-
-    async def insert_vinculo_perfil_interesse(self, id_interesse, id_perfil):
+        return query.scalar() is not None
+
+    async def insert_vinculos_perfil(self, vinculo_model, id_column_name: str, id_perfil, ids: List[int]):
+        """
+            Vincula ao perfil, em um único INSERT, as entidades (cursos ou interesses) informadas.
+            Vínculos já existentes são mantidos (ON CONFLICT DO NOTHING)
+        """
+        if not ids:
+            return
         stmt = (
-            insert(VinculoPerfilInteresse).
-            values(
-                id_interesse=id_interesse,
-                id_perfil=id_perfil
-            )
+            pg_insert(vinculo_model).
+            values([
+                {'id_perfil': id_perfil, id_column_name: id_entidade}
+                for id_entidade in ids
+            ]).
+            on_conflict_do_nothing(index_elements=['id_perfil', id_column_name])
         )
 
         # Executando a query
         await self.db_session.execute(stmt)
 
-    async def delete_vinculo_perfil_interesse(self, id_interesse, id_perfil):
+    async def delete_vinculos_perfil(
+        self, vinculo_model, id_column_name: str, id_perfil, ids: List[int], keep_ids: bool = False
+    ):
+        """
+            Remove, em um único DELETE, os vínculos do perfil com as entidades informadas ou,
+            com keep_ids, todos os vínculos do perfil exceto os das entidades informadas (NOT IN)
+        """
+        id_column = getattr(vinculo_model, id_column_name)
         stmt = (
-            delete(VinculoPerfilInteresse).
+            delete(vinculo_model).
             where(
-                VinculoPerfilInteresse.id_perfil == id_perfil,
-                VinculoPerfilInteresse.id_interesse == id_interesse
+                vinculo_model.id_perfil == id_perfil,
+                id_column.not_in(ids) if keep_ids else id_column.in_(ids)
             )
         )
 
         # Executando a query
         await self.db_session.execute(stmt)
 
+    async def find_cursos_by_id_perfil(self, id_perfil) -> List[Curso]:
+        stmt = (
+            select(Curso).
+            join(VinculoPerfilCurso, VinculoPerfilCurso.id_curso == Curso.id).
+            where(VinculoPerfilCurso.id_perfil == id_perfil).
+            order_by(Curso.id)
+        )
+        query = await self.db_session.execute(stmt)
+        return query.scalars().all()
+
+    async def find_interesses_by_id_perfil(self, id_perfil) -> List[Interesse]:
+        stmt = (
+            select(Interesse).
+            join(VinculoPerfilInteresse, VinculoPerfilInteresse.id_interesse == Interesse.id).
+            where(VinculoPerfilInteresse.id_perfil == id_perfil).
+            order_by(Interesse.id)
+        )
+        query = await self.db_session.execute(stmt)
+        return query.scalars().all()
+
     async def insert_email_profile(self, perfil_email_dict):
         stmt = (
             insert(PerfilEmail).
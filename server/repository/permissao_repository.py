@@ -2,7 +2,7 @@ from server.configuration.db import AsyncSession
 from server.models.permissao_model import Permissao
 from server.models.vinculo_permissao_funcao_model import VinculoPermissaoFuncao
 from sqlalchemy import select
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from server.configuration.environment import Environment
 from sqlalchemy.orm import selectinload
 from sqlalchemy import and_
@@ -29,3 +29,15 @@ class PermissaoRepository:
         )
         query = await self.db_session.execute(stmt)
         return query.scalars().all()
+
+    async def find_all_role_permission_names(self) -> List[Tuple[int, str]]:
+        """
+            Retorna todos os pares (id_funcao, nome da permissão) de tb_vinculo_permissao_funcao,
+            utilizado para carregar o mapeamento completo de funções e permissões de uma só vez
+        """
+        stmt = (
+            select(VinculoPermissaoFuncao.id_funcao, Permissao.nome).
+            join(Permissao, VinculoPermissaoFuncao.id_permissao == Permissao.id)
+        )
+        query = await self.db_session.execute(stmt)
+        return query.all()
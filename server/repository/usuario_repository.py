@@ -1,8 +1,9 @@
-from sqlalchemy import insert, literal_column
+from sqlalchemy import insert, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from server.models.usuario_model import Usuario
 from server.configuration.db import AsyncSession
 from server.configuration.environment import Environment
-from typing import Optional
+from typing import List, Optional, Set
 
 
 class UsuarioRepository:
@@ -21,3 +22,28 @@ class UsuarioRepository:
         row_to_dict = dict(query.fetchone())
         return Usuario(**row_to_dict)
 
+    async def insere_usuarios_if_not_exist(self, usuario_dicts: List[dict]) -> List[str]:
+        """
+            Insere os usuários em um único INSERT ... ON CONFLICT DO NOTHING.
+            Retorna os GUIDs dos usuários inseridos
+        """
+        if not usuario_dicts:
+            return []
+        stmt = (
+            pg_insert(Usuario).
+            values(usuario_dicts).
+            on_conflict_do_nothing().
+            returning(Usuario.guid)
+        )
+        query = await self.db_session.execute(stmt)
+        return [str(guid) for guid in query.scalars().all()]
+
+    async def find_existing_guids(self, guids: List[str]) -> Set[str]:
+        if not guids:
+            return set()
+        stmt = (
+            select(Usuario.guid).
+            where(Usuario.guid.in_(guids))
+        )
+        query = await self.db_session.execute(stmt)
+        return {str(guid) for guid in query.scalars().all()}
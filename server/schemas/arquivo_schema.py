@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -14,12 +14,41 @@ class FileUploaderInput(BaseModel):
     acl: Optional[str]  # Permissions
 
 
+class FileStreamUploaderInput(BaseModel):
+
+    target: str  # Upload target como S3 bucket
+    region: str  # Região do target
+
+    key: str  # File unique key
+    type: Optional[str]  # File type
+    acl: Optional[str]  # Permissions
+
+
 class FileUploaderOutput(BaseModel):
 
     url: str
     additional_data: dict
 
 
+class PresignedUploadInput(BaseModel):
+
+    file_name: str = Field(example="Nome do arquivo (com extensão)")
+    file_type: str = Field(example="Tipo do arquivo (MIME), como image/png")
+
+
+class PresignedUploadOutput(BaseModel):
+
+    url: str = Field(example="URL para a qual o arquivo deve ser enviado (POST multipart/form-data)")
+    fields: dict = Field(example={"key": "u/guid/profile/uuid/foto.png", "policy": "..."})
+    key: str = Field(example="u/guid/profile/uuid/foto.png")
+    expires_in: int = Field(example=900)
+
+
+class PresignedUploadCompleteInput(BaseModel):
+
+    key: str = Field(example="Chave do arquivo retornada na criação do upload")
+
+
 class ArquivoInput(BaseModel):
 
     file_name: str = Field(example="Nome do arquivo (com extensão)")
@@ -27,12 +56,26 @@ class ArquivoInput(BaseModel):
     b64_content: str = Field(example="Conteúdo do arquivo codificado em base 64")
 
 
+class ArquivoVarianteOutput(BaseModel):
+
+    nome_variante: str = Field(example="thumb_64")
+    url: str
+    file_type: Optional[str] = Field(None, example="image/webp")
+    largura: Optional[int] = Field(None, example=64)
+    altura: Optional[int] = Field(None, example=64)
+
+    class Config:
+        orm_mode = True
+        arbitrary_types_allowed = True
+
+
 class ArquivoOutput(BaseModel):
 
     id: int
     url: str
     file_type: Optional[str]
     file_name: Optional[str]
+    variantes: Optional[List[ArquivoVarianteOutput]] = Field(None)
 
     created_at: Optional[datetime] = Field(None)
     updated_at: Optional[datetime] = Field(None)
@@ -43,3 +86,12 @@ class ArquivoOutput(BaseModel):
         orm_mode = True
         arbitrary_types_allowed = True
 
+
+class ArquivoGarbageCollectionReport(BaseModel):
+
+    dry_run: bool
+    removed_files: int = 0  # Linhas de tb_arquivo sem referências
+    removed_variants: int = 0  # Linhas de tb_arquivo_variante removidas em cascata
+    removed_objects: int = 0  # Objetos removidos do armazenamento
+    failed_objects: int = 0  # Objetos que o armazenamento não conseguiu remover
+    reclaimed_bytes: int = 0
@@ -0,0 +1,12 @@
+from pydantic import Field
+from pydantic import BaseModel
+from typing import Optional
+
+
+class CatalogCacheStatsOutput(BaseModel):
+
+    hits: int = Field(example=120)
+    misses: int = Field(example=3)
+    cursos: Optional[int] = Field(example=40)
+    interesses: Optional[int] = Field(example=25)
+    tipos_contato: Optional[int] = Field(example=4)
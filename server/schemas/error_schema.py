@@ -48,6 +48,17 @@ class ErrorOutput409(PerfilModelOutput):
         arbitrary_types_allowed = True
 
 
+class ErrorOutput413(PerfilModelOutput):
+    status_code: int = Field(example=413)
+    error_id: str = Field(example='ID único do tipo do erro no serviço')
+    message: str = Field(example='Mensagem do erro')
+    detail: str = Field(None, example='Detalhamento do erro')
+
+    class Config:
+        orm_mode = True
+        arbitrary_types_allowed = True
+
+
 class ErrorOutput422(PerfilModelOutput):
 
     status_code: int = Field(example=422)
@@ -71,3 +82,13 @@ class ErrorOutput500(PerfilModelOutput):
         orm_mode = True
         arbitrary_types_allowed = True
 
+
+class ErrorOutput504(PerfilModelOutput):
+    status_code: int = Field(example=504)
+    error_id: str = Field(example='ID único do tipo do erro no serviço')
+    message: str = Field(example='Mensagem do erro')
+    detail: str = Field(None, example='Detalhamento do erro')
+
+    class Config:
+        orm_mode = True
+        arbitrary_types_allowed = True
@@ -1,5 +1,5 @@
 from server.schemas import PerfilModelOutput, PerfilModelInput
-from pydantic import Field, BaseModel, EmailStr
+from pydantic import Field, BaseModel, EmailStr, Extra, root_validator
 from datetime import datetime
 from typing import List
 from pydantic import BaseModel
@@ -31,6 +31,47 @@ DisplayNameIlikeQuery = Query(
     description="Query string para filtrar perfis com nomes de exibição que contém esse valor",
 )
 
+DisplayNameSearchQuery = Query(
+    ...,
+    title="Termo buscado nos nomes de exibição dos perfis",
+    description="Termo buscado nos nomes de exibição dos perfis. Os resultados são ordenados "
+                "pela semelhança do nome com o termo",
+)
+
+DisplayNameSearchPageSizeQuery = Query(
+    10,
+    ge=1,
+    title="Quantidade máxima de perfis retornados na busca por nome de exibição",
+    description="Quantidade máxima de perfis retornados na busca por nome de exibição. "
+                "Valores acima do limite configurado são reduzidos a esse limite",
+)
+
+SearchQuery = Query(
+    None,
+    title="Busca textual nos nomes de exibição, bios, cursos e interesses dos perfis",
+    description="Busca textual nos nomes de exibição, bios, cursos e interesses dos perfis. "
+                "Aceita a sintaxe de busca web, como termos entre aspas e '-' para excluir termos",
+)
+
+FieldsQuery = Query(
+    None,
+    title="Campos do perfil retornados na resposta",
+    description="Lista, separada por vírgulas, dos campos do perfil retornados na resposta "
+                "(por exemplo, 'nome_exibicao,imagem_perfil'). Os campos 'guid' e 'guid_usuario' "
+                "são sempre retornados. Os relacionamentos (cursos, interesses, phones, emails e "
+                "imagem_perfil) que não forem solicitados não são carregados. "
+                "Por padrão, todos os campos são retornados",
+)
+
+SortByQuery = Query(
+    None,
+    title="Campo usado na ordenação dos perfis paginados",
+    description="Campo usado na ordenação dos perfis paginados. Valores aceitos: 'nome_exibicao', 'id' e, "
+                "junto com o parâmetro 'search', 'relevance'. Por padrão, a busca textual é ordenada pela "
+                "relevância e as demais listagens por 'nome_exibicao'. "
+                "Quando um cursor é enviado, a ordenação do cursor é mantida",
+)
+
 
 class PerfilInput(BaseModel):
 
@@ -86,6 +127,71 @@ class PerfilUsuarioPostInput(BaseModel):
     profile: NotOwnerPerfilPostInput
 
 
+class PerfilImportInput(BaseModel):
+    """
+    Perfil importado em lote. A imagem de perfil não é aceita na importação
+    e deve ser definida posteriormente pelo próprio usuário
+    """
+
+    guid_usuario: GUID
+    nome_exibicao: Optional[str] = Field(example="Nome de exibição do usuário no perfil")
+    bio: Optional[str] = Field(example='Texto de apresentação do usuário')
+    url_imagem: Optional[str] = Field(example='https://teste.com.br')
+
+    def convert_to_dict(self):
+        return self.dict()
+
+    class Config:
+        extra = Extra.forbid
+
+
+class PerfilUsuarioImportItemInput(BaseModel):
+    """
+    Usuário e perfil importados em lote
+    """
+
+    user: UsuarioPostInput
+    profile: PerfilImportInput
+
+    @root_validator(skip_on_failure=True)
+    def validate_guid_usuario(cls, values):
+        if values['profile'].guid_usuario != values['user'].guid:
+            raise ValueError(
+                f"O perfil do usuário {values['profile'].guid_usuario} "
+                f"não corresponde ao usuário {values['user'].guid}"
+            )
+        return values
+
+
+class PerfilUsuarioImportInput(BaseModel):
+    """
+    Importação em lote de usuários e perfis
+    """
+
+    items: List[PerfilUsuarioImportItemInput] = Field(..., min_items=1)
+
+    @root_validator(skip_on_failure=True)
+    def validate_unique_guid_usuario(cls, values):
+        guids_usuario = [str(item.user.guid) for item in values['items']]
+        duplicated_guids = sorted({guid for guid in guids_usuario if guids_usuario.count(guid) > 1})
+        if duplicated_guids:
+            raise ValueError(f"Os perfis dos usuários {duplicated_guids} aparecem mais de uma vez no lote")
+        return values
+
+
+class PerfilUsuarioImportItemOutput(BaseModel):
+
+    guid_usuario: GUID = Field(example='a4ddad94-94ee-4cdc-bce9-b5b126c9a714')
+    status: Literal['created', 'already_exists', 'user_conflict'] = Field(example='created')
+    guid: Optional[GUID] = Field(example='44ddad94-94ee-4cdc-bce9-b5b126c9a714')
+
+
+class PerfilUsuarioImportOutput(BaseModel):
+
+    items: List[PerfilUsuarioImportItemOutput]
+    created: int = Field(example='10')
+
+
 class PerfilOutput(BaseModel):
 
     guid: GUID = Field(example='44ddad94-94ee-4cdc-bce9-b5b126c9a714')
@@ -106,6 +212,39 @@ class PerfilOutput(BaseModel):
         arbitrary_types_allowed = True
 
 
+class VinculosPerfilPutInput(BaseModel):
+
+    ids: List[int] = Field(..., example=[1, 2])
+
+
+class VinculosPerfilPatchInput(BaseModel):
+
+    add: List[int] = Field([], example=[1, 2])
+    remove: List[int] = Field([], example=[3])
+
+    @root_validator
+    def validate_add_remove(cls, values):
+        ids_add_and_remove = set(values.get('add') or []) & set(values.get('remove') or [])
+        if ids_add_and_remove:
+            raise ValueError(
+                f"Os IDs {sorted(ids_add_and_remove)} não podem estar em 'add' e 'remove' ao mesmo tempo"
+            )
+        return values
+
+
+class PerfilBatchInput(BaseModel):
+
+    guids: List[GUID] = Field([], example=['44ddad94-94ee-4cdc-bce9-b5b126c9a714'])
+    guids_usuario: List[GUID] = Field([], example=['a4ddad94-94ee-4cdc-bce9-b5b126c9a714'])
+
+
+class PerfilBatchOutput(BaseModel):
+
+    items: List[PerfilOutput]
+    not_found_guids: List[GUID] = Field([])
+    not_found_guids_usuario: List[GUID] = Field([])
+
+
 class PaginatedPerfilOutput(PerfilModelOutput):
 
     items: List[PerfilOutput]
@@ -0,0 +1,10 @@
+from pydantic import Field
+from pydantic import BaseModel
+
+
+class PermissionCacheStatsOutput(BaseModel):
+
+    hits: int = Field(example=120)
+    misses: int = Field(example=3)
+    entries: int = Field(example=4)
+    ttl_in_seconds: int = Field(example=900)
@@ -39,3 +39,11 @@ class DecodedMailToken(BaseModel):
     email: EmailStr
     username: str
 
+
+class TokenCacheStatsOutput(BaseModel):
+
+    hits: int = Field(example=120)
+    misses: int = Field(example=3)
+    evictions: int = Field(example=0)
+    entries: int = Field(example=3)
+    max_size: int = Field(example=10000)
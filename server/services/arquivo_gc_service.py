@@ -0,0 +1,163 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List, Optional, Set
+from server.configuration.environment import Environment
+from server.configuration.custom_logging import get_main_logger
+from server.repository.arquivo_repository import ArquivoRepository
+from server.services.file_uploader.uploader import FileUploaderService
+from server.schemas.arquivo_schema import ArquivoGarbageCollectionReport
+
+
+MAIN_LOGGER = get_main_logger()
+
+USER_FILES_PREFIX = 'u/'
+
+
+class ArquivoGarbageCollectorService:
+
+    """
+        Coleta de arquivos órfãos
+
+        A coleta é feita em duas etapas:
+            1. Remoção das linhas de tb_arquivo que não são referenciadas por nenhum perfil
+            (por exemplo, imagens de perfil substituídas). As variantes são removidas em cascata
+            2. Remoção dos objetos sob o prefixo 'u/' do armazenamento que não estão registrados
+            em tb_arquivo nem em tb_arquivo_variante. Inclui os objetos das linhas removidas na
+            primeira etapa e os uploads cujas transações falharam após o envio ao armazenamento
+
+        Apenas arquivos e objetos mais antigos que ARQUIVO_GC_MIN_AGE_IN_SECONDS são considerados,
+        para não remover uploads em andamento. A idade dos arquivos é dada pelo updated_at, renovado
+        quando um upload deduplicado reutiliza o arquivo. Cada lote é processado em uma transação
+        própria e há um intervalo de ARQUIVO_GC_BATCH_INTERVAL_IN_SECONDS entre os lotes, limitando
+        a carga no banco de dados e no armazenamento
+    """
+
+    def __init__(
+        self,
+        file_uploader_service: FileUploaderService,
+        session_maker,
+        environment: Environment,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+        sleep: Callable[[float], Awaitable] = asyncio.sleep
+    ):
+        self.file_uploader_service = file_uploader_service
+        self.session_maker = session_maker
+        self.environment = environment
+        self.clock = clock
+        self.sleep = sleep
+
+    async def wait_next_batch(self):
+        await self.sleep(self.environment.ARQUIVO_GC_BATCH_INTERVAL_IN_SECONDS)
+
+    async def collect_unreferenced_arquivos(
+        self, updated_before: datetime, report: ArquivoGarbageCollectionReport
+    ) -> Set[str]:
+
+        """
+            Remove, em lotes, os arquivos sem referências. Retorna as URLs liberadas
+            (arquivos e variantes), que deixam de ser conhecidas na segunda etapa
+        """
+
+        released_urls = set()
+        last_id = 0
+        while True:
+            async with self.session_maker() as session:
+                arquivo_repo = ArquivoRepository(session)
+                arquivos = await arquivo_repo.find_unreferenced_arquivos(
+                    updated_before, last_id, self.environment.ARQUIVO_GC_BATCH_SIZE
+                )
+                if not arquivos:
+                    break
+                last_id = arquivos[-1].id
+
+                ids_arquivo = {arquivo.id for arquivo in arquivos}
+                variantes = await arquivo_repo.find_variantes_by_ids_arquivo(list(ids_arquivo))
+                if not report.dry_run:
+                    ids_arquivo = set(await arquivo_repo.delete_unreferenced_arquivos_by_ids(
+                        list(ids_arquivo), updated_before
+                    ))
+                    await session.commit()
+
+            released_urls.update(arquivo.url for arquivo in arquivos if arquivo.id in ids_arquivo)
+            released_urls.update(
+                variante.url for variante in variantes if variante.id_arquivo in ids_arquivo
+            )
+            report.removed_files += len(ids_arquivo)
+            report.removed_variants += sum(
+                1 for variante in variantes if variante.id_arquivo in ids_arquivo
+            )
+            await self.wait_next_batch()
+
+        return released_urls
+
+    async def delete_objects(self, objects: List[dict], report: ArquivoGarbageCollectionReport):
+        if report.dry_run:
+            deleted_keys = {s3_object['key'] for s3_object in objects}
+        else:
+            deleted_keys = set(await self.file_uploader_service.delete_files(
+                self.environment.AWS_S3_BUCKET, [s3_object['key'] for s3_object in objects]
+            ))
+        for s3_object in objects:
+            if s3_object['key'] in deleted_keys:
+                report.removed_objects += 1
+                report.reclaimed_bytes += s3_object['size']
+            else:
+                report.failed_objects += 1
+        await self.wait_next_batch()
+
+    async def collect_unknown_objects(
+        self, modified_before: datetime, released_urls: Set[str], report: ArquivoGarbageCollectionReport
+    ):
+
+        """
+            Remove, em lotes, os objetos do armazenamento que não estão registrados no banco de dados
+
+            Fora do dry_run, as linhas da primeira etapa já foram removidas e o banco de dados é a
+            fonte de verdade: uma URL liberada pode continuar em uso por outra linha (tb_arquivo.url
+            não é única). No dry_run, as URLs liberadas simulam a remoção que não foi feita
+        """
+
+        unknown_objects = []
+        async for objects in self.file_uploader_service.list_files(
+            self.environment.AWS_S3_BUCKET, self.environment.AWS_REGION_NAME, USER_FILES_PREFIX
+        ):
+            old_objects = [s3_object for s3_object in objects if s3_object['last_modified'] < modified_before]
+            async with self.session_maker() as session:
+                known_urls = await ArquivoRepository(session).find_known_urls(
+                    [s3_object['url'] for s3_object in old_objects]
+                )
+            unknown_objects.extend(
+                s3_object for s3_object in old_objects
+                if s3_object['url'] not in known_urls or (report.dry_run and s3_object['url'] in released_urls)
+            )
+
+            while len(unknown_objects) >= self.environment.ARQUIVO_GC_BATCH_SIZE:
+                await self.delete_objects(unknown_objects[:self.environment.ARQUIVO_GC_BATCH_SIZE], report)
+                unknown_objects = unknown_objects[self.environment.ARQUIVO_GC_BATCH_SIZE:]
+
+        if unknown_objects:
+            await self.delete_objects(unknown_objects, report)
+
+    async def collect(
+        self, dry_run: bool = False, min_age_in_seconds: Optional[int] = None
+    ) -> ArquivoGarbageCollectionReport:
+
+        """
+            Executa a coleta e retorna o relatório do que foi removido. Com dry_run,
+            nada é removido e o relatório indica o que seria removido
+        """
+
+        if min_age_in_seconds is None:
+            min_age_in_seconds = self.environment.ARQUIVO_GC_MIN_AGE_IN_SECONDS
+        modified_before = self.clock() - timedelta(seconds=min_age_in_seconds)
+        # updated_at é gravado com datetime.now(), no horário local e sem fuso horário
+        updated_before = modified_before.astimezone().replace(tzinfo=None)
+
+        report = ArquivoGarbageCollectionReport(dry_run=dry_run)
+        released_urls = await self.collect_unreferenced_arquivos(updated_before, report)
+        MAIN_LOGGER.info(f"Coleta de arquivos sem referências concluída: {report.dict()}")
+
+        await self.collect_unknown_objects(modified_before, released_urls, report)
+        MAIN_LOGGER.info(f"Coleta de objetos órfãos concluída: {report.dict()}")
+
+        return report
@@ -1,19 +1,27 @@
-from typing import Optional
+from typing import Optional, AsyncIterator
+from fastapi import UploadFile, BackgroundTasks
 from server.configuration.environment import Environment
 from server.repository.arquivo_repository import ArquivoRepository
 from server.services.file_uploader.uploader import FileUploaderService, FileUploaderInput
+from server.schemas.arquivo_schema import (
+    FileStreamUploaderInput, PresignedUploadInput, PresignedUploadOutput, PresignedUploadCompleteInput
+)
+from server.configuration import exceptions
 from server.schemas.usuario_schema import CurrentUserToken
 from server import utils
 from server.schemas.arquivo_schema import ArquivoInput
 import uuid
+import hashlib
 from server.models.arquivo_model import Arquivo
+from server.services.image_variant_service import ImageVariantService, VARIANT_KEY_DIRECTORY
 
 
 class ArquivoService:
 
     def __init__(
         self, file_uploader_service: FileUploaderService = None, arquivo_repo: Optional[ArquivoRepository] = None,
-        environment: Optional[Environment] = None,
+        environment: Optional[Environment] = None, image_variant_service: Optional[ImageVariantService] = None,
+        background_tasks: Optional[BackgroundTasks] = None
     ):
         self.file_uploader_service = file_uploader_service
 
@@ -21,28 +29,247 @@ class ArquivoService:
 
         self.arquivo_repo = arquivo_repo
 
+        self.image_variant_service = image_variant_service
+        self.background_tasks = background_tasks
+
+    def schedule_image_variants(self, arquivo: Arquivo, key: str) -> Arquivo:
+        """
+        Agenda a geração das variantes de imagens para depois da resposta da requisição
+        """
+        if (
+            self.image_variant_service and self.background_tasks is not None
+            and ImageVariantService.is_image(arquivo.file_type)
+        ):
+            self.background_tasks.add_task(self.image_variant_service.generate_variants, arquivo.id, key)
+        return arquivo
+
+    @staticmethod
+    def get_file_key_prefix(current_user: CurrentUserToken) -> str:
+        return f'u/{str(current_user.guid)}/profile/'
+
+    @staticmethod
+    def get_file_key(current_user: CurrentUserToken, file_name: str, content_hash: Optional[str] = None) -> str:
+        """
+        Arquivos com hash conhecido usam o hash no lugar do UUID, de forma que reenvios
+        do mesmo conteúdo sobrescrevam o mesmo objeto no armazenamento
+        """
+        unique_id = content_hash or str(uuid.uuid4())
+        return f'{ArquivoService.get_file_key_prefix(current_user)}{unique_id}/{file_name}'
+
+    @staticmethod
+    async def iter_file_chunks(
+        upload_file: UploadFile, chunk_size: int, max_file_size: int
+    ) -> AsyncIterator[bytes]:
+        """
+        Lê o arquivo enviado em chunks de chunk_size bytes, interrompendo a leitura
+        caso o tamanho total exceda max_file_size. Arquivos vazios geram um único chunk vazio
+        """
+
+        total_size = 0
+        while True:
+            chunk = await upload_file.read(chunk_size)
+            if not chunk and total_size > 0:
+                return
+
+            total_size += len(chunk)
+            if total_size > max_file_size:
+                raise exceptions.FileTooLargeException(
+                    detail=f'O arquivo {upload_file.filename} excede o limite de {max_file_size} bytes'
+                )
+
+            yield chunk
+
+            if not chunk:
+                return
+
+    async def hash_upload_file(self, upload_file: UploadFile) -> str:
+        """
+        Calcula o hash SHA-256 do arquivo enviado, lendo-o em chunks, e retorna
+        o arquivo para o início. O tamanho máximo do arquivo também é validado
+        """
+
+        content_hash = hashlib.sha256()
+        async for chunk in self.iter_file_chunks(
+            upload_file,
+            self.environment.S3_MULTIPART_PART_SIZE_IN_BYTES,
+            self.environment.MAX_UPLOAD_FILE_SIZE_IN_BYTES
+        ):
+            content_hash.update(chunk)
+        await upload_file.seek(0)
+        return content_hash.hexdigest()
+
+    async def find_arquivo_deduplicado(self, created_by: str, content_hash: str) -> Optional[Arquivo]:
+        """
+        Retorna o arquivo do usuário com o mesmo conteúdo, renovando o seu updated_at para que
+        a coleta de arquivos sem referências não o remova antes que o cliente o utilize
+        """
+
+        arquivo = await self.arquivo_repo.find_arquivo_by_content_hash(created_by, content_hash)
+        if arquivo and await self.arquivo_repo.atualiza_updated_at_arquivo(arquivo.id):
+            return arquivo
+        return None
+
+    async def insere_arquivo_deduplicado(self, arquivo_input_dict: dict, key: str) -> Arquivo:
+        """
+        Armazena o arquivo na tabela de 'Arquivo'. Caso um upload concorrente do mesmo
+        conteúdo, pelo mesmo usuário, já tenha sido registrado, o arquivo existente é retornado
+        """
+
+        arquivo = await self.arquivo_repo.insere_arquivo_if_hash_not_exists(arquivo_input_dict)
+        if arquivo is None:
+            arquivo = await self.find_arquivo_deduplicado(
+                arquivo_input_dict['created_by'], arquivo_input_dict['content_hash']
+            )
+            if arquivo:
+                return arquivo
+            # O arquivo existente foi removido pela coleta após o conflito
+            arquivo = await self.arquivo_repo.insere_arquivo(arquivo_input_dict)
+        return self.schedule_image_variants(arquivo, key)
+
     async def upload_arquivo(
         self, file_input: ArquivoInput  , current_user: CurrentUserToken
     ) -> Arquivo:
         """
         Faz o upload do arquivo e o armazena na tabela de 'Arquivo'
+
+        Se o usuário já tiver enviado um arquivo com o mesmo conteúdo (hash SHA-256),
+        o upload não é feito e o arquivo existente é retornado
         """
 
-        uploaded_file_output = self.file_uploader_service.upload(
+        content = utils.decode_b64_str(file_input.b64_content)
+        content_hash = hashlib.sha256(content).hexdigest()
+
+        arquivo = await self.find_arquivo_deduplicado(str(current_user.guid), content_hash)
+        if arquivo:
+            return arquivo
+
+        key = self.get_file_key(current_user, file_input.file_name, content_hash)
+        uploaded_file_output = await self.file_uploader_service.upload(
             FileUploaderInput(
                 target=self.environment.AWS_S3_BUCKET,
                 region=self.environment.AWS_REGION_NAME,
-                key=f'u/{str(current_user.guid)}/profile/{str(uuid.uuid4())}/{file_input.file_name}',
+                key=key,
                 type=file_input.file_type,
-                content=utils.decode_b64_str(file_input.b64_content)
+                content=content
             )
         )
 
-        return await self.arquivo_repo.insere_arquivo(
+        return await self.insere_arquivo_deduplicado(
             {
                 'url': uploaded_file_output.url,
                 'file_type': file_input.file_type,
-                'file_name': file_input.file_name
-            }
+                'file_name': file_input.file_name,
+                'content_hash': content_hash,
+                'created_by': str(current_user.guid)
+            },
+            key
+        )
+
+    async def upload_arquivo_stream(
+        self, upload_file: UploadFile, current_user: CurrentUserToken
+    ) -> Arquivo:
+        """
+        Faz o upload do arquivo enviado via multipart/form-data, em partes, e o armazena
+        na tabela de 'Arquivo'. No máximo uma parte do arquivo é mantida em memória
+
+        O hash do conteúdo é calculado antes do upload. Se o usuário já tiver enviado um arquivo
+        com o mesmo conteúdo, o upload não é feito e o arquivo existente é retornado
+        """
+
+        content_hash = await self.hash_upload_file(upload_file)
+
+        arquivo = await self.find_arquivo_deduplicado(str(current_user.guid), content_hash)
+        if arquivo:
+            return arquivo
+
+        key = self.get_file_key(current_user, upload_file.filename, content_hash)
+        uploaded_file_output = await self.file_uploader_service.upload_stream(
+            FileStreamUploaderInput(
+                target=self.environment.AWS_S3_BUCKET,
+                region=self.environment.AWS_REGION_NAME,
+                key=key,
+                type=upload_file.content_type
+            ),
+            self.iter_file_chunks(
+                upload_file,
+                self.environment.S3_MULTIPART_PART_SIZE_IN_BYTES,
+                self.environment.MAX_UPLOAD_FILE_SIZE_IN_BYTES
+            )
         )
 
+        return await self.insere_arquivo_deduplicado(
+            {
+                'url': uploaded_file_output.url,
+                'file_type': upload_file.content_type,
+                'file_name': upload_file.filename,
+                'content_hash': content_hash,
+                'created_by': str(current_user.guid)
+            },
+            key
+        )
+
+    async def create_presigned_upload(
+        self, presigned_upload_input: PresignedUploadInput, current_user: CurrentUserToken
+    ) -> PresignedUploadOutput:
+        """
+        Gera os dados para que o cliente envie o arquivo diretamente ao armazenamento,
+        sem que o conteúdo passe pela API
+        """
+
+        return await self.file_uploader_service.create_presigned_upload(
+            FileStreamUploaderInput(
+                target=self.environment.AWS_S3_BUCKET,
+                region=self.environment.AWS_REGION_NAME,
+                key=self.get_file_key(current_user, presigned_upload_input.file_name),
+                type=presigned_upload_input.file_type
+            ),
+            self.environment.MAX_UPLOAD_FILE_SIZE_IN_BYTES,
+            self.environment.S3_PRESIGNED_UPLOAD_EXPIRES_IN_SECONDS
+        )
+
+    async def complete_presigned_upload(
+        self, presigned_upload_complete_input: PresignedUploadCompleteInput, current_user: CurrentUserToken
+    ) -> Arquivo:
+        """
+        Verifica se o arquivo enviado diretamente ao armazenamento existe
+        e o armazena na tabela de 'Arquivo'
+
+        A operação é idempotente: se o arquivo já tiver sido registrado pelo usuário
+        (retentativa do cliente, por exemplo), o registro existente é retornado
+        """
+
+        key = presigned_upload_complete_input.key
+        if not key.startswith(self.get_file_key_prefix(current_user)):
+            raise exceptions.FileKeyNotAllowedException(
+                detail=f'A chave {key} não pertence ao usuário {current_user.username}'
+            )
+        if VARIANT_KEY_DIRECTORY in key.split('/')[:-1]:
+            raise exceptions.FileKeyNotAllowedException(
+                detail=f'A chave {key} pertence a uma variante gerada pelo sistema'
+            )
+
+        uploaded_file_output = await self.file_uploader_service.find_uploaded_file(
+            FileStreamUploaderInput(
+                target=self.environment.AWS_S3_BUCKET,
+                region=self.environment.AWS_REGION_NAME,
+                key=key
+            )
+        )
+        if uploaded_file_output is None:
+            raise exceptions.UploadedFileNotFoundException(
+                detail=f'O arquivo de chave {key} não foi enviado ao armazenamento'
+            )
+
+        arquivo = await self.arquivo_repo.find_arquivo_by_url(str(current_user.guid), uploaded_file_output.url)
+        if arquivo:
+            return arquivo
+
+        arquivo = await self.arquivo_repo.insere_arquivo(
+            {
+                'url': uploaded_file_output.url,
+                'file_type': uploaded_file_output.additional_data.get('ContentType'),
+                'file_name': key.rsplit('/', 1)[-1],
+                'created_by': str(current_user.guid)
+            }
+        )
+        return self.schedule_image_variants(arquivo, key)
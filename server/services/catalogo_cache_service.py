@@ -0,0 +1,141 @@
+import json
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, List, Type
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from server import utils
+from server.repository.curso_repository import CursoRepository
+from server.repository.interesse_repository import InteresseRepository
+from server.repository.tipo_contato_repository import TipoContatoRepository
+from server.schemas.curso_schema import CursoOutput
+from server.schemas.interesse_schema import InteresseOutput
+from server.schemas.tipo_contato_schema import TipoContatoOutput
+from server.configuration.custom_logging import get_main_logger
+
+
+MAIN_LOGGER = get_main_logger()
+
+
+class CatalogoSnapshot:
+
+    """
+        Conteúdo de um catálogo em um dado momento: as entidades, o corpo JSON
+        da listagem e o ETag (hash do corpo)
+    """
+
+    def __init__(self, items: List[BaseModel]):
+        self.items = items
+        self.content = json.dumps(jsonable_encoder(items)).encode()
+        self.etag = utils.get_strong_etag(self.content)
+
+    @staticmethod
+    def from_entities(entidades: list, output_model: Type[BaseModel]) -> 'CatalogoSnapshot':
+        return CatalogoSnapshot([output_model.from_orm(entidade) for entidade in entidades])
+
+
+class CatalogoCacheService:
+
+    """
+        Cache em memória (por processo) dos catálogos de cursos, interesses e tipos de contato
+
+        São tabelas pequenas e praticamente estáticas. Os catálogos são carregados na
+        inicialização da aplicação e recarregados periodicamente em segundo plano, de forma
+        que as listagens e as verificações de existência não consultem o banco de dados.
+        Um catálogo ainda não carregado (ou invalidado) é lido do banco na primeira consulta
+    """
+
+    def __init__(self):
+        self.catalogos: Dict[str, CatalogoSnapshot] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def filter_by_ids(entidades: list, ids: Iterable[int]) -> list:
+        ids = set(ids)
+        return [entidade for entidade in entidades if entidade.id in ids]
+
+    async def get_snapshot(
+        self, nome_catalogo: str, load: Callable[[], Awaitable[list]], output_model: Type[BaseModel]
+    ) -> CatalogoSnapshot:
+        snapshot = self.catalogos.get(nome_catalogo)
+        if snapshot is None:
+            self.misses += 1
+            snapshot = CatalogoSnapshot.from_entities(await load(), output_model)
+            self.catalogos[nome_catalogo] = snapshot
+        else:
+            self.hits += 1
+        return snapshot
+
+    async def get_cursos_snapshot(self, curso_repo: CursoRepository) -> CatalogoSnapshot:
+        return await self.get_snapshot(
+            'cursos', lambda: curso_repo.find_all_courses_by_filters([]), CursoOutput
+        )
+
+    async def get_interesses_snapshot(self, interesse_repo: InteresseRepository) -> CatalogoSnapshot:
+        return await self.get_snapshot(
+            'interesses', lambda: interesse_repo.find_all_interests_by_filters([]), InteresseOutput
+        )
+
+    async def get_tipos_contato_snapshot(self, tipo_contato_repo: TipoContatoRepository) -> CatalogoSnapshot:
+        return await self.get_snapshot(
+            'tipos_contato', lambda: tipo_contato_repo.find_all_tipos_contato_by_filters([]), TipoContatoOutput
+        )
+
+    async def get_cursos(self, curso_repo: CursoRepository) -> List[CursoOutput]:
+        return (await self.get_cursos_snapshot(curso_repo)).items
+
+    async def get_interesses(self, interesse_repo: InteresseRepository) -> List[InteresseOutput]:
+        return (await self.get_interesses_snapshot(interesse_repo)).items
+
+    async def get_tipos_contato(self, tipo_contato_repo: TipoContatoRepository) -> List[TipoContatoOutput]:
+        return (await self.get_tipos_contato_snapshot(tipo_contato_repo)).items
+
+    def invalidate(self):
+
+        """
+            Descarta todos os catálogos, que são lidos novamente do banco de dados na próxima consulta
+        """
+
+        self.catalogos = {}
+
+    def get_stats(self) -> dict:
+        stats = {
+            'hits': self.hits,
+            'misses': self.misses
+        }
+        for nome_catalogo in ('cursos', 'interesses', 'tipos_contato'):
+            snapshot = self.catalogos.get(nome_catalogo)
+            stats[nome_catalogo] = len(snapshot.items) if snapshot else None
+        return stats
+
+    async def load_all(self, session):
+
+        """
+            Recarrega todos os catálogos a partir da sessão informada
+        """
+
+        cursos = await CursoRepository(session).find_all_courses_by_filters([])
+        interesses = await InteresseRepository(session).find_all_interests_by_filters([])
+        tipos_contato = await TipoContatoRepository(session).find_all_tipos_contato_by_filters([])
+
+        self.catalogos = {
+            'cursos': CatalogoSnapshot.from_entities(cursos, CursoOutput),
+            'interesses': CatalogoSnapshot.from_entities(interesses, InteresseOutput),
+            'tipos_contato': CatalogoSnapshot.from_entities(tipos_contato, TipoContatoOutput)
+        }
+
+    async def refresh_periodically(self, session_maker, interval_in_seconds: int):
+
+        """
+            Recarrega os catálogos a cada interval_in_seconds até que a tarefa seja cancelada.
+            Falhas na recarga são registradas e a tentativa é repetida no próximo intervalo
+        """
+
+        while True:
+            await asyncio.sleep(interval_in_seconds)
+            try:
+                async with session_maker() as session:
+                    await self.load_all(session)
+                MAIN_LOGGER.info(f"Cache de catálogos recarregado: {self.get_stats()}")
+            except Exception:
+                MAIN_LOGGER.warning("Falha ao recarregar o cache de catálogos", exc_info=True)
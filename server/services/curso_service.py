@@ -1,14 +1,25 @@
 from typing import List, Optional
 from server.configuration.environment import Environment
+from server.services.catalogo_cache_service import CatalogoCacheService, CatalogoSnapshot
+from server.schemas.curso_schema import CursoOutput
 from server.repository.curso_repository import CursoRepository
 
 
 class CursoService:
 
-    def __init__(self, curso_repo: Optional[CursoRepository] = None, environment: Optional[Environment] = None):
+    def __init__(
+        self,
+        curso_repo: Optional[CursoRepository] = None,
+        environment: Optional[Environment] = None,
+        catalogo_cache: Optional[CatalogoCacheService] = None
+    ):
         self.curso_repo = curso_repo
         self.environment = environment
+        self.catalogo_cache = catalogo_cache
 
-    async def get_all_courses(self):
-        return await self.curso_repo.find_all_courses_by_filters([])
-
+    async def get_all_courses_snapshot(self) -> CatalogoSnapshot:
+        if self.catalogo_cache:
+            return await self.catalogo_cache.get_cursos_snapshot(self.curso_repo)
+        return CatalogoSnapshot.from_entities(
+            await self.curso_repo.find_all_courses_by_filters([]), CursoOutput
+        )
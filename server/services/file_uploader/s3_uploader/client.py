@@ -1,22 +1,58 @@
 import boto3
+import threading
+from botocore.config import Config
 from server.configuration.environment import Environment
-from server.schemas.arquivo_schema import FileUploaderInput
+from typing import List, Optional
+from botocore.exceptions import ClientError
+from server.schemas.arquivo_schema import FileUploaderInput, FileStreamUploaderInput
 
 
 class FIleUploaderClient:
 
+    """
+        Cliente do S3 utilizado pelos uploads
+
+        O cliente boto3 só é criado no primeiro upload e é reutilizado pelas threads
+        de upload (clientes boto3 são thread-safe). As conexões HTTP ficam em um pool
+        de até AWS_S3_MAX_POOL_CONNECTIONS conexões persistentes (keep-alive)
+    """
+
     def __init__(self, _environment: Environment = Environment):
-        self._s3_client = boto3.client(
+        self._environment = _environment
+        self._s3_client = None
+        self._s3_client_lock = threading.Lock()
+
+    def build_s3_client(self):
+        # Cada cliente usa a sua própria sessão, pois a sessão padrão do boto3 não é thread-safe
+        return boto3.session.Session().client(
             "s3",
-            aws_access_key_id=_environment.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=_environment.AWS_SECRET_KEY,
-            region_name=_environment.AWS_REGION_NAME,
+            aws_access_key_id=self._environment.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=self._environment.AWS_SECRET_KEY,
+            region_name=self._environment.AWS_REGION_NAME,
+            endpoint_url=self._environment.AWS_S3_ENDPOINT_URL,
+            config=Config(
+                connect_timeout=self._environment.AWS_S3_CONNECT_TIMEOUT_IN_SECONDS,
+                read_timeout=self._environment.AWS_S3_READ_TIMEOUT_IN_SECONDS,
+                max_pool_connections=self._environment.AWS_S3_MAX_POOL_CONNECTIONS,
+                retries={
+                    'max_attempts': self._environment.AWS_S3_MAX_ATTEMPTS,
+                    'mode': 'standard'
+                }
+            )
         )
 
+    @property
+    def s3_client(self):
+        if self._s3_client is None:
+            with self._s3_client_lock:
+                if self._s3_client is None:
+                    self._s3_client = self.build_s3_client()
+        return self._s3_client
+
     def upload(
         self, file_uploader_input: FileUploaderInput
     ):
-        return self._s3_client.put_object(
+        return self.s3_client.put_object(
             Bucket=file_uploader_input.target,
             Key=file_uploader_input.key,
             ContentType=file_uploader_input.type,
@@ -24,3 +60,86 @@ class FIleUploaderClient:
             ACL=file_uploader_input.acl or 'public-read'
         )
 
+    def create_multipart_upload(self, file_uploader_input: FileStreamUploaderInput) -> str:
+        response = self.s3_client.create_multipart_upload(
+            Bucket=file_uploader_input.target,
+            Key=file_uploader_input.key,
+            ContentType=file_uploader_input.type,
+            ACL=file_uploader_input.acl or 'public-read'
+        )
+        return response['UploadId']
+
+    def upload_part(
+        self, file_uploader_input: FileStreamUploaderInput, upload_id: str, part_number: int, content: bytes
+    ) -> dict:
+        response = self.s3_client.upload_part(
+            Bucket=file_uploader_input.target,
+            Key=file_uploader_input.key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=content
+        )
+        return {'ETag': response['ETag'], 'PartNumber': part_number}
+
+    def complete_multipart_upload(
+        self, file_uploader_input: FileStreamUploaderInput, upload_id: str, parts: List[dict]
+    ):
+        return self.s3_client.complete_multipart_upload(
+            Bucket=file_uploader_input.target,
+            Key=file_uploader_input.key,
+            UploadId=upload_id,
+            MultipartUpload={'Parts': parts}
+        )
+
+    def abort_multipart_upload(self, file_uploader_input: FileStreamUploaderInput, upload_id: str):
+        return self.s3_client.abort_multipart_upload(
+            Bucket=file_uploader_input.target,
+            Key=file_uploader_input.key,
+            UploadId=upload_id
+        )
+
+    def generate_presigned_post(
+        self, file_uploader_input: FileStreamUploaderInput, max_file_size: int, expires_in: int
+    ) -> dict:
+        acl = file_uploader_input.acl or 'public-read'
+        return self.s3_client.generate_presigned_post(
+            Bucket=file_uploader_input.target,
+            Key=file_uploader_input.key,
+            Fields={'Content-Type': file_uploader_input.type, 'acl': acl},
+            Conditions=[
+                {'Content-Type': file_uploader_input.type},
+                {'acl': acl},
+                ['content-length-range', 0, max_file_size]
+            ],
+            ExpiresIn=expires_in
+        )
+
+    def head_object(self, file_uploader_input: FileStreamUploaderInput) -> Optional[dict]:
+        try:
+            return self.s3_client.head_object(
+                Bucket=file_uploader_input.target,
+                Key=file_uploader_input.key
+            )
+        except ClientError as ex:
+            if ex.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise ex
+
+    def download(self, file_uploader_input: FileStreamUploaderInput) -> bytes:
+        response = self.s3_client.get_object(
+            Bucket=file_uploader_input.target,
+            Key=file_uploader_input.key
+        )
+        return response['Body'].read()
+
+    def list_objects(self, target: str, prefix: str, continuation_token: Optional[str] = None) -> dict:
+        list_kwargs = {'Bucket': target, 'Prefix': prefix}
+        if continuation_token:
+            list_kwargs['ContinuationToken'] = continuation_token
+        return self.s3_client.list_objects_v2(**list_kwargs)
+
+    def delete_objects(self, target: str, keys: List[str]) -> dict:
+        return self.s3_client.delete_objects(
+            Bucket=target,
+            Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True}
+        )
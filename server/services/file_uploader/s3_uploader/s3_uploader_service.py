@@ -1,22 +1,186 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncIterator, List, Optional
 from server.services.file_uploader.uploader import FileUploaderService
 from server.services.file_uploader.s3_uploader.client import FIleUploaderClient
 from server.configuration.environment import Environment
-from server.schemas.arquivo_schema import FileUploaderOutput, FileUploaderInput
+from server.configuration import exceptions
+from server.schemas.arquivo_schema import (
+    FileUploaderOutput, FileUploaderInput, FileStreamUploaderInput, PresignedUploadOutput
+)
+from server.configuration.custom_logging import get_main_logger
+
+
+MAIN_LOGGER = get_main_logger()
+
+S3_DELETE_OBJECTS_MAX_KEYS = 1000
 
 
 class S3FileUploaderService(FileUploaderService):
 
-    def __init__(self, _environment: Environment = Environment, _client: FIleUploaderClient = None):
+    """
+        Upload de arquivos no S3
+
+        O cliente boto3 é síncrono, então cada chamada ao S3 é executada em um pool de threads
+        limitado (_executor), o que também limita a quantidade de uploads simultâneos.
+        Chamadas que excedem _timeout_in_seconds, incluindo a espera por uma thread
+        livre, resultam em FileUploadTimeoutException
+    """
+
+    def __init__(
+        self,
+        _environment: Environment = Environment,
+        _client: FIleUploaderClient = None,
+        _executor: Optional[Executor] = None,
+        _timeout_in_seconds: Optional[float] = None
+    ):
         self._client = _client if _client else FIleUploaderClient(_environment)
+        self._executor = _executor
+        self._timeout_in_seconds = _timeout_in_seconds
+
+    async def run_in_executor(self, file_key: str, func, *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._executor, func, *args),
+                timeout=self._timeout_in_seconds
+            )
+        except asyncio.TimeoutError:
+            raise exceptions.FileUploadTimeoutException(
+                detail=f'O upload do arquivo {file_key} excedeu {self._timeout_in_seconds} segundos'
+            )
 
-    def upload(
+    @staticmethod
+    def get_file_url(file_input: FileStreamUploaderInput) -> str:
+        return f'https://{file_input.target}.s3.{file_input.region}.amazonaws.com/{file_input.key}'
+
+    async def upload(
         self, file_input: FileUploaderInput
     ) -> FileUploaderOutput:
-        uploaded_file_data = self._client.upload(file_input)
+        uploaded_file_data = await self.run_in_executor(
+            file_input.key, self._client.upload, file_input
+        )
+
+        return FileUploaderOutput(
+            url=self.get_file_url(file_input), additional_data=uploaded_file_data
+        )
+
+    async def upload_stream(
+        self, file_input: FileStreamUploaderInput, chunks: AsyncIterator[bytes]
+    ) -> FileUploaderOutput:
+
+        """
+            Envia o arquivo com o multipart upload do S3, uma parte por chunk recebido.
+            Apenas o chunk atual é mantido em memória. Em caso de erro, o multipart upload
+            é abortado para que as partes já enviadas não fiquem armazenadas no bucket
+        """
+
+        upload_id = await self.run_in_executor(
+            file_input.key, self._client.create_multipart_upload, file_input
+        )
 
-        url = f'https://{file_input.target}.s3.{file_input.region}.amazonaws.com/{file_input.key}'
+        try:
+            parts = []
+            async for chunk in chunks:
+                parts.append(
+                    await self.run_in_executor(
+                        file_input.key, self._client.upload_part,
+                        file_input, upload_id, len(parts) + 1, chunk
+                    )
+                )
+            uploaded_file_data = await self.run_in_executor(
+                file_input.key, self._client.complete_multipart_upload, file_input, upload_id, parts
+            )
+        except Exception as ex:
+            try:
+                await self.run_in_executor(
+                    file_input.key, self._client.abort_multipart_upload, file_input, upload_id
+                )
+            except Exception:
+                MAIN_LOGGER.warning(
+                    f"Não foi possível abortar o multipart upload do arquivo {file_input.key}",
+                    exc_info=True
+                )
+            raise ex
 
         return FileUploaderOutput(
-            url=url, additional_data=uploaded_file_data
+            url=self.get_file_url(file_input), additional_data=uploaded_file_data
         )
 
+    async def create_presigned_upload(
+        self, file_input: FileStreamUploaderInput, max_file_size: int, expires_in: int
+    ) -> PresignedUploadOutput:
+
+        """
+            Gera um presigned POST do S3. O tipo do arquivo e o tamanho máximo
+            fazem parte da política assinada e são validados pelo próprio S3
+        """
+
+        presigned_post = await self.run_in_executor(
+            file_input.key, self._client.generate_presigned_post, file_input, max_file_size, expires_in
+        )
+
+        return PresignedUploadOutput(
+            url=presigned_post['url'],
+            fields=presigned_post['fields'],
+            key=file_input.key,
+            expires_in=expires_in
+        )
+
+    async def find_uploaded_file(self, file_input: FileStreamUploaderInput) -> Optional[FileUploaderOutput]:
+        file_metadata = await self.run_in_executor(
+            file_input.key, self._client.head_object, file_input
+        )
+        if file_metadata is None:
+            return None
+
+        return FileUploaderOutput(
+            url=self.get_file_url(file_input), additional_data=file_metadata
+        )
+
+    async def download(self, file_input: FileStreamUploaderInput) -> bytes:
+        return await self.run_in_executor(
+            file_input.key, self._client.download, file_input
+        )
+
+    async def list_files(self, target: str, region: str, prefix: str) -> AsyncIterator[List[dict]]:
+        continuation_token = None
+        while True:
+            response = await self.run_in_executor(
+                prefix, self._client.list_objects, target, prefix, continuation_token
+            )
+            yield [
+                {
+                    'key': s3_object['Key'],
+                    'url': self.get_file_url(
+                        FileStreamUploaderInput(target=target, region=region, key=s3_object['Key'])
+                    ),
+                    'size': s3_object['Size'],
+                    'last_modified': s3_object['LastModified']
+                }
+                for s3_object in response.get('Contents', [])
+            ]
+            if not response.get('IsTruncated'):
+                break
+            continuation_token = response['NextContinuationToken']
+
+    async def delete_files(self, target: str, keys: List[str]) -> List[str]:
+
+        """
+            Remove os arquivos com o DeleteObjects do S3, em lotes de até 1000 chaves.
+            Chaves que o S3 não conseguiu remover são registradas no log e não são retornadas
+        """
+
+        deleted_keys = []
+        for start in range(0, len(keys), S3_DELETE_OBJECTS_MAX_KEYS):
+            batch_keys = keys[start:start + S3_DELETE_OBJECTS_MAX_KEYS]
+            response = await self.run_in_executor(
+                batch_keys[0], self._client.delete_objects, target, batch_keys
+            )
+            failed_keys = {error['Key'] for error in response.get('Errors', [])}
+            for error in response.get('Errors', []):
+                MAIN_LOGGER.warning(
+                    f"Não foi possível remover o arquivo {error['Key']}: {error.get('Message')}"
+                )
+            deleted_keys.extend(key for key in batch_keys if key not in failed_keys)
+        return deleted_keys
@@ -1,13 +1,65 @@
 import abc
-from server.schemas.arquivo_schema import FileUploaderInput, FileUploaderOutput
+from typing import AsyncIterator, List, Optional
+from server.schemas.arquivo_schema import (
+    FileUploaderInput, FileUploaderOutput, FileStreamUploaderInput, PresignedUploadOutput
+)
 
 
 class FileUploaderService:
 
     @abc.abstractmethod
-    def upload(self, file_input: FileUploaderInput) -> FileUploaderOutput:
+    async def upload(self, file_input: FileUploaderInput) -> FileUploaderOutput:
         """
         Interface para upload de arquivos
+
+        As implementações não devem bloquear o event loop durante o upload
+        """
+        pass
+
+    @abc.abstractmethod
+    async def upload_stream(
+        self, file_input: FileStreamUploaderInput, chunks: AsyncIterator[bytes]
+    ) -> FileUploaderOutput:
+        """
+        Interface para upload de arquivos em partes, sem manter o arquivo inteiro em memória
+        """
+        pass
+
+    @abc.abstractmethod
+    async def create_presigned_upload(
+        self, file_input: FileStreamUploaderInput, max_file_size: int, expires_in: int
+    ) -> PresignedUploadOutput:
+        """
+        Interface para gerar os dados de um upload feito diretamente pelo cliente no armazenamento
+        """
+        pass
+
+    @abc.abstractmethod
+    async def find_uploaded_file(self, file_input: FileStreamUploaderInput) -> Optional[FileUploaderOutput]:
+        """
+        Interface para verificar se um arquivo existe no armazenamento. Retorna None caso não exista
         """
         pass
 
+    @abc.abstractmethod
+    async def download(self, file_input: FileStreamUploaderInput) -> bytes:
+        """
+        Interface para download do conteúdo de um arquivo do armazenamento
+        """
+        pass
+
+    @abc.abstractmethod
+    def list_files(self, target: str, region: str, prefix: str) -> AsyncIterator[List[dict]]:
+        """
+        Interface para listagem, em páginas, dos arquivos do armazenamento com o prefixo informado
+
+        Cada arquivo é um dicionário com 'key', 'url', 'size' e 'last_modified'
+        """
+        pass
+
+    @abc.abstractmethod
+    async def delete_files(self, target: str, keys: List[str]) -> List[str]:
+        """
+        Interface para remoção de arquivos do armazenamento. Retorna as chaves removidas
+        """
+        pass
@@ -0,0 +1,150 @@
+import io
+import asyncio
+import posixpath
+from concurrent.futures import Executor
+from typing import List, Optional
+from PIL import Image, ImageOps
+from server.configuration.environment import Environment
+from server.configuration.custom_logging import get_main_logger
+from server.repository.arquivo_repository import ArquivoRepository
+from server.services.file_uploader.uploader import FileUploaderService
+from server.schemas.arquivo_schema import FileUploaderInput, FileStreamUploaderInput
+
+
+MAIN_LOGGER = get_main_logger()
+
+VARIANT_FILE_TYPE = 'image/webp'
+VARIANT_FILE_EXTENSION = 'webp'
+COMPRESSED_VARIANT_NAME = 'compressed'
+VARIANT_KEY_DIRECTORY = 'variants'
+
+
+def encode_image_variant(nome_variante: str, image: Image.Image, quality: int) -> dict:
+    buffer = io.BytesIO()
+    image.save(buffer, format='WEBP', quality=quality)
+    return {
+        'nome_variante': nome_variante,
+        'content': buffer.getvalue(),
+        'largura': image.width,
+        'altura': image.height
+    }
+
+
+def build_image_variants(
+    content: bytes, thumbnail_sizes: List[int], compressed_max_size: int, quality: int
+) -> List[dict]:
+
+    """
+        Gera as variantes WebP de uma imagem: miniaturas quadradas (recortadas ao centro)
+        para cada tamanho em thumbnail_sizes e uma versão comprimida com o maior lado
+        limitado a compressed_max_size
+
+        Executada nos processos do pool de variantes, por isso é uma função de módulo
+    """
+
+    with Image.open(io.BytesIO(content)) as original_image:
+        image = ImageOps.exif_transpose(original_image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+        variants = [
+            encode_image_variant(
+                f'thumb_{size}', ImageOps.fit(image, (size, size), Image.LANCZOS), quality
+            )
+            for size in thumbnail_sizes
+        ]
+
+        compressed_image = image.copy()
+        compressed_image.thumbnail((compressed_max_size, compressed_max_size), Image.LANCZOS)
+        variants.append(encode_image_variant(COMPRESSED_VARIANT_NAME, compressed_image, quality))
+
+    return variants
+
+
+class ImageVariantService:
+
+    """
+        Pipeline de variantes das imagens enviadas
+
+        Após o upload de uma imagem, as variantes são geradas em um pool de processos,
+        enviadas ao armazenamento ao lado do arquivo original e registradas em
+        tb_arquivo_variante. A rotina é executada em segundo plano, após a resposta da
+        requisição, e falhas são apenas registradas no log
+    """
+
+    def __init__(
+        self,
+        file_uploader_service: FileUploaderService,
+        session_maker,
+        executor: Optional[Executor] = None,
+        environment: Optional[Environment] = None
+    ):
+        self.file_uploader_service = file_uploader_service
+        self.session_maker = session_maker
+        self.executor = executor
+        self.environment = environment
+
+    @staticmethod
+    def is_image(file_type: Optional[str]) -> bool:
+        return bool(file_type) and file_type.startswith('image/')
+
+    @staticmethod
+    def get_variant_key(original_key: str, nome_variante: str) -> str:
+        """
+        As variantes ficam em um diretório próprio, ao lado do arquivo original, de forma
+        que um arquivo enviado com o mesmo nome de uma variante não seja sobrescrito
+        """
+        return posixpath.join(
+            posixpath.dirname(original_key), VARIANT_KEY_DIRECTORY, f'{nome_variante}.{VARIANT_FILE_EXTENSION}'
+        )
+
+    async def generate_variants(self, id_arquivo: int, original_key: str):
+        try:
+            original_content = await self.file_uploader_service.download(
+                FileStreamUploaderInput(
+                    target=self.environment.AWS_S3_BUCKET,
+                    region=self.environment.AWS_REGION_NAME,
+                    key=original_key
+                )
+            )
+
+            loop = asyncio.get_running_loop()
+            variants = await loop.run_in_executor(
+                self.executor,
+                build_image_variants,
+                original_content,
+                self.environment.IMAGE_VARIANT_THUMBNAIL_SIZES,
+                self.environment.IMAGE_VARIANT_COMPRESSED_MAX_SIZE,
+                self.environment.IMAGE_VARIANT_WEBP_QUALITY
+            )
+
+            variantes_input_dicts = []
+            for variant in variants:
+                uploaded_file_output = await self.file_uploader_service.upload(
+                    FileUploaderInput(
+                        target=self.environment.AWS_S3_BUCKET,
+                        region=self.environment.AWS_REGION_NAME,
+                        key=self.get_variant_key(original_key, variant['nome_variante']),
+                        type=VARIANT_FILE_TYPE,
+                        content=variant['content']
+                    )
+                )
+                variantes_input_dicts.append({
+                    'nome_variante': variant['nome_variante'],
+                    'url': uploaded_file_output.url,
+                    'file_type': VARIANT_FILE_TYPE,
+                    'largura': variant['largura'],
+                    'altura': variant['altura']
+                })
+
+            async with self.session_maker() as session:
+                await ArquivoRepository(session).insere_variantes_arquivo(id_arquivo, variantes_input_dicts)
+                await session.commit()
+
+            MAIN_LOGGER.info(f"Variantes geradas para o arquivo de ID={id_arquivo}")
+
+        except Exception:
+            MAIN_LOGGER.warning(
+                f"Não foi possível gerar as variantes do arquivo de ID={id_arquivo}",
+                exc_info=True
+            )
@@ -1,5 +1,7 @@
 from typing import List, Optional
 from server.configuration.environment import Environment
+from server.services.catalogo_cache_service import CatalogoCacheService, CatalogoSnapshot
+from server.schemas.interesse_schema import InteresseOutput
 from server.repository.interesse_repository import InteresseRepository
 
 
@@ -8,11 +10,16 @@ class InteresseService:
     def __init__(
         self,
         interesse_repo: Optional[InteresseRepository] = None,
-        environment: Optional[Environment] = None
+        environment: Optional[Environment] = None,
+        catalogo_cache: Optional[CatalogoCacheService] = None
     ):
         self.interesse_repo = interesse_repo
         self.environment = environment
+        self.catalogo_cache = catalogo_cache
 
-    async def get_all_interests(self):
-        return await self.interesse_repo.find_all_interests_by_filters([])
-
+    async def get_all_interests_snapshot(self) -> CatalogoSnapshot:
+        if self.catalogo_cache:
+            return await self.catalogo_cache.get_interesses_snapshot(self.interesse_repo)
+        return CatalogoSnapshot.from_entities(
+            await self.interesse_repo.find_all_interests_by_filters([]), InteresseOutput
+        )
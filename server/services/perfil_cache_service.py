@@ -0,0 +1,82 @@
+from typing import Optional
+from aioredis import Redis
+from aioredis.exceptions import RedisError
+from server.schemas.perfil_schema import PerfilOutput
+from server.configuration.custom_logging import get_main_logger
+
+
+MAIN_LOGGER = get_main_logger()
+
+
+class PerfilCacheService:
+
+    """
+        Cache read-through, no Redis, dos perfis serializados (PerfilOutput)
+
+        O perfil é armazenado uma única vez, na chave do seu ID, e as chaves do GUID do perfil
+        e do GUID do usuário apontam para esse ID. Assim, a invalidação remove uma única chave
+        e pode ser feita por qualquer escrita que conheça o id_perfil (emails e telefones,
+        por exemplo). Os apontamentos nunca ficam desatualizados, pois os GUIDs são imutáveis
+
+        Falhas de comunicação com o Redis não interrompem as requisições: o perfil é lido
+        do banco de dados e a falha é registrada no log
+    """
+
+    def __init__(self, redis: Redis, ttl_in_seconds: int, key_prefix: str = 'perfis'):
+        self.redis = redis
+        self.ttl_in_seconds = ttl_in_seconds
+        self.key_prefix = key_prefix
+
+    def get_profile_key(self, id_perfil) -> str:
+        return f'{self.key_prefix}:perfil:{id_perfil}'
+
+    def get_guid_key(self, guid_perfil) -> str:
+        return f'{self.key_prefix}:guid:{guid_perfil}'
+
+    def get_guid_usuario_key(self, guid_usuario) -> str:
+        return f'{self.key_prefix}:usuario:{guid_usuario}'
+
+    async def get_profile_by_alias_key(self, alias_key: str) -> Optional[PerfilOutput]:
+        try:
+            id_perfil = await self.redis.get(alias_key)
+            if id_perfil is None:
+                return None
+            cached_profile = await self.redis.get(self.get_profile_key(id_perfil))
+        except (RedisError, OSError):
+            MAIN_LOGGER.warning("Falha na leitura do cache de perfis", exc_info=True)
+            return None
+
+        if cached_profile is None:
+            return None
+        return PerfilOutput.parse_raw(cached_profile)
+
+    async def get_profile_by_guid(self, guid_perfil) -> Optional[PerfilOutput]:
+        return await self.get_profile_by_alias_key(self.get_guid_key(guid_perfil))
+
+    async def get_profile_by_guid_usuario(self, guid_usuario) -> Optional[PerfilOutput]:
+        return await self.get_profile_by_alias_key(self.get_guid_usuario_key(guid_usuario))
+
+    async def set_profile(self, id_perfil: int, perfil_output: PerfilOutput):
+        try:
+            async with self.redis.pipeline(transaction=True) as pipeline:
+                pipeline.set(self.get_profile_key(id_perfil), perfil_output.json(), ex=self.ttl_in_seconds)
+                pipeline.set(self.get_guid_key(perfil_output.guid), id_perfil, ex=self.ttl_in_seconds)
+                pipeline.set(
+                    self.get_guid_usuario_key(perfil_output.guid_usuario), id_perfil, ex=self.ttl_in_seconds
+                )
+                await pipeline.execute()
+        except (RedisError, OSError):
+            MAIN_LOGGER.warning(f"Falha na escrita do perfil de ID={id_perfil} no cache", exc_info=True)
+
+    async def invalidate(self, id_perfil: int):
+        try:
+            await self.redis.delete(self.get_profile_key(id_perfil))
+        except (RedisError, OSError):
+            MAIN_LOGGER.warning(
+                f"Falha na invalidação do perfil de ID={id_perfil} no cache. "
+                f"O perfil pode ficar desatualizado por até {self.ttl_in_seconds} segundos",
+                exc_info=True
+            )
+
+    async def close(self):
+        await self.redis.close()
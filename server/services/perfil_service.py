@@ -1,7 +1,8 @@
-from server.configuration import exceptions
-from jose import jwt
-from typing import List, Optional
-from fastapi import Request
+from server.configuration import exceptions, db
+from jose import JWTError, jwt
+from pydantic import ValidationError
+from typing import List, Optional, Set
+from fastapi import Request, UploadFile
 from server.configuration.environment import Environment
 from server.schemas.usuario_schema import CurrentUserToken
 from server.repository.perfil_repository import PerfilRepository
@@ -19,8 +20,13 @@ from server.repository.tipo_contato_repository import TipoContatoRepository
 from server.models.tipo_contato_model import TipoContato
 from server.services.arquivo_service import ArquivoService
 from server.models.arquivo_model import Arquivo
-from server.schemas.perfil_schema import UsuarioPostInput
+from server.schemas.perfil_schema import UsuarioPostInput, PerfilUsuarioPostInput, PerfilUsuarioImportItemInput
 from server.repository.usuario_repository import UsuarioRepository
+from server.schemas.perfil_schema import PerfilOutput
+from server.services.perfil_cache_service import PerfilCacheService
+from server.services.catalogo_cache_service import CatalogoCacheService
+from server.models.vinculo_perfil_curso_model import VinculoPerfilCurso
+from server.models.vinculo_perfil_interesse_model import VinculoPerfilInteresse
 
 
 class PerfilService:
@@ -28,9 +34,10 @@ class PerfilService:
     @staticmethod
     def get_filter_factory():
         return {
-            "interests_in": InteresseRepository.get_interests_in_filter,
-            "courses_in": CursoRepository.get_courses_in_filter,
-            "display_name_ilike": PerfilRepository.get_name_ilike_filter
+            "interests_in": PerfilRepository.get_interests_in_filter,
+            "courses_in": PerfilRepository.get_courses_in_filter,
+            "display_name_ilike": PerfilRepository.get_name_ilike_filter,
+            "search": PerfilRepository.get_full_text_search_filter
         }
 
     @staticmethod
@@ -44,24 +51,15 @@ class PerfilService:
         return filters
 
     @staticmethod
-    def get_previous_url(request: Request):
-        return str(request.url)
-
-    @staticmethod
-    def get_next_url(request: Request, path: str, next_encoded_cursor: str):
-        if not next_encoded_cursor:
+    def get_cursor_url(request: Request, encoded_cursor: Optional[str]):
+        if not encoded_cursor:
             return None
 
-        query_params_dict = dict(request.query_params)
-        query_string_builder = '?'
-
-        for query_param_key in [key for key in query_params_dict.keys() if key != 'cursor']:
-            query_param_value = query_params_dict[query_param_key]
-            query_string_builder += f'{query_param_key}={query_param_value}&'
-
-        query_string_builder += f'cursor={next_encoded_cursor}'
-
-        return f"{request.base_url}{path}{query_string_builder}"
+        # Mantém todos os parâmetros da query string atual, inclusive os repetidos
+        # (como interests_in), substituindo apenas o cursor
+        return str(
+            request.url.remove_query_params('cursor').include_query_params(cursor=encoded_cursor)
+        )
 
     @staticmethod
     def handle_profile_body(perfil: Perfil):
@@ -79,16 +77,65 @@ class PerfilService:
             PerfilService.handle_profile_body(perfil)
         return perfil_list
 
+    @staticmethod
+    def get_fields_by_param(fields_param: Optional[str]) -> Optional[Set[str]]:
+        """
+            Converte o parâmetro 'fields' (campos de PerfilOutput separados por vírgula)
+            no conjunto de campos retornados. None indica todos os campos
+        """
+        if not fields_param:
+            return None
+
+        fields = {field.strip() for field in fields_param.split(',') if field.strip()}
+        invalid_fields = fields - set(PerfilOutput.__fields__)
+        if invalid_fields:
+            raise exceptions.InvalidProfileFieldsException(
+                detail=f"Campos inválidos: {', '.join(sorted(invalid_fields))}. "
+                       f"Campos aceitos: {', '.join(PerfilOutput.__fields__)}"
+            )
+        return fields | {'guid', 'guid_usuario'}
+
+    @staticmethod
+    def select_profile_fields(perfil, fields: Optional[Set[str]]):
+        """
+            Mantém apenas os campos solicitados do perfil (ORM ou PerfilOutput). Os endpoints
+            que aceitam o parâmetro 'fields' omitem da resposta os campos não preenchidos
+        """
+        if fields is None:
+            return perfil
+        if not isinstance(perfil, PerfilOutput):
+            perfil = PerfilOutput.from_orm(perfil)
+        return perfil.dict(include=fields)
+
+    @staticmethod
+    def select_profile_list_fields(perfil_list: list, fields: Optional[Set[str]]):
+        return [PerfilService.select_profile_fields(perfil, fields) for perfil in perfil_list]
+
+    @staticmethod
+    def get_profile_json_content(perfil) -> bytes:
+        """
+            Corpo JSON da resposta de um perfil (ORM, PerfilOutput ou campos selecionados),
+            omitindo os campos não preenchidos
+        """
+        if isinstance(perfil, dict):
+            perfil = PerfilOutput(**perfil)
+        elif not isinstance(perfil, PerfilOutput):
+            perfil = PerfilOutput.from_orm(perfil)
+        return perfil.json(exclude_unset=True).encode()
+
     @staticmethod
     def handle_profile_pagination(
-        paginated_profile_dict: dict, previous_encoded_cursor: str, request: Request
+        paginated_profile_dict: dict, request: Request, fields: Optional[Set[str]] = None
     ):
-        next_encoded_cursor = paginated_profile_dict['next_cursor']
-
-        paginated_profile_dict['items'] = PerfilService.handle_profile_body_list(paginated_profile_dict['items'])
-        paginated_profile_dict['previous_cursor'] = previous_encoded_cursor
-        paginated_profile_dict['previous_url'] = PerfilService.get_previous_url(request)
-        paginated_profile_dict['next_url'] = PerfilService.get_next_url(request, request.url.path, next_encoded_cursor)
+        paginated_profile_dict['items'] = PerfilService.select_profile_list_fields(
+            PerfilService.handle_profile_body_list(paginated_profile_dict['items']), fields
+        )
+        paginated_profile_dict['previous_url'] = PerfilService.get_cursor_url(
+            request, paginated_profile_dict['previous_cursor']
+        )
+        paginated_profile_dict['next_url'] = PerfilService.get_cursor_url(
+            request, paginated_profile_dict['next_cursor']
+        )
 
         return paginated_profile_dict
 
@@ -106,7 +153,9 @@ class PerfilService:
         tipo_contato_repo: Optional[TipoContatoRepository] = None,
         usuario_repo: Optional[UsuarioRepository] = None,
         environment: Optional[Environment] = None,
-        arquivo_service: Optional[ArquivoService] = None
+        arquivo_service: Optional[ArquivoService] = None,
+        perfil_cache: Optional[PerfilCacheService] = None,
+        catalogo_cache: Optional[CatalogoCacheService] = None
     ):
         self.perfil_repo = perfil_repo
         self.curso_repo = curso_repo
@@ -116,48 +165,184 @@ class PerfilService:
 
         self.environment = environment
         self.arquivo_service = arquivo_service
+        self.perfil_cache = perfil_cache
+        self.catalogo_cache = catalogo_cache
 
     def decode_cursor_info(self, encoded_cursor: str):
-        decoded_cursor_dict = jwt.decode(
-            encoded_cursor,
-            self.environment.CURSOR_TOKEN_SECRET_KEY,
-            algorithms=[self.environment.CURSOR_TOKEN_ALGORITHM]
+        try:
+            decoded_cursor_dict = jwt.decode(
+                encoded_cursor,
+                self.environment.CURSOR_TOKEN_SECRET_KEY,
+                algorithms=[self.environment.CURSOR_TOKEN_ALGORITHM]
+            )
+            return Cursor(**decoded_cursor_dict)
+        except (JWTError, ValidationError):
+            raise exceptions.InvalidCursorException(
+                detail="O cursor enviado é inválido ou foi adulterado"
+            )
+
+    async def find_cursos_by_ids(self, ids_curso: List[int]) -> list:
+        """
+            Busca os cursos no cache de catálogos, se houver, ou no banco de dados
+        """
+        if self.catalogo_cache:
+            return self.catalogo_cache.filter_by_ids(await self.catalogo_cache.get_cursos(self.curso_repo), ids_curso)
+        return await self.curso_repo.find_all_courses_by_filters([Curso.id.in_(ids_curso)])
+
+    async def find_interesses_by_ids(self, ids_interesse: List[int]) -> list:
+        if self.catalogo_cache:
+            return self.catalogo_cache.filter_by_ids(
+                await self.catalogo_cache.get_interesses(self.interesse_repo), ids_interesse
+            )
+        return await self.interesse_repo.find_all_interests_by_filters([Interesse.id.in_(ids_interesse)])
+
+    async def find_tipos_contato_by_ids(self, ids_tipo_contato: List[int]) -> list:
+        if self.catalogo_cache:
+            return self.catalogo_cache.filter_by_ids(
+                await self.catalogo_cache.get_tipos_contato(self.tipo_contato_repo), ids_tipo_contato
+            )
+        return await self.tipo_contato_repo.find_all_tipos_contato_by_filters(
+            [TipoContato.id.in_(ids_tipo_contato)]
         )
-        return Cursor(**decoded_cursor_dict)
 
-    async def get_profile_by_guid(self, guid_profile: str):
-        perfil = await self.perfil_repo.find_profile_by_guid(guid_profile)
+    async def cache_profile(self, perfil: Perfil):
+        """
+            Armazena o perfil serializado no cache de perfis, se houver,
+            e retorna a saída do endpoint
+        """
+        perfil = self.handle_profile_body(perfil)
+        if not self.perfil_cache:
+            return perfil
+        perfil_output = PerfilOutput.from_orm(perfil)
+        await self.perfil_cache.set_profile(perfil.id, perfil_output)
+        return perfil_output
+
+    async def invalidate_profile_cache(self, id_perfil: int):
+        """
+            Remove o perfil do cache imediatamente e novamente após o commit da transação.
+            Antes do commit, uma leitura concorrente ainda obtém a versão anterior do perfil
+            no banco de dados e poderia armazená-la no cache até o fim do TTL
+        """
+        if self.perfil_cache:
+            await self.perfil_cache.invalidate(id_perfil)
+            db.add_after_commit_callback(
+                self.perfil_repo.db_session, lambda: self.perfil_cache.invalidate(id_perfil)
+            )
+
+    async def get_profile_by_guid(self, guid_profile: str, fields: Optional[Set[str]] = None):
+        if self.perfil_cache:
+            perfil_output = await self.perfil_cache.get_profile_by_guid(guid_profile)
+            if perfil_output:
+                return self.select_profile_fields(perfil_output, fields)
+
+        perfil = await self.perfil_repo.find_profile_by_guid(guid_profile, fields=fields)
         if not perfil:
             raise exceptions.ProfileNotFoundException(
                 detail=f"O perfil de GUID={guid_profile} não foi encontrado."
             )
-        return self.handle_profile_body(perfil)
-
-    async def get_profile_by_guid_usuario(self, guid_usuario: str):
-        perfil = await self.perfil_repo.find_profile_by_guid_usuario(guid_usuario)
+        # Apenas perfis completos são armazenados no cache
+        if fields is None:
+            return await self.cache_profile(perfil)
+        return self.select_profile_fields(self.handle_profile_body(perfil), fields)
+
+    async def get_profile_by_guid_usuario(self, guid_usuario: str, fields: Optional[Set[str]] = None):
+        if self.perfil_cache:
+            perfil_output = await self.perfil_cache.get_profile_by_guid_usuario(guid_usuario)
+            if perfil_output:
+                return self.select_profile_fields(perfil_output, fields)
+
+        perfil = await self.perfil_repo.find_profile_by_guid_usuario(guid_usuario, fields=fields)
         if not perfil:
             raise exceptions.ProfileNotFoundException(
                 detail=f"O perfil do usuário de GUID={guid_usuario} não foi encontrado."
             )
-        return self.handle_profile_body(perfil)
+        # Apenas perfis completos são armazenados no cache
+        if fields is None:
+            return await self.cache_profile(perfil)
+        return self.select_profile_fields(self.handle_profile_body(perfil), fields)
+
+    async def get_profiles_batch(
+        self, guids: List[str], guids_usuario: List[str], fields: Optional[Set[str]] = None
+    ) -> dict:
+        """
+            Retorna os perfis a partir de listas de GUIDs de perfis e de usuários, na ordem
+            das listas e sem repetições. Os GUIDs sem perfil são retornados separadamente
+        """
+
+        guids = list(dict.fromkeys(str(guid) for guid in guids))
+        guids_usuario = list(dict.fromkeys(str(guid_usuario) for guid_usuario in guids_usuario))
+
+        max_size = self.environment.PROFILE_BATCH_MAX_SIZE
+        if len(guids) + len(guids_usuario) > max_size:
+            raise exceptions.ProfileBatchTooLargeException(
+                detail=f"Podem ser buscados no máximo {max_size} perfis por requisição"
+            )
+
+        perfis = self.handle_profile_body_list(
+            await self.perfil_repo.find_profiles_by_guids(guids, guids_usuario, fields)
+        )
+        perfis_by_guid = {str(perfil.guid): perfil for perfil in perfis}
+        perfis_by_guid_usuario = {str(perfil.guid_usuario): perfil for perfil in perfis}
+
+        items = {}
+        for guid in guids:
+            if guid in perfis_by_guid:
+                items[guid] = perfis_by_guid[guid]
+        for guid_usuario in guids_usuario:
+            if guid_usuario in perfis_by_guid_usuario:
+                perfil = perfis_by_guid_usuario[guid_usuario]
+                items[str(perfil.guid)] = perfil
+
+        return {
+            'items': self.select_profile_list_fields(list(items.values()), fields),
+            'not_found_guids': [guid for guid in guids if guid not in perfis_by_guid],
+            'not_found_guids_usuario': [
+                guid_usuario for guid_usuario in guids_usuario if guid_usuario not in perfis_by_guid_usuario
+            ]
+        }
 
     async def get_all_profiles_paginated(
         self, filter_params_dict: dict,
-        request: Request, limit: int, cursor: str
+        request: Request, limit: int, cursor: str,
+        sort_field_key: Optional[str] = None, fields: Optional[Set[str]] = None
     ):
         filters = PerfilService.get_filters_by_params(filter_params_dict)
         decoded_cursor = self.decode_cursor_info(cursor) if cursor else None
-        previous_encoded_cursor = decoded_cursor.previous_encoded_cursor if decoded_cursor else None
+        search = filter_params_dict.get('search')
 
-        paginated_profile_dict = await self.perfil_repo.\
-            find_profiles_by_filters_paginated(limit, cursor, decoded_cursor, filters)
+        # O cursor carrega o campo de ordenação da página em que foi gerado
+        # Sem ordenação explícita, a busca textual é ordenada pela relevância
+        if decoded_cursor:
+            sort_field_key = decoded_cursor.sort_field_key
+        elif not sort_field_key:
+            sort_field_key = 'relevance' if search else 'nome_exibicao'
+
+        paginated_profile_dict = await self.perfil_repo.find_profiles_by_filters_paginated(
+            limit, cursor, decoded_cursor, filters, sort_field_key, search, fields
+        )
 
         paginated_profile_dict = PerfilService.handle_profile_pagination(
-            paginated_profile_dict, previous_encoded_cursor, request
+            paginated_profile_dict, request, fields
         )
 
         return paginated_profile_dict
 
+    async def search_profiles_by_display_name(
+        self, term: str, limit: int, fields: Optional[Set[str]] = None
+    ):
+        term = term.strip()
+        min_length = self.environment.PROFILE_NAME_SEARCH_MIN_LENGTH
+        if len(term) < min_length:
+            raise exceptions.SearchTermTooShortException(
+                detail=f"O termo de busca deve ter pelo menos {min_length} caracteres"
+            )
+
+        limit = min(limit, self.environment.PROFILE_NAME_SEARCH_MAX_RESULTS)
+        perfis = await self.perfil_repo.find_profiles_by_name_similarity(
+            utils.normalize_string(term), limit, fields
+        )
+        return self.select_profile_list_fields(self.handle_profile_body_list(perfis), fields)
+
     async def create_profile_by_guid_usuario(self, current_user: CurrentUserToken, profile_input: PerfilPostInput):
         # Verificando se ja existe um perfil para o usuário
         perfil_db = await self.perfil_repo.find_profile_by_guid_usuario(
@@ -178,7 +363,9 @@ class PerfilService:
             if nome_exibicao
             else None
         )
-        return await self.perfil_repo.insere_perfil(profile_dict)
+        perfil = await self.perfil_repo.insere_perfil(profile_dict)
+        await self.perfil_repo.atualiza_search_vector(perfil.id)
+        return perfil
 
     async def handle_input_imagem_perfil(
         self, current_user: CurrentUserToken, profile_input: PerfilInput
@@ -199,38 +386,75 @@ class PerfilService:
 
         return None
 
-    async def patch_profile_by_guid_usuario(self, current_user: CurrentUserToken, profile_input: PerfilPatchInput):
+    async def build_written_profile(self, perfil: Perfil, fields: Optional[Set[str]] = None):
+        """
+            Monta a resposta de uma escrita a partir da linha retornada pelo banco (RETURNING).
+            Com fields, apenas os relacionamentos solicitados são carregados nessa linha.
+            Sem fields, o perfil completo é relido
+        """
+        if fields is None:
+            perfil = await self.perfil_repo.find_profile_by_guid_usuario(perfil.guid_usuario)
+        elif fields & set(PerfilRepository.get_relationship_loaders()):
+            perfil = await self.perfil_repo.load_profile_relationships(perfil, fields)
+        return self.select_profile_fields(self.handle_profile_body(perfil), fields)
+
+    async def patch_profile_by_guid_usuario(
+        self, current_user: CurrentUserToken, profile_input: PerfilPatchInput,
+        fields: Optional[Set[str]] = None
+    ):
         await self.handle_input_imagem_perfil(current_user, profile_input)
 
         profile_dict = profile_input.convert_to_dict(exclude_unset=True)
 
-        # Preenchendo nome exibição e normalizacao se existir
-        nome_exibicao = profile_dict.get('nome_exibicao')
-        profile_dict['nome_exibicao_normalized'] = (
-            utils.normalize_string(nome_exibicao)
-            if nome_exibicao
-            else None
-        )
+        # Preenchendo a normalizacao apenas se o nome de exibição foi enviado
+        if 'nome_exibicao' in profile_dict:
+            nome_exibicao = profile_dict['nome_exibicao']
+            profile_dict['nome_exibicao_normalized'] = (
+                utils.normalize_string(nome_exibicao)
+                if nome_exibicao
+                else None
+            )
 
-        await self.perfil_repo.atualiza_perfil_by_guid_usuario(current_user.guid, profile_dict)
-        return await self.perfil_repo.find_profile_by_guid_usuario(current_user.guid)
+        perfil = await self.perfil_repo.atualiza_perfil_by_guid_usuario(current_user.guid, profile_dict)
 
-    async def delete_profile_by_guid_usuario(self, guid_usuario: str):
-        # Verificando se existe um usuario no banco
+        # Os campos do documento de busca textual foram alterados
+        if 'nome_exibicao' in profile_dict or 'bio' in profile_dict:
+            await self.perfil_repo.atualiza_search_vector(perfil.id)
+
+        await self.invalidate_profile_cache(perfil.id)
+        return await self.build_written_profile(perfil, fields)
+
+    async def update_profile_image_by_guid_usuario(
+        self, current_user: CurrentUserToken, upload_file: UploadFile,
+        fields: Optional[Set[str]] = None
+    ):
+        # Verificando a existência do perfil antes do upload da imagem
         perfil = await self.perfil_repo.find_profile_by_guid_usuario(
-            guid_usuario, load_all_entities=False
+            current_user.guid, load_all_entities=False
         )
         if not perfil:
+            raise exceptions.ProfileNotFoundException(
+                detail=f"O perfil do usuário de GUID={current_user.guid} não foi encontrado."
+            )
+
+        imagem_perfil = await self.arquivo_service.upload_arquivo_stream(upload_file, current_user)
+        perfil = await self.perfil_repo.atualiza_perfil_by_guid_usuario(
+            current_user.guid, {'id_imagem_perfil': imagem_perfil.id}
+        )
+        await self.invalidate_profile_cache(perfil.id)
+
+        return await self.build_written_profile(perfil, fields)
+
+    async def delete_profile_by_guid_usuario(self, guid_usuario: str):
+        id_perfil = await self.perfil_repo.delete_perfil_by_guid_usuario(guid_usuario)
+        if id_perfil is None:
             raise exceptions.ProfileNotFoundException(
                 detail=f"O perfil do usuário de GUID={guid_usuario} não foi encontrado."
             )
-        # Capturando o ID do perfil
-        return await self.perfil_repo.delete_perfil(perfil.id)
+        await self.invalidate_profile_cache(id_perfil)
 
     async def link_course_to_profile(self, guid_usuario, id_curso: int):
-        cursos = await self.curso_repo.find_all_courses_by_filters(
-            [Curso.id == id_curso]
-        )
+        cursos = await self.find_cursos_by_ids([id_curso])
         if not cursos:
             raise exceptions.CourseNotFoundException(
                 detail=f"Não foi encontrado um curso com ID = {id_curso}"
@@ -246,25 +470,21 @@ class PerfilService:
                 detail=f"Não foi encontrado um perfil para o usuário {guid_usuario}"
             )
 
-        vinculo_db = await self.perfil_repo.find_vinculo_perfil_curso(
+        vinculo_inserido = await self.perfil_repo.insert_vinculo_perfil_curso(
             curso.id,
             perfil.id
         )
-        if vinculo_db:
+        if not vinculo_inserido:
             raise exceptions.CourseLinkConflictException(
                 detail=f"Já existe um vínculo do perfil do usuário {guid_usuario}"
                        f" com o curso de ID = {id_curso}"
             )
 
-        await self.perfil_repo.insert_vinculo_perfil_curso(
-            curso.id,
-            perfil.id
-        )
+        await self.perfil_repo.atualiza_search_vector(perfil.id)
+        await self.invalidate_profile_cache(perfil.id)
 
     async def delete_profile_course_link(self, guid_usuario, id_curso: int):
-        cursos = await self.curso_repo.find_all_courses_by_filters(
-            [Curso.id == id_curso]
-        )
+        cursos = await self.find_cursos_by_ids([id_curso])
         if not cursos:
             raise exceptions.CourseNotFoundException(
                 detail=f"Não foi encontrado um curso com ID = {id_curso}"
@@ -280,25 +500,21 @@ class PerfilService:
                 detail=f"Não foi encontrado um perfil para o usuário {guid_usuario}"
             )
 
-        vinculo_db = await self.perfil_repo.find_vinculo_perfil_curso(
+        vinculo_removido = await self.perfil_repo.delete_vinculo_perfil_curso(
             curso.id,
             perfil.id
         )
-        if not vinculo_db:
+        if not vinculo_removido:
             raise exceptions.CourseLinkNotFoundException(
                 detail=f"Não existe um vínculo do perfil do usuário {guid_usuario}"
                        f" com o curso de ID = {id_curso}"
             )
 
-        await self.perfil_repo.delete_vinculo_perfil_curso(
-            curso.id,
-            perfil.id
-        )
+        await self.perfil_repo.atualiza_search_vector(perfil.id)
+        await self.invalidate_profile_cache(perfil.id)
 
     async def link_interest_to_profile(self, guid_usuario, id_interesse: int):
-        interesses = await self.interesse_repo.find_all_interests_by_filters(
-            [Interesse.id == id_interesse]
-        )
+        interesses = await self.find_interesses_by_ids([id_interesse])
         if not interesses:
             raise exceptions.InterestNotFoundException(
                 detail=f"Não foi encontrado um interesse com ID = {id_interesse}"
@@ -314,25 +530,21 @@ class PerfilService:
                 detail=f"Não foi encontrado um perfil para o usuário {guid_usuario}"
             )
 
-        vinculo_db = await self.perfil_repo.find_vinculo_perfil_interesse(
+        vinculo_inserido = await self.perfil_repo.insert_vinculo_perfil_interesse(
             interesse.id,
             perfil.id
         )
-        if vinculo_db:
+        if not vinculo_inserido:
             raise exceptions.InterestLinkConflictException(
                 detail=f"Já existe um vínculo do perfil do usuário {guid_usuario}"
                        f" com o interesse de ID = {id_interesse}"
             )
 
-        await self.perfil_repo.insert_vinculo_perfil_interesse(
-            interesse.id,
-            perfil.id
-        )
+        await self.perfil_repo.atualiza_search_vector(perfil.id)
+        await self.invalidate_profile_cache(perfil.id)
 
     async def delete_profile_interest_link(self, guid_usuario, id_interesse: int):
-        interesses = await self.interesse_repo.find_all_interests_by_filters(
-            [Interesse.id == id_interesse]
-        )
+        interesses = await self.find_interesses_by_ids([id_interesse])
         if not interesses:
             raise exceptions.InterestNotFoundException(
                 detail=f"Não foi encontrado um interesse com ID = {id_interesse}"
@@ -348,20 +560,107 @@ class PerfilService:
                 detail=f"Não foi encontrado um perfil para o usuário {guid_usuario}"
             )
 
-        vinculo_db = await self.perfil_repo.find_vinculo_perfil_interesse(
+        vinculo_removido = await self.perfil_repo.delete_vinculo_perfil_interesse(
             interesse.id,
             perfil.id
         )
-        if not vinculo_db:
+        if not vinculo_removido:
             raise exceptions.InterestLinkNotFoundException(
                 detail=f"Não existe um vínculo do perfil do usuário {guid_usuario}"
                        f" com o interesse de ID = {id_interesse}"
             )
 
-        await self.perfil_repo.delete_vinculo_perfil_interesse(
-            interesse.id,
-            perfil.id
+        await self.perfil_repo.atualiza_search_vector(perfil.id)
+        await self.invalidate_profile_cache(perfil.id)
+
+    async def find_profile_to_link(self, guid_usuario):
+        perfil = await self.perfil_repo.find_profile_by_guid_usuario(
+            guid_usuario,
+            load_all_entities=False
         )
+        if not perfil:
+            raise exceptions.ProfileNotFoundException(
+                detail=f"Não foi encontrado um perfil para o usuário {guid_usuario}"
+            )
+        return perfil
+
+    async def validate_course_ids(self, ids_curso: List[int]):
+        if not ids_curso:
+            return
+        cursos = await self.find_cursos_by_ids(ids_curso)
+        missing_ids = sorted(set(ids_curso) - {curso.id for curso in cursos})
+        if missing_ids:
+            raise exceptions.CourseNotFoundException(
+                detail=f"Não foram encontrados cursos com os IDs = {missing_ids}"
+            )
+
+    async def validate_interest_ids(self, ids_interesse: List[int]):
+        if not ids_interesse:
+            return
+        interesses = await self.find_interesses_by_ids(ids_interesse)
+        missing_ids = sorted(set(ids_interesse) - {interesse.id for interesse in interesses})
+        if missing_ids:
+            raise exceptions.InterestNotFoundException(
+                detail=f"Não foram encontrados interesses com os IDs = {missing_ids}"
+            )
+
+    async def update_profile_links(
+        self, id_perfil: int, vinculo_model, id_column_name: str,
+        ids_to_link: List[int], ids_to_unlink: Optional[List[int]] = None
+    ):
+        """
+            Atualiza os vínculos do perfil com um INSERT (ON CONFLICT DO NOTHING) e um DELETE.
+            Sem ids_to_unlink, o conjunto de vínculos é substituído por ids_to_link
+        """
+
+        await self.perfil_repo.insert_vinculos_perfil(vinculo_model, id_column_name, id_perfil, ids_to_link)
+        if ids_to_unlink is None:
+            await self.perfil_repo.delete_vinculos_perfil(
+                vinculo_model, id_column_name, id_perfil, ids_to_link, keep_ids=True
+            )
+        elif ids_to_unlink:
+            await self.perfil_repo.delete_vinculos_perfil(
+                vinculo_model, id_column_name, id_perfil, ids_to_unlink
+            )
+
+        await self.perfil_repo.atualiza_search_vector(id_perfil)
+        await self.invalidate_profile_cache(id_perfil)
+
+    async def replace_profile_courses(self, guid_usuario, ids_curso: List[int]):
+        ids_curso = list(dict.fromkeys(ids_curso))
+        await self.validate_course_ids(ids_curso)
+        perfil = await self.find_profile_to_link(guid_usuario)
+
+        await self.update_profile_links(perfil.id, VinculoPerfilCurso, 'id_curso', ids_curso)
+        return await self.perfil_repo.find_cursos_by_id_perfil(perfil.id)
+
+    async def patch_profile_courses(self, guid_usuario, ids_to_link: List[int], ids_to_unlink: List[int]):
+        ids_to_link = list(dict.fromkeys(ids_to_link))
+        await self.validate_course_ids(ids_to_link)
+        perfil = await self.find_profile_to_link(guid_usuario)
+
+        await self.update_profile_links(
+            perfil.id, VinculoPerfilCurso, 'id_curso', ids_to_link, list(dict.fromkeys(ids_to_unlink))
+        )
+        return await self.perfil_repo.find_cursos_by_id_perfil(perfil.id)
+
+    async def replace_profile_interests(self, guid_usuario, ids_interesse: List[int]):
+        ids_interesse = list(dict.fromkeys(ids_interesse))
+        await self.validate_interest_ids(ids_interesse)
+        perfil = await self.find_profile_to_link(guid_usuario)
+
+        await self.update_profile_links(perfil.id, VinculoPerfilInteresse, 'id_interesse', ids_interesse)
+        return await self.perfil_repo.find_interesses_by_id_perfil(perfil.id)
+
+    async def patch_profile_interests(self, guid_usuario, ids_to_link: List[int], ids_to_unlink: List[int]):
+        ids_to_link = list(dict.fromkeys(ids_to_link))
+        await self.validate_interest_ids(ids_to_link)
+        perfil = await self.find_profile_to_link(guid_usuario)
+
+        await self.update_profile_links(
+            perfil.id, VinculoPerfilInteresse, 'id_interesse', ids_to_link, list(dict.fromkeys(ids_to_unlink))
+        )
+        return await self.perfil_repo.find_interesses_by_id_perfil(perfil.id)
 
     async def insert_email_profile_by_guid_usuario(
         self, guid_usuario: str, perfil_email_input: PerfilEmailPostInput
@@ -380,7 +679,9 @@ class PerfilService:
         # Inserindo no banco de dados
         perfil_email_dict = perfil_email_input.convert_to_dict()
         perfil_email_dict['id_perfil'] = perfil.id
-        return await self.perfil_repo.insert_email_profile(perfil_email_dict)
+        perfil_email = await self.perfil_repo.insert_email_profile(perfil_email_dict)
+        await self.invalidate_profile_cache(perfil.id)
+        return perfil_email
 
     async def patch_email_profile_by_guid(
         self, guid_perfil_email: str, perfil_email_patch_input: PerfilEmailPatchInput
@@ -397,10 +698,12 @@ class PerfilService:
 
         # Inserindo no banco de dados
         perfil_email_patch_dict = perfil_email_patch_input.convert_to_dict()
-        return await self.perfil_repo.atualiza_email_profile(
+        perfil_email = await self.perfil_repo.atualiza_email_profile(
             guid_perfil_email,
             perfil_email_patch_dict
         )
+        await self.invalidate_profile_cache(perfil_email.id_perfil)
+        return perfil_email
 
     async def delete_email_profile_by_guid(
         self, guid_perfil_email: str
@@ -416,9 +719,10 @@ class PerfilService:
             )
 
         # Deleta a entidade no banco de dados
-        return await self.perfil_repo.delete_email_profile(
+        await self.perfil_repo.delete_email_profile(
             guid_perfil_email,
         )
+        await self.invalidate_profile_cache(perfil_email.id_perfil)
 
     async def insert_phone_profile_by_guid_usuario(
         self, guid_usuario: str, perfil_phone_input: PerfilPhonePostInput
@@ -439,9 +743,7 @@ class PerfilService:
         tipo_contato = None
 
         if id_tipo_contato is not None:
-            tipos_contato = await self.tipo_contato_repo.find_all_tipos_contato_by_filters(
-                [TipoContato.id == id_tipo_contato]
-            )
+            tipos_contato = await self.find_tipos_contato_by_ids([id_tipo_contato])
             if len(tipos_contato) == 0:
                 raise exceptions.TipoContatoNotFoundException(
                     detail=f"Não foi encontrado um tipo de contato com o ID = {id_tipo_contato}"
@@ -452,8 +754,9 @@ class PerfilService:
         # Inserindo no banco de dados
         perfil_phone_dict = perfil_phone_input.convert_to_dict()
         perfil_phone_dict['id_perfil'] = perfil.id
-        perfil = await self.perfil_repo.insert_phone_profile(perfil_phone_dict)
-        return perfil
+        perfil_phone = await self.perfil_repo.insert_phone_profile(perfil_phone_dict)
+        await self.invalidate_profile_cache(perfil.id)
+        return perfil_phone
 
     async def patch_phone_profile_by_guid(
         self, guid_perfil_phone: str, perfil_phone_patch_input: PerfilPhonePatchInput
@@ -471,9 +774,7 @@ class PerfilService:
         # Verificando se o novo tipo_contato é válido
         id_tipo_contato = perfil_phone_patch_input.id_tipo_contato
         if id_tipo_contato is not None:
-            tipos_contato = await self.tipo_contato_repo.find_all_tipos_contato_by_filters(
-                [TipoContato.id == id_tipo_contato]
-            )
+            tipos_contato = await self.find_tipos_contato_by_ids([id_tipo_contato])
             if len(tipos_contato) == 0:
                 raise exceptions.TipoContatoNotFoundException(
                     detail=f"Não foi encontrado um tipo de contato com o ID = {id_tipo_contato}"
@@ -481,10 +782,12 @@ class PerfilService:
 
         # Inserindo no banco de dados
         perfil_phone_patch_dict = perfil_phone_patch_input.convert_to_dict()
-        return await self.perfil_repo.atualiza_phone_profile(
+        perfil_phone = await self.perfil_repo.atualiza_phone_profile(
             guid_perfil_phone,
             perfil_phone_patch_dict
         )
+        await self.invalidate_profile_cache(perfil_phone.id_perfil)
+        return perfil_phone
 
     async def delete_phone_profile_by_guid(
         self, guid_perfil_phone: str
@@ -500,9 +803,10 @@ class PerfilService:
             )
 
         # Deleta a entidade no banco de dados
-        return await self.perfil_repo.delete_phone_profile(
+        await self.perfil_repo.delete_phone_profile(
             guid_perfil_phone,
         )
+        await self.invalidate_profile_cache(perfil_phone.id_perfil)
 
     async def insert_profile(
         self, perfil_input: NotOwnerPerfilPostInput,
@@ -521,6 +825,67 @@ class PerfilService:
         await self.usuario_repo.insere_usuario(usuario_input.dict())
 
         perfil = await self.perfil_repo.insere_perfil(profile_dict)
+        await self.perfil_repo.atualiza_search_vector(perfil.id)
+
+        # Um perfil recém-criado não possui vínculos, e-mails ou telefones. Apenas a
+        # imagem de perfil, se informada, precisa ser carregada
+        if perfil.id_imagem_perfil:
+            return await self.build_written_profile(
+                perfil, set(PerfilOutput.__fields__) - {'interesses', 'cursos', 'phones', 'emails'}
+            )
+        return self.handle_profile_body(perfil)
 
-        return await self.perfil_repo.find_profile_by_guid(perfil.guid)
+    async def import_profiles(self, perfil_usuario_inputs: List[PerfilUsuarioImportItemInput]) -> dict:
+        """
+            Importa usuários e perfis em lote, com um INSERT de várias linhas para cada tabela.
+            Perfis já existentes são ignorados ('already_exists') e perfis cujo usuário conflita
+            com outro usuário (username ou e-mail) não são criados ('user_conflict')
+        """
 
+        max_size = self.environment.PROFILE_IMPORT_MAX_SIZE
+        if len(perfil_usuario_inputs) > max_size:
+            raise exceptions.ProfileImportTooLargeException(
+                detail=f"Podem ser importados no máximo {max_size} perfis por requisição"
+            )
+
+        # O schema garante que profile.guid_usuario == user.guid em cada item
+        guids_usuario = [str(item.user.guid) for item in perfil_usuario_inputs]
+
+        guids_usuario_inseridos = set(await self.usuario_repo.insere_usuarios_if_not_exist(
+            [item.user.dict() for item in perfil_usuario_inputs]
+        ))
+        guids_usuario_existentes = guids_usuario_inseridos | await self.usuario_repo.find_existing_guids([
+            guid_usuario for guid_usuario in guids_usuario if guid_usuario not in guids_usuario_inseridos
+        ])
+
+        profile_dicts = []
+        for item, guid_usuario in zip(perfil_usuario_inputs, guids_usuario):
+            if guid_usuario not in guids_usuario_existentes:
+                continue
+            profile_dict = item.profile.convert_to_dict()
+            nome_exibicao = profile_dict.get('nome_exibicao')
+            profile_dict['nome_exibicao_normalized'] = (
+                utils.normalize_string(nome_exibicao)
+                if nome_exibicao
+                else None
+            )
+            profile_dicts.append(profile_dict)
+
+        perfis_inseridos = await self.perfil_repo.insere_perfis_if_not_exist(profile_dicts)
+        await self.perfil_repo.atualiza_search_vector_by_ids([perfil.id for perfil in perfis_inseridos])
+        perfis_by_guid_usuario = {str(perfil.guid_usuario): perfil for perfil in perfis_inseridos}
+
+        items = []
+        for item, guid_usuario in zip(perfil_usuario_inputs, guids_usuario):
+            perfil = perfis_by_guid_usuario.get(guid_usuario)
+            if perfil:
+                items.append({'guid_usuario': item.user.guid, 'status': 'created', 'guid': perfil.guid})
+            elif guid_usuario not in guids_usuario_existentes:
+                items.append({'guid_usuario': item.user.guid, 'status': 'user_conflict'})
+            else:
+                items.append({'guid_usuario': item.user.guid, 'status': 'already_exists'})
+
+        return {
+            'items': items,
+            'created': len(perfis_inseridos)
+        }
@@ -0,0 +1,118 @@
+import asyncio
+import time
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+from server.repository.permissao_repository import PermissaoRepository
+from server.configuration.custom_logging import get_main_logger
+
+
+MAIN_LOGGER = get_main_logger()
+
+
+class PermissaoCacheService:
+
+    """
+        Cache em memória (por processo) das permissões vinculadas a um conjunto de funções
+
+        As entradas são indexadas pelo conjunto de funções do usuário e expiram após
+        ttl_in_seconds. O mapeamento completo de funções e permissões é carregado na
+        inicialização da aplicação e recarregado periodicamente em segundo plano, de forma
+        que a autorização de um endpoint seja apenas uma verificação em memória
+    """
+
+    def __init__(self, ttl_in_seconds: int, clock: Callable[[], float] = time.monotonic):
+        self.ttl_in_seconds = ttl_in_seconds
+        self.clock = clock
+        self.entries: Dict[FrozenSet[int], Tuple[FrozenSet[str], float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_roles_key(roles: Iterable[int]) -> FrozenSet[int]:
+        return frozenset(int(role) for role in roles)
+
+    def get_cached_permissions(self, roles: Iterable[int]) -> Optional[FrozenSet[str]]:
+        entry = self.entries.get(self.get_roles_key(roles))
+        if entry is None or entry[1] <= self.clock():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def set_cached_permissions(self, roles: Iterable[int], permissions: Iterable[str]):
+        self.entries[self.get_roles_key(roles)] = (
+            frozenset(permissions), self.clock() + self.ttl_in_seconds
+        )
+
+    def invalidate(self, roles: Optional[Iterable[int]] = None):
+
+        """
+            Remove a entrada do conjunto de funções informado ou, se nenhum
+            conjunto for informado, todas as entradas do cache
+        """
+
+        if roles is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(self.get_roles_key(roles), None)
+
+    def get_stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self.entries),
+            'ttl_in_seconds': self.ttl_in_seconds
+        }
+
+    async def get_permissions_by_roles(self, roles: Iterable[int], session_maker) -> FrozenSet[str]:
+
+        """
+            Retorna as permissões do conjunto de funções. A sessão do banco de dados
+            só é aberta, a partir de session_maker, quando as permissões não estão no cache
+        """
+
+        permissions = self.get_cached_permissions(roles)
+        if permissions is None:
+            async with session_maker() as session:
+                permission_repo = PermissaoRepository(session)
+                user_permissions = await permission_repo.find_permissions_by_roles_list(list(roles))
+            permissions = frozenset(permission.nome for permission in user_permissions)
+            self.set_cached_permissions(roles, permissions)
+        return permissions
+
+    async def load_all(self, permission_repo: PermissaoRepository):
+
+        """
+            Recarrega o cache a partir do mapeamento completo de funções e permissões
+
+            São recalculadas as entradas de cada função isolada e de todos os
+            conjuntos de funções já presentes no cache
+        """
+
+        permissions_by_role: Dict[int, set] = {}
+        for id_funcao, nome_permissao in await permission_repo.find_all_role_permission_names():
+            permissions_by_role.setdefault(id_funcao, set()).add(nome_permissao)
+
+        roles_keys = set(self.entries.keys())
+        roles_keys.update(frozenset([role]) for role in permissions_by_role)
+
+        for roles_key in roles_keys:
+            permissions = set()
+            for role in roles_key:
+                permissions.update(permissions_by_role.get(role, set()))
+            self.set_cached_permissions(roles_key, permissions)
+
+    async def refresh_periodically(self, session_maker, interval_in_seconds: int):
+
+        """
+            Recarrega o cache a cada interval_in_seconds até que a tarefa seja cancelada.
+            Falhas na recarga são registradas e a tentativa é repetida no próximo intervalo
+        """
+
+        while True:
+            await asyncio.sleep(interval_in_seconds)
+            try:
+                async with session_maker() as session:
+                    await self.load_all(PermissaoRepository(session))
+                MAIN_LOGGER.info(f"Cache de permissões recarregado: {self.get_stats()}")
+            except Exception:
+                MAIN_LOGGER.warning("Falha ao recarregar o cache de permissões", exc_info=True)
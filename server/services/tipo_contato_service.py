@@ -1,15 +1,22 @@
 from typing import List, Optional
 from server.configuration.environment import Environment
+from server.services.catalogo_cache_service import CatalogoCacheService, CatalogoSnapshot
+from server.schemas.tipo_contato_schema import TipoContatoOutput
 from server.repository.tipo_contato_repository import TipoContatoRepository
 
 
 class TipoContatoService:
 
     def __init__(self, tipo_contato_repo: Optional[TipoContatoRepository] = None,
-                 environment: Optional[Environment] = None):
+                 environment: Optional[Environment] = None,
+                 catalogo_cache: Optional[CatalogoCacheService] = None):
         self.tipo_contato_repo = tipo_contato_repo
         self.environment = environment
+        self.catalogo_cache = catalogo_cache
 
-    async def get_all_tipos_contato(self):
-        return await self.tipo_contato_repo.find_all_tipos_contato_by_filters([])
-
+    async def get_all_tipos_contato_snapshot(self) -> CatalogoSnapshot:
+        if self.catalogo_cache:
+            return await self.catalogo_cache.get_tipos_contato_snapshot(self.tipo_contato_repo)
+        return CatalogoSnapshot.from_entities(
+            await self.tipo_contato_repo.find_all_tipos_contato_by_filters([]), TipoContatoOutput
+        )
@@ -0,0 +1,74 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from server.schemas.usuario_schema import CurrentUserToken
+
+
+class TokenCacheService:
+
+    """
+        Cache LRU (por processo) dos tokens de acesso já verificados
+
+        As entradas são indexadas pelo hash SHA-256 do token e armazenam o
+        CurrentUserToken validado até a expiração do token (claim 'exp'), limitada
+        a max_ttl_in_seconds. Quando max_size é atingido, a entrada usada há mais
+        tempo é descartada
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        max_ttl_in_seconds: int,
+        clock: Callable[[], float] = time.time
+    ):
+        self.max_size = max_size
+        self.max_ttl_in_seconds = max_ttl_in_seconds
+        self.clock = clock
+        self.entries: 'OrderedDict[str, Tuple[CurrentUserToken, float]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def get_token_key(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get_cached_user(self, token: str) -> Optional[CurrentUserToken]:
+        token_key = self.get_token_key(token)
+        entry = self.entries.get(token_key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[1] <= self.clock():
+            del self.entries[token_key]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(token_key)
+        self.hits += 1
+        return entry[0]
+
+    def set_cached_user(self, token: str, current_user: CurrentUserToken, exp: Optional[float] = None):
+        if self.max_size <= 0:
+            return
+        expires_at = self.clock() + self.max_ttl_in_seconds
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        token_key = self.get_token_key(token)
+        self.entries[token_key] = (current_user, expires_at)
+        self.entries.move_to_end(token_key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self):
+        self.entries.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'max_size': self.max_size
+        }
@@ -6,7 +6,7 @@ import time
 import asyncio
 from server.configuration.environment import IntegrationTestEnvironment
 from server.dependencies.get_environment_cached import get_environment_cached
-from server.dependencies.session import get_session
+from server.dependencies.session import get_session, get_session_maker
 from alembic.command import upgrade as alembic_upgrade
 from alembic.config import Config as AlembicConfig
 from server import _init_app
@@ -17,6 +17,12 @@ from fastapi.testclient import TestClient
 from mock import Mock
 from fastapi import FastAPI
 from sqlalchemy.pool import NullPool
+from server.dependencies.get_permission_cache import get_permission_cache
+from server.services.permissao_cache_service import PermissaoCacheService
+from server.dependencies.get_catalog_cache import get_catalog_cache
+from server.services.catalogo_cache_service import CatalogoCacheService
+from server.dependencies.get_token_cache import get_token_cache
+from server.services.token_cache_service import TokenCacheService
 
 
 @lru_cache
@@ -113,6 +119,13 @@ async def db_docker_container():
 def _test_app(create_db_upgrade):
     app = _init_app()
     app.dependency_overrides[get_session] = get_test_async_session
+    app.dependency_overrides[get_session_maker] = build_test_async_session_maker
+    permission_cache = PermissaoCacheService(ttl_in_seconds=60)
+    app.dependency_overrides[get_permission_cache] = lambda: permission_cache
+    token_cache = TokenCacheService(max_size=100, max_ttl_in_seconds=60)
+    app.dependency_overrides[get_token_cache] = lambda: token_cache
+    catalog_cache = CatalogoCacheService()
+    app.dependency_overrides[get_catalog_cache] = lambda: catalog_cache
     return app
 
 
@@ -0,0 +1,110 @@
+import uuid
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.compiler import compiles
+from datetime import datetime, timedelta
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from server.models.arquivo_model import Arquivo
+from server.models.perfil_model import Perfil
+from server.models.arquivo_variante_model import ArquivoVariante
+from server.repository.arquivo_repository import ArquivoRepository
+from server.schemas.arquivo_schema import ArquivoOutput
+
+
+"""
+    Fixtures
+"""
+
+
+@compiles(UUID, 'sqlite')
+def compile_uuid_sqlite(type_, compiler, **kw):
+    return 'CHAR(36)'
+
+
+@compiles(TSVECTOR, 'sqlite')
+def compile_tsvector_sqlite(type_, compiler, **kw):
+    return 'TEXT'
+
+
+class SyncSessionAdapter:
+
+    """
+        Executa as consultas do repositório em uma sessão síncrona (SQLite em memória)
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, stmt):
+        return self.session.execute(stmt)
+
+
+@pytest.fixture
+def sqlite_session():
+    engine = create_engine('sqlite://')
+    tables = [Arquivo.__table__, ArquivoVariante.__table__, Perfil.__table__]
+    Arquivo.metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        yield session
+    Arquivo.metadata.drop_all(engine, tables=tables)
+
+
+class TestArquivoRepository:
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_find_arquivo_by_content_hash_serializes_variantes(sqlite_session):
+        arquivo = Arquivo(
+            id=1, url='https://bucket/u/guid/foto.png', file_type='image/png',
+            content_hash='hash', created_by='guid'
+        )
+        arquivo.variantes = [ArquivoVariante(id=1, nome_variante='thumb_64', url='https://bucket/thumb_64.webp')]
+        sqlite_session.add(arquivo)
+        sqlite_session.commit()
+        sqlite_session.expunge_all()
+
+        arquivo_repo = ArquivoRepository(SyncSessionAdapter(sqlite_session))
+        found_arquivo = await arquivo_repo.find_arquivo_by_content_hash('guid', 'hash')
+        # Sem sessão, um relacionamento não carregado na consulta falharia na serialização
+        sqlite_session.expunge_all()
+
+        arquivo_output = ArquivoOutput.from_orm(found_arquivo)
+        assert [variante.nome_variante for variante in arquivo_output.variantes] == ['thumb_64']
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_find_arquivo_by_content_hash_of_other_user(sqlite_session):
+        sqlite_session.add(Arquivo(
+            id=1, url='https://bucket/u/guid/foto.png', file_type='image/png',
+            content_hash='hash', created_by='guid'
+        ))
+        sqlite_session.commit()
+
+        arquivo_repo = ArquivoRepository(SyncSessionAdapter(sqlite_session))
+
+        assert await arquivo_repo.find_arquivo_by_content_hash('other', 'hash') is None
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_find_unreferenced_arquivos(sqlite_session):
+        updated_at = datetime(2022, 5, 1)
+        sqlite_session.add_all([
+            Arquivo(id=1, url='https://bucket/1.png', updated_at=updated_at),
+            Arquivo(id=2, url='https://bucket/2.png', updated_at=updated_at),
+            Arquivo(id=3, url='https://bucket/3.png', updated_at=updated_at),
+            # Arquivo antigo, reutilizado recentemente por um upload deduplicado
+            Arquivo(id=4, url='https://bucket/4.png', created_at=updated_at, updated_at=datetime(2022, 5, 3)),
+        ])
+        sqlite_session.flush()
+        sqlite_session.add_all([
+            Perfil(id=1, guid_usuario=uuid.uuid4(), id_imagem_perfil=1),
+            Perfil(id=2, guid_usuario=uuid.uuid4(), url_imagem='https://bucket/2.png'),
+        ])
+        sqlite_session.commit()
+
+        arquivo_repo = ArquivoRepository(SyncSessionAdapter(sqlite_session))
+        arquivos = await arquivo_repo.find_unreferenced_arquivos(updated_at + timedelta(days=1), 0, 10)
+
+        assert [arquivo.id for arquivo in arquivos] == [3]
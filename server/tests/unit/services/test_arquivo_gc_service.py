@@ -0,0 +1,149 @@
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from mock import Mock, AsyncMock, MagicMock
+from server.services import arquivo_gc_service
+from server.services.arquivo_gc_service import ArquivoGarbageCollectorService
+
+
+"""
+    Fixtures
+"""
+
+
+NOW = datetime(2022, 5, 12, 12, 0, tzinfo=timezone.utc)
+OLD = NOW - timedelta(days=2)
+
+
+@pytest.fixture
+def gc_environment():
+    return Mock(
+        AWS_S3_BUCKET='bucket',
+        AWS_REGION_NAME='us-east-1',
+        ARQUIVO_GC_MIN_AGE_IN_SECONDS=24 * 60 * 60,
+        ARQUIVO_GC_BATCH_SIZE=2,
+        ARQUIVO_GC_BATCH_INTERVAL_IN_SECONDS=0.5
+    )
+
+
+@pytest.fixture
+def session_maker():
+    session = MagicMock(commit=AsyncMock())
+    session.__aenter__.return_value = session
+    return Mock(return_value=session)
+
+
+def build_s3_object(key: str, last_modified: datetime = OLD, size: int = 10):
+    return {'key': key, 'url': f'https://{key}', 'size': size, 'last_modified': last_modified}
+
+
+def build_file_uploader_service(pages):
+    async def list_files(target, region, prefix):
+        for page in pages:
+            yield page
+
+    async def delete_files(target, keys):
+        return keys
+
+    return Mock(list_files=list_files, delete_files=AsyncMock(side_effect=delete_files))
+
+
+class TestArquivoGarbageCollectorService:
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('dry_run', [False, True])
+    async def test_collect(monkeypatch, gc_environment, session_maker, dry_run):
+        arquivo_repo = Mock(
+            find_unreferenced_arquivos=AsyncMock(side_effect=[
+                [Mock(id=1, url='https://u/1/foto.png'), Mock(id=2, url='https://u/2/foto.png')],
+                []
+            ]),
+            find_variantes_by_ids_arquivo=AsyncMock(return_value=[
+                Mock(id_arquivo=1, url='https://u/1/thumb_64.webp')
+            ]),
+            # O arquivo 2 foi referenciado por um perfil entre a busca e a remoção
+            delete_unreferenced_arquivos_by_ids=AsyncMock(return_value=[1]),
+            find_known_urls=AsyncMock(side_effect=lambda urls: set(urls) - unknown_urls)
+        )
+        unknown_urls = {'https://u/3/foto.png'}
+        if not dry_run:
+            # Linhas removidas na primeira etapa deixam de ser conhecidas
+            unknown_urls.update({'https://u/1/foto.png', 'https://u/1/thumb_64.webp'})
+        monkeypatch.setattr(arquivo_gc_service, 'ArquivoRepository', Mock(return_value=arquivo_repo))
+        file_uploader_service = build_file_uploader_service([
+            [
+                build_s3_object('u/1/foto.png'),
+                build_s3_object('u/1/thumb_64.webp'),
+                build_s3_object('u/2/foto.png'),
+            ],
+            [
+                build_s3_object('u/3/foto.png'),
+                build_s3_object('u/4/foto.png', last_modified=NOW),
+            ]
+        ])
+        sleep = AsyncMock()
+        gc_service = ArquivoGarbageCollectorService(
+            file_uploader_service, session_maker, gc_environment, clock=lambda: NOW, sleep=sleep
+        )
+
+        report = await gc_service.collect(dry_run=dry_run)
+
+        expected_keys = ['u/1/foto.png', 'u/1/thumb_64.webp', 'u/3/foto.png']
+        if dry_run:
+            expected_keys.insert(2, 'u/2/foto.png')
+            arquivo_repo.delete_unreferenced_arquivos_by_ids.assert_not_called()
+            file_uploader_service.delete_files.assert_not_called()
+        else:
+            deleted_keys = [
+                key for call in file_uploader_service.delete_files.call_args_list for key in call.args[1]
+            ]
+            assert deleted_keys == expected_keys
+        assert report.removed_files == (2 if dry_run else 1)
+        assert report.removed_variants == 1
+        assert report.removed_objects == len(expected_keys)
+        assert report.reclaimed_bytes == 10 * len(expected_keys)
+        sleep.assert_awaited_with(0.5)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_collect_keeps_objects_shared_with_referenced_arquivo(monkeypatch, gc_environment, session_maker):
+        arquivo_repo = Mock(
+            # Registro duplicado da mesma URL, sem referências, enquanto outro registro continua em uso
+            find_unreferenced_arquivos=AsyncMock(side_effect=[[Mock(id=1, url='https://u/1/foto.png')], []]),
+            find_variantes_by_ids_arquivo=AsyncMock(return_value=[]),
+            delete_unreferenced_arquivos_by_ids=AsyncMock(return_value=[1]),
+            find_known_urls=AsyncMock(side_effect=lambda urls: set(urls))
+        )
+        monkeypatch.setattr(arquivo_gc_service, 'ArquivoRepository', Mock(return_value=arquivo_repo))
+        file_uploader_service = build_file_uploader_service([[build_s3_object('u/1/foto.png')]])
+        gc_service = ArquivoGarbageCollectorService(
+            file_uploader_service, session_maker, gc_environment, clock=lambda: NOW, sleep=AsyncMock()
+        )
+
+        report = await gc_service.collect()
+
+        assert report.removed_files == 1
+        assert report.removed_objects == 0
+        file_uploader_service.delete_files.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_collect_counts_failed_objects(monkeypatch, gc_environment, session_maker):
+        arquivo_repo = Mock(
+            find_unreferenced_arquivos=AsyncMock(return_value=[]),
+            find_known_urls=AsyncMock(return_value=set())
+        )
+        monkeypatch.setattr(arquivo_gc_service, 'ArquivoRepository', Mock(return_value=arquivo_repo))
+        file_uploader_service = build_file_uploader_service([
+            [build_s3_object('u/1/foto.png'), build_s3_object('u/2/foto.png')]
+        ])
+        file_uploader_service.delete_files = AsyncMock(return_value=['u/2/foto.png'])
+        gc_service = ArquivoGarbageCollectorService(
+            file_uploader_service, session_maker, gc_environment, clock=lambda: NOW, sleep=AsyncMock()
+        )
+
+        report = await gc_service.collect()
+
+        assert report.removed_objects == 1
+        assert report.failed_objects == 1
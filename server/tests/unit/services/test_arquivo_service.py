@@ -0,0 +1,285 @@
+import io
+import base64
+import hashlib
+import pytest
+
+from fastapi import UploadFile
+from mock import Mock, AsyncMock
+from server.schemas.arquivo_schema import ArquivoInput, FileUploaderOutput, PresignedUploadCompleteInput
+from server.configuration import exceptions
+from server.services.arquivo_service import ArquivoService
+
+
+"""
+    Fixtures
+"""
+
+
+@pytest.fixture
+def current_user():
+    return Mock(guid='guid', username='user')
+
+
+@pytest.fixture
+def arquivo_environment():
+    return Mock(AWS_S3_BUCKET='bucket', AWS_REGION_NAME='us-east-1')
+
+
+def build_upload_file(content: bytes):
+    return UploadFile(filename='foto.png', file=io.BytesIO(content), content_type='image/png')
+
+
+async def read_all_chunks(upload_file: UploadFile, chunk_size: int, max_file_size: int):
+    return [
+        chunk async for chunk in ArquivoService.iter_file_chunks(upload_file, chunk_size, max_file_size)
+    ]
+
+
+class TestArquivoService:
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('content, expected_chunks', [
+        (b'', [b'']),
+        (b'abc', [b'abc']),
+        (b'abcdefg', [b'abc', b'def', b'g']),
+        (b'abcdef', [b'abc', b'def']),
+    ])
+    async def test_iter_file_chunks(content, expected_chunks):
+        chunks = await read_all_chunks(build_upload_file(content), 3, 10)
+
+        assert chunks == expected_chunks
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_iter_file_chunks_file_too_large():
+        with pytest.raises(exceptions.FileTooLargeException):
+            await read_all_chunks(build_upload_file(b'a' * 11), 3, 10)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_complete_presigned_upload_key_of_other_user(current_user, arquivo_environment):
+        file_uploader_service = Mock(find_uploaded_file=AsyncMock())
+        arquivo_service = ArquivoService(
+            file_uploader_service=file_uploader_service, environment=arquivo_environment
+        )
+
+        with pytest.raises(exceptions.FileKeyNotAllowedException):
+            await arquivo_service.complete_presigned_upload(
+                PresignedUploadCompleteInput(key='u/other/profile/uuid/foto.png'), current_user
+            )
+
+        file_uploader_service.find_uploaded_file.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_complete_presigned_upload_file_not_uploaded(current_user, arquivo_environment):
+        arquivo_repo = Mock(insere_arquivo=AsyncMock())
+        arquivo_service = ArquivoService(
+            file_uploader_service=Mock(find_uploaded_file=AsyncMock(return_value=None)),
+            arquivo_repo=arquivo_repo,
+            environment=arquivo_environment
+        )
+
+        with pytest.raises(exceptions.UploadedFileNotFoundException):
+            await arquivo_service.complete_presigned_upload(
+                PresignedUploadCompleteInput(key='u/guid/profile/uuid/foto.png'), current_user
+            )
+
+        arquivo_repo.insere_arquivo.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_complete_presigned_upload(current_user, arquivo_environment):
+        arquivo_repo = Mock(find_arquivo_by_url=AsyncMock(return_value=None), insere_arquivo=AsyncMock())
+        arquivo_service = ArquivoService(
+            file_uploader_service=Mock(find_uploaded_file=AsyncMock(return_value=FileUploaderOutput(
+                url='https://bucket.s3.us-east-1.amazonaws.com/u/guid/profile/uuid/foto.png',
+                additional_data={'ContentType': 'image/png'}
+            ))),
+            arquivo_repo=arquivo_repo,
+            environment=arquivo_environment
+        )
+
+        await arquivo_service.complete_presigned_upload(
+            PresignedUploadCompleteInput(key='u/guid/profile/uuid/foto.png'), current_user
+        )
+
+        arquivo_repo.insere_arquivo.assert_awaited_once_with({
+            'url': 'https://bucket.s3.us-east-1.amazonaws.com/u/guid/profile/uuid/foto.png',
+            'file_type': 'image/png',
+            'file_name': 'foto.png',
+            'created_by': 'guid'
+        })
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_complete_presigned_upload_retry(current_user, arquivo_environment):
+        existing_arquivo = Mock(id=1)
+        arquivo_repo = Mock(
+            find_arquivo_by_url=AsyncMock(return_value=existing_arquivo), insere_arquivo=AsyncMock()
+        )
+        background_tasks = Mock()
+        arquivo_service = ArquivoService(
+            file_uploader_service=Mock(find_uploaded_file=AsyncMock(return_value=FileUploaderOutput(
+                url='https://bucket/u/guid/profile/uuid/foto.png', additional_data={'ContentType': 'image/png'}
+            ))),
+            arquivo_repo=arquivo_repo,
+            background_tasks=background_tasks,
+            environment=arquivo_environment
+        )
+
+        arquivo = await arquivo_service.complete_presigned_upload(
+            PresignedUploadCompleteInput(key='u/guid/profile/uuid/foto.png'), current_user
+        )
+
+        assert arquivo is existing_arquivo
+        arquivo_repo.find_arquivo_by_url.assert_awaited_once_with(
+            'guid', 'https://bucket/u/guid/profile/uuid/foto.png'
+        )
+        arquivo_repo.insere_arquivo.assert_not_called()
+        background_tasks.add_task.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_complete_presigned_upload_variant_key(current_user, arquivo_environment):
+        file_uploader_service = Mock(find_uploaded_file=AsyncMock())
+        arquivo_service = ArquivoService(
+            file_uploader_service=file_uploader_service, environment=arquivo_environment
+        )
+
+        with pytest.raises(exceptions.FileKeyNotAllowedException):
+            await arquivo_service.complete_presigned_upload(
+                PresignedUploadCompleteInput(key='u/guid/profile/uuid/variants/thumb_64.webp'), current_user
+            )
+
+        file_uploader_service.find_uploaded_file.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.parametrize('file_type, should_schedule', [
+        ('image/png', True),
+        ('application/pdf', False),
+        (None, False),
+    ])
+    def test_schedule_image_variants(file_type, should_schedule):
+        background_tasks = Mock()
+        image_variant_service = Mock()
+        arquivo_service = ArquivoService(
+            image_variant_service=image_variant_service, background_tasks=background_tasks
+        )
+
+        arquivo_service.schedule_image_variants(Mock(id=1, file_type=file_type), 'u/guid/profile/uuid/foto')
+
+        assert background_tasks.add_task.called == should_schedule
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upload_arquivo_existing_content_hash(current_user, arquivo_environment):
+        existing_arquivo = Mock(id=1)
+        arquivo_repo = Mock(
+            find_arquivo_by_content_hash=AsyncMock(return_value=existing_arquivo),
+            atualiza_updated_at_arquivo=AsyncMock(return_value=True),
+            insere_arquivo_if_hash_not_exists=AsyncMock()
+        )
+        file_uploader_service = Mock(upload=AsyncMock())
+        arquivo_service = ArquivoService(
+            file_uploader_service=file_uploader_service,
+            arquivo_repo=arquivo_repo,
+            environment=arquivo_environment
+        )
+
+        arquivo = await arquivo_service.upload_arquivo(
+            ArquivoInput(
+                file_name='foto.png', file_type='image/png',
+                b64_content=base64.b64encode(b'conteudo').decode()
+            ),
+            current_user
+        )
+
+        assert arquivo is existing_arquivo
+        arquivo_repo.find_arquivo_by_content_hash.assert_awaited_once_with(
+            'guid', hashlib.sha256(b'conteudo').hexdigest()
+        )
+        arquivo_repo.atualiza_updated_at_arquivo.assert_awaited_once_with(1)
+        file_uploader_service.upload.assert_not_called()
+        arquivo_repo.insere_arquivo_if_hash_not_exists.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upload_arquivo_existing_content_hash_removed_by_gc(current_user, arquivo_environment):
+        arquivo_repo = Mock(
+            find_arquivo_by_content_hash=AsyncMock(return_value=Mock(id=1)),
+            # A coleta removeu o arquivo entre a busca e a atualização
+            atualiza_updated_at_arquivo=AsyncMock(return_value=False),
+            insere_arquivo_if_hash_not_exists=AsyncMock(return_value=Mock(id=2, file_type='application/pdf'))
+        )
+        file_uploader_service = Mock(upload=AsyncMock(return_value=FileUploaderOutput(
+            url='https://bucket/key', additional_data={}
+        )))
+        arquivo_service = ArquivoService(
+            file_uploader_service=file_uploader_service,
+            arquivo_repo=arquivo_repo,
+            environment=arquivo_environment
+        )
+
+        arquivo = await arquivo_service.upload_arquivo(
+            ArquivoInput(
+                file_name='foto.pdf', file_type='application/pdf',
+                b64_content=base64.b64encode(b'conteudo').decode()
+            ),
+            current_user
+        )
+
+        assert arquivo.id == 2
+        file_uploader_service.upload.assert_awaited_once()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upload_arquivo_stream_new_content_hash(current_user, arquivo_environment):
+        content_hash = hashlib.sha256(b'abcdefg').hexdigest()
+        arquivo_environment.S3_MULTIPART_PART_SIZE_IN_BYTES = 3
+        arquivo_environment.MAX_UPLOAD_FILE_SIZE_IN_BYTES = 10
+        arquivo_repo = Mock(
+            find_arquivo_by_content_hash=AsyncMock(return_value=None),
+            insere_arquivo_if_hash_not_exists=AsyncMock(return_value=Mock(id=1, file_type='application/pdf'))
+        )
+        uploaded_chunks = []
+
+        async def upload_stream(file_input, chunks):
+            async for chunk in chunks:
+                uploaded_chunks.append(chunk)
+            return FileUploaderOutput(url='https://bucket/key', additional_data={})
+
+        arquivo_service = ArquivoService(
+            file_uploader_service=Mock(upload_stream=upload_stream),
+            arquivo_repo=arquivo_repo,
+            environment=arquivo_environment
+        )
+
+        await arquivo_service.upload_arquivo_stream(build_upload_file(b'abcdefg'), current_user)
+
+        assert b''.join(uploaded_chunks) == b'abcdefg'
+        arquivo_input_dict = arquivo_repo.insere_arquivo_if_hash_not_exists.call_args.args[0]
+        assert arquivo_input_dict['content_hash'] == content_hash
+        assert arquivo_input_dict['created_by'] == 'guid'
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_insere_arquivo_deduplicado_concurrent_upload():
+        existing_arquivo = Mock(id=1)
+        arquivo_repo = Mock(
+            insere_arquivo_if_hash_not_exists=AsyncMock(return_value=None),
+            find_arquivo_by_content_hash=AsyncMock(return_value=existing_arquivo),
+            atualiza_updated_at_arquivo=AsyncMock(return_value=True)
+        )
+        background_tasks = Mock()
+        arquivo_service = ArquivoService(arquivo_repo=arquivo_repo, background_tasks=background_tasks)
+
+        arquivo = await arquivo_service.insere_arquivo_deduplicado(
+            {'url': 'https://bucket/key', 'file_type': 'image/png', 'content_hash': 'hash', 'created_by': 'guid'},
+            'key'
+        )
+
+        assert arquivo is existing_arquivo
+        arquivo_repo.find_arquivo_by_content_hash.assert_awaited_once_with('guid', 'hash')
+        background_tasks.add_task.assert_not_called()
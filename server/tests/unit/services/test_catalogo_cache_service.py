@@ -0,0 +1,136 @@
+import pytest
+
+from datetime import datetime
+from mock import Mock, AsyncMock, MagicMock, patch
+from starlette.requests import Request
+from server.controllers import get_conditional_response
+from server.services.catalogo_cache_service import CatalogoCacheService
+from server.services.perfil_service import PerfilService
+from server.configuration import exceptions
+
+
+"""
+    Fixtures
+"""
+
+
+def build_catalog_entity(id_entidade: int, nome: str, updated_at: datetime = datetime(2022, 5, 1, 10, 30)):
+    return Mock(
+        id=id_entidade, nome_referencia=nome, nome_exibicao=nome, descricao=None, updated_at=updated_at
+    )
+
+
+def build_request(headers: dict):
+    return Request({
+        'type': 'http',
+        'headers': [(key.lower().encode(), value.encode()) for key, value in headers.items()]
+    })
+
+
+@pytest.fixture
+def curso_repo():
+    return Mock(
+        find_all_courses_by_filters=AsyncMock(return_value=[
+            build_catalog_entity(1, 'computacao'),
+            build_catalog_entity(2, 'matematica')
+        ])
+    )
+
+
+class TestCatalogoCacheService:
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_get_cursos_reads_database_only_on_first_lookup(curso_repo):
+        catalog_cache = CatalogoCacheService()
+
+        first = await catalog_cache.get_cursos(curso_repo)
+        second = await catalog_cache.get_cursos(curso_repo)
+
+        assert [curso.id for curso in first] == [curso.id for curso in second] == [1, 2]
+        curso_repo.find_all_courses_by_filters.assert_awaited_once_with([])
+        assert catalog_cache.get_stats()['hits'] == 1
+        assert catalog_cache.get_stats()['misses'] == 1
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_invalidate_reloads_catalog_on_next_lookup(curso_repo):
+        catalog_cache = CatalogoCacheService()
+        await catalog_cache.get_cursos(curso_repo)
+
+        catalog_cache.invalidate()
+        await catalog_cache.get_cursos(curso_repo)
+
+        assert curso_repo.find_all_courses_by_filters.await_count == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_load_all():
+        catalog_cache = CatalogoCacheService()
+        repository_path = 'server.services.catalogo_cache_service.{}'
+
+        with patch(repository_path.format('CursoRepository'), return_value=Mock(
+            find_all_courses_by_filters=AsyncMock(return_value=[build_catalog_entity(1, 'computacao')])
+        )), patch(repository_path.format('InteresseRepository'), return_value=Mock(
+            find_all_interests_by_filters=AsyncMock(return_value=[])
+        )), patch(repository_path.format('TipoContatoRepository'), return_value=Mock(
+            find_all_tipos_contato_by_filters=AsyncMock(return_value=[build_catalog_entity(3, 'whatsapp')])
+        )):
+            await catalog_cache.load_all(MagicMock())
+
+        assert catalog_cache.get_stats() == {
+            'hits': 0, 'misses': 0, 'cursos': 1, 'interesses': 0, 'tipos_contato': 1
+        }
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_perfil_service_validates_courses_with_catalog_cache(curso_repo):
+        catalog_cache = CatalogoCacheService()
+        await catalog_cache.get_cursos(curso_repo)
+        perfil_service = PerfilService(curso_repo=curso_repo, catalogo_cache=catalog_cache)
+
+        with pytest.raises(exceptions.CourseNotFoundException):
+            await perfil_service.validate_course_ids([1, 3])
+
+        curso_repo.find_all_courses_by_filters.assert_awaited_once()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_snapshot_etag(curso_repo):
+        catalog_cache = CatalogoCacheService()
+
+        snapshot = await catalog_cache.get_cursos_snapshot(curso_repo)
+
+        assert snapshot.etag.startswith('"') and len(snapshot.etag) == 66
+        catalog_cache.invalidate()
+        assert (await catalog_cache.get_cursos_snapshot(curso_repo)).etag == snapshot.etag
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_snapshot_etag_changes_when_entity_is_removed(curso_repo):
+        catalog_cache = CatalogoCacheService()
+        snapshot = await catalog_cache.get_cursos_snapshot(curso_repo)
+
+        catalog_cache.invalidate()
+        curso_repo.find_all_courses_by_filters.return_value = \
+            curso_repo.find_all_courses_by_filters.return_value[:-1]
+
+        assert (await catalog_cache.get_cursos_snapshot(curso_repo)).etag != snapshot.etag
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_conditional_response(curso_repo):
+        snapshot = await CatalogoCacheService().get_cursos_snapshot(curso_repo)
+
+        def get_status(headers: dict):
+            return get_conditional_response(build_request(headers), snapshot.content, snapshot.etag).status_code
+
+        assert get_status({}) == 200
+        assert get_status({'If-None-Match': snapshot.etag}) == 304
+        assert get_status({'If-None-Match': f'"outro", W/{snapshot.etag}'}) == 304
+        assert get_status({'If-None-Match': '"outro"'}) == 200
+        # Sem Last-Modified, If-Modified-Since não é considerado
+        assert get_status({'If-Modified-Since': 'Mon, 01 Jan 2035 00:00:00 GMT'}) == 200
+        response = get_conditional_response(build_request({}), snapshot.content, snapshot.etag)
+        assert response.headers['etag'] == snapshot.etag
+        assert 'last-modified' not in response.headers
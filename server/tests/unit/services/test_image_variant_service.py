@@ -0,0 +1,104 @@
+import io
+import pytest
+
+from PIL import Image
+from mock import Mock, AsyncMock, MagicMock, patch
+from server.schemas.arquivo_schema import FileUploaderOutput
+from server.services.image_variant_service import ImageVariantService, build_image_variants
+
+
+"""
+    Fixtures
+"""
+
+
+@pytest.fixture
+def image_content():
+    buffer = io.BytesIO()
+    Image.new('RGB', (800, 400), color=(200, 10, 10)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def variant_environment():
+    return Mock(
+        AWS_S3_BUCKET='bucket',
+        AWS_REGION_NAME='us-east-1',
+        IMAGE_VARIANT_THUMBNAIL_SIZES=[64, 256],
+        IMAGE_VARIANT_COMPRESSED_MAX_SIZE=400,
+        IMAGE_VARIANT_WEBP_QUALITY=80
+    )
+
+
+class TestImageVariantService:
+
+    @staticmethod
+    def test_build_image_variants(image_content):
+        variants = build_image_variants(image_content, [64, 256], 400, 80)
+
+        assert [
+            (variant['nome_variante'], variant['largura'], variant['altura']) for variant in variants
+        ] == [('thumb_64', 64, 64), ('thumb_256', 256, 256), ('compressed', 400, 200)]
+        for variant in variants:
+            with Image.open(io.BytesIO(variant['content'])) as image:
+                assert image.format == 'WEBP'
+                assert image.size == (variant['largura'], variant['altura'])
+
+    @staticmethod
+    def test_get_variant_key():
+        assert ImageVariantService.get_variant_key('u/guid/profile/uuid/foto.png', 'thumb_64') == \
+            'u/guid/profile/uuid/variants/thumb_64.webp'
+
+    @staticmethod
+    def test_get_variant_key_does_not_overwrite_original():
+        original_key = 'u/guid/profile/uuid/thumb_64.webp'
+        assert ImageVariantService.get_variant_key(original_key, 'thumb_64') != original_key
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_generate_variants(image_content, variant_environment):
+        file_uploader_service = Mock(
+            download=AsyncMock(return_value=image_content),
+            upload=AsyncMock(side_effect=lambda file_input: FileUploaderOutput(
+                url=f'https://bucket/{file_input.key}', additional_data={}
+            ))
+        )
+        arquivo_repo = Mock(insere_variantes_arquivo=AsyncMock())
+        image_variant_service = ImageVariantService(
+            file_uploader_service=file_uploader_service,
+            session_maker=MagicMock(),
+            environment=variant_environment
+        )
+
+        with patch('server.services.image_variant_service.ArquivoRepository', return_value=arquivo_repo):
+            await image_variant_service.generate_variants(1, 'u/guid/profile/uuid/foto.png')
+
+        uploaded_keys = [call.args[0].key for call in file_uploader_service.upload.call_args_list]
+        assert uploaded_keys == [
+            'u/guid/profile/uuid/variants/thumb_64.webp',
+            'u/guid/profile/uuid/variants/thumb_256.webp',
+            'u/guid/profile/uuid/variants/compressed.webp'
+        ]
+        id_arquivo, variantes_input_dicts = arquivo_repo.insere_variantes_arquivo.call_args.args
+        assert id_arquivo == 1
+        assert variantes_input_dicts[0] == {
+            'nome_variante': 'thumb_64',
+            'url': 'https://bucket/u/guid/profile/uuid/variants/thumb_64.webp',
+            'file_type': 'image/webp',
+            'largura': 64,
+            'altura': 64
+        }
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_generate_variants_invalid_image_is_not_raised(variant_environment):
+        file_uploader_service = Mock(download=AsyncMock(return_value=b'not an image'), upload=AsyncMock())
+        image_variant_service = ImageVariantService(
+            file_uploader_service=file_uploader_service,
+            session_maker=MagicMock(),
+            environment=variant_environment
+        )
+
+        await image_variant_service.generate_variants(1, 'u/guid/profile/uuid/foto.png')
+
+        file_uploader_service.upload.assert_not_called()
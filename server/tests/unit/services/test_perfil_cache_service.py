@@ -0,0 +1,140 @@
+import pytest
+
+from types import SimpleNamespace
+from fakeredis.aioredis import FakeRedis
+from mock import Mock, AsyncMock
+from aioredis.exceptions import ConnectionError
+from server.configuration import db
+from server.controllers import endpoint_exception_handler
+from server.schemas.perfil_schema import PerfilOutput
+from server.services.perfil_cache_service import PerfilCacheService
+from server.services.perfil_service import PerfilService
+
+
+"""
+    Fixtures
+"""
+
+
+GUID_PERFIL = '44ddad94-94ee-4cdc-bce9-b5b126c9a714'
+GUID_USUARIO = 'a4ddad94-94ee-4cdc-bce9-b5b126c9a714'
+
+
+@pytest.fixture
+async def perfil_cache():
+    redis = FakeRedis(decode_responses=True)
+    yield PerfilCacheService(redis, ttl_in_seconds=300)
+    await redis.flushall()
+    await redis.close()
+
+
+def build_perfil(nome_exibicao: str = 'João'):
+    return SimpleNamespace(
+        id=1, guid=GUID_PERFIL, guid_usuario=GUID_USUARIO, nome_exibicao=nome_exibicao,
+        bio=None, url_imagem=None, phones=[], emails=[], id_imagem_perfil=None, imagem_perfil=None,
+        vinculos_perfil_interesse=[], vinculos_perfil_curso=[]
+    )
+
+
+def build_perfil_output(nome_exibicao: str = 'João'):
+    return PerfilOutput.from_orm(PerfilService.handle_profile_body(build_perfil(nome_exibicao)))
+
+
+class TestPerfilCacheService:
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_set_and_get_profile(perfil_cache):
+        await perfil_cache.set_profile(1, build_perfil_output())
+
+        assert (await perfil_cache.get_profile_by_guid(GUID_PERFIL)).nome_exibicao == 'João'
+        assert (await perfil_cache.get_profile_by_guid_usuario(GUID_USUARIO)).nome_exibicao == 'João'
+        assert 0 < await perfil_cache.redis.ttl(perfil_cache.get_profile_key(1)) <= 300
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_invalidate(perfil_cache):
+        await perfil_cache.set_profile(1, build_perfil_output())
+
+        await perfil_cache.invalidate(1)
+
+        assert await perfil_cache.get_profile_by_guid(GUID_PERFIL) is None
+        assert await perfil_cache.get_profile_by_guid_usuario(GUID_USUARIO) is None
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_redis_failure_is_a_miss():
+        perfil_cache = PerfilCacheService(
+            Mock(get=AsyncMock(side_effect=ConnectionError()), delete=AsyncMock(side_effect=ConnectionError())),
+            ttl_in_seconds=300
+        )
+
+        assert await perfil_cache.get_profile_by_guid(GUID_PERFIL) is None
+        await perfil_cache.invalidate(1)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_get_profile_read_through(perfil_cache):
+        perfil_repo = Mock(
+            find_profile_by_guid=AsyncMock(return_value=build_perfil()),
+            find_profile_by_guid_usuario=AsyncMock()
+        )
+        perfil_service = PerfilService(perfil_repo=perfil_repo, perfil_cache=perfil_cache)
+
+        first_output = await perfil_service.get_profile_by_guid(GUID_PERFIL)
+        second_output = await perfil_service.get_profile_by_guid(GUID_PERFIL)
+        user_output = await perfil_service.get_profile_by_guid_usuario(GUID_USUARIO)
+
+        perfil_repo.find_profile_by_guid.assert_awaited_once()
+        perfil_repo.find_profile_by_guid_usuario.assert_not_called()
+        assert first_output == second_output == user_output
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_write_invalidates_profile(perfil_cache):
+        await perfil_cache.set_profile(1, build_perfil_output('Antigo'))
+        perfil_repo = Mock(
+            find_perfil_phone_by_guid=AsyncMock(return_value=Mock(id_perfil=1)),
+            delete_phone_profile=AsyncMock(),
+            find_profile_by_guid=AsyncMock(return_value=build_perfil('Novo'))
+        )
+        perfil_service = PerfilService(perfil_repo=perfil_repo, perfil_cache=perfil_cache)
+
+        await perfil_service.delete_phone_profile_by_guid('guid-phone')
+        perfil_output = await perfil_service.get_profile_by_guid(GUID_PERFIL)
+
+        assert perfil_output.nome_exibicao == 'Novo'
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_write_invalidates_profile_after_commit(perfil_cache):
+        session = Mock(info={})
+        perfil_repo = Mock(
+            db_session=session,
+            find_perfil_phone_by_guid=AsyncMock(return_value=Mock(id_perfil=1)),
+            delete_phone_profile=AsyncMock()
+        )
+        perfil_service = PerfilService(perfil_repo=perfil_repo, perfil_cache=perfil_cache)
+
+        await perfil_service.delete_phone_profile_by_guid('guid-phone')
+        # Leitura concorrente, antes do commit, armazena a versão anterior do perfil
+        await perfil_cache.set_profile(1, build_perfil_output('Antigo'))
+        await db.run_after_commit_callbacks(session)
+
+        assert await perfil_cache.get_profile_by_guid(GUID_PERFIL) is None
+        assert session.info == {}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_after_commit_failure_does_not_fail_committed_write():
+        session = Mock(info={}, commit=AsyncMock(), rollback=AsyncMock())
+
+        @endpoint_exception_handler
+        async def endpoint(session):
+            db.add_after_commit_callback(session, AsyncMock(side_effect=ConnectionError()))
+            return 'ok'
+
+        assert await endpoint(session=session) == 'ok'
+        session.commit.assert_awaited_once()
+        session.rollback.assert_not_called()
+        assert session.info == {}
@@ -0,0 +1,499 @@
+import uuid
+import pytest
+
+from jose import jwt
+from mock import Mock, AsyncMock
+from starlette.requests import Request
+from server.configuration import exceptions
+from server.services.perfil_service import PerfilService
+from server.repository.perfil_repository import PerfilRepository
+from server.schemas.perfil_schema import (
+    PerfilPatchInput, VinculosPerfilPatchInput, PerfilUsuarioImportItemInput, PerfilUsuarioImportInput,
+    NotOwnerPerfilPostInput, UsuarioPostInput, PerfilOutput
+)
+from server.models.perfil_model import Perfil
+from server.models.vinculo_perfil_curso_model import VinculoPerfilCurso
+from server.models.curso_model import Curso
+
+
+"""
+    Fixtures
+"""
+
+
+GUID_USUARIO_IMPORT = str(uuid.uuid4())
+
+
+@pytest.fixture
+def cursor_environment():
+    return Mock(
+        CURSOR_TOKEN_SECRET_KEY="secret",
+        CURSOR_TOKEN_ALGORITHM="HS256"
+    )
+
+
+@pytest.fixture
+def profiles_request():
+    """
+        Retorna uma requisição de listagem de perfis com filtros repetidos
+        na query string
+    """
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("test", 80),
+        "path": "/profiles",
+        "root_path": "",
+        "query_string": b"interests_in=1&interests_in=2&page_size=10&cursor=old",
+        "headers": []
+    })
+
+
+def encode_test_cursor(cursor_dict: dict, secret: str = "secret"):
+    return jwt.encode(cursor_dict, secret, algorithm="HS256")
+
+
+class TestPerfilService:
+
+    @staticmethod
+    def test_get_cursor_url_keeps_query_params(profiles_request):
+        url = PerfilService.get_cursor_url(profiles_request, "new")
+
+        assert url.startswith("http://test/profiles?")
+        assert "interests_in=1&interests_in=2" in url
+        assert "page_size=10" in url
+        assert "cursor=new" in url
+        assert "cursor=old" not in url
+
+    @staticmethod
+    def test_get_cursor_url_without_cursor(profiles_request):
+        assert PerfilService.get_cursor_url(profiles_request, None) is None
+
+    @staticmethod
+    @pytest.mark.parametrize('encoded_cursor', [
+        'not-a-jwt',
+        encode_test_cursor({'sort_field_key': 'id', 'value': 1, 'id': 1, 'direction': 'next'}, secret='wrong'),
+        encode_test_cursor({'sort_field_key': 'id', 'value': 1, 'id': 1, 'direction': 'sideways'}),
+    ])
+    def test_decode_cursor_info_invalid(cursor_environment, encoded_cursor):
+        perfil_service = PerfilService(environment=cursor_environment)
+
+        with pytest.raises(exceptions.InvalidCursorException):
+            perfil_service.decode_cursor_info(encoded_cursor)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_get_all_profiles_paginated_uses_cursor_sort_field(cursor_environment, profiles_request):
+        encoded_cursor = encode_test_cursor(
+            {'sort_field_key': 'id', 'value': 7, 'id': 7, 'direction': 'previous'}
+        )
+        perfil_repo = Mock(
+            find_profiles_by_filters_paginated=AsyncMock(return_value={
+                "items": [],
+                "current_cursor": encoded_cursor,
+                "next_cursor": "next",
+                "previous_cursor": None,
+                "count": 0
+            })
+        )
+        perfil_service = PerfilService(perfil_repo=perfil_repo, environment=cursor_environment)
+
+        paginated_profile_dict = await perfil_service.get_all_profiles_paginated(
+            {}, profiles_request, 10, encoded_cursor, 'nome_exibicao'
+        )
+
+        args = perfil_repo.find_profiles_by_filters_paginated.call_args.args
+        assert args[2].direction == 'previous'
+        assert args[4] == 'id'
+        assert paginated_profile_dict['previous_url'] is None
+        assert paginated_profile_dict['next_url'].endswith("cursor=next")
+
+    @staticmethod
+    @pytest.mark.parametrize('params_dict, expected_filters_count', [
+        ({'interests_in': None, 'courses_in': None, 'display_name_ilike': None}, 0),
+        ({'interests_in': [1, 2], 'courses_in': None, 'display_name_ilike': None}, 1),
+        ({'interests_in': [1], 'courses_in': [3], 'display_name_ilike': 'teste'}, 3),
+    ])
+    def test_get_filters_by_params_only_active_filters(params_dict, expected_filters_count):
+        filters = PerfilService.get_filters_by_params(params_dict)
+
+        assert len(filters) == expected_filters_count
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('term', ['', 'ab', '  ab  '])
+    async def test_search_profiles_by_display_name_term_too_short(term):
+        perfil_repo = Mock(find_profiles_by_name_similarity=AsyncMock())
+        perfil_service = PerfilService(
+            perfil_repo=perfil_repo,
+            environment=Mock(PROFILE_NAME_SEARCH_MIN_LENGTH=3, PROFILE_NAME_SEARCH_MAX_RESULTS=50)
+        )
+
+        with pytest.raises(exceptions.SearchTermTooShortException):
+            await perfil_service.search_profiles_by_display_name(term, 10)
+
+        perfil_repo.find_profiles_by_name_similarity.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_search_profiles_by_display_name_normalizes_and_limits():
+        perfil_repo = Mock(find_profiles_by_name_similarity=AsyncMock(return_value=[]))
+        perfil_service = PerfilService(
+            perfil_repo=perfil_repo,
+            environment=Mock(PROFILE_NAME_SEARCH_MIN_LENGTH=3, PROFILE_NAME_SEARCH_MAX_RESULTS=50)
+        )
+
+        await perfil_service.search_profiles_by_display_name(' João ', 500)
+
+        perfil_repo.find_profiles_by_name_similarity.assert_awaited_once_with('Joao', 50, None)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('search, sort_by, expected_sort_field_key', [
+        (None, None, 'nome_exibicao'),
+        ('engenharia', None, 'relevance'),
+        ('engenharia', 'id', 'id'),
+    ])
+    async def test_get_all_profiles_paginated_default_sort_field(
+        cursor_environment, profiles_request, search, sort_by, expected_sort_field_key
+    ):
+        perfil_repo = Mock(
+            find_profiles_by_filters_paginated=AsyncMock(return_value={
+                "items": [],
+                "current_cursor": None,
+                "next_cursor": None,
+                "previous_cursor": None,
+                "count": 0
+            })
+        )
+        perfil_service = PerfilService(perfil_repo=perfil_repo, environment=cursor_environment)
+
+        await perfil_service.get_all_profiles_paginated(
+            {'search': search}, profiles_request, 10, None, sort_by
+        )
+
+        args = perfil_repo.find_profiles_by_filters_paginated.call_args.args
+        assert args[4] == expected_sort_field_key
+        assert args[5] == search
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('patch_input, should_update_search_vector', [
+        ({'nome_exibicao': 'João'}, True),
+        ({'bio': 'Estudante de computação'}, True),
+        ({'url_imagem': 'https://teste.com.br'}, False),
+    ])
+    async def test_patch_profile_updates_search_vector(patch_input, should_update_search_vector):
+        perfil_repo = Mock(
+            atualiza_perfil_by_guid_usuario=AsyncMock(return_value=Mock(id=1)),
+            atualiza_search_vector=AsyncMock(),
+            find_profile_by_guid_usuario=AsyncMock()
+        )
+        perfil_service = PerfilService(perfil_repo=perfil_repo)
+
+        await perfil_service.patch_profile_by_guid_usuario(
+            Mock(guid='guid'), PerfilPatchInput(**patch_input)
+        )
+
+        profile_dict = perfil_repo.atualiza_perfil_by_guid_usuario.call_args.args[1]
+        assert ('nome_exibicao_normalized' in profile_dict) == ('nome_exibicao' in patch_input)
+        assert perfil_repo.atualiza_search_vector.called == should_update_search_vector
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_get_profiles_batch():
+        perfil_1 = Mock(guid='g1', guid_usuario='u1', vinculos_perfil_interesse=[], vinculos_perfil_curso=[])
+        perfil_2 = Mock(guid='g2', guid_usuario='u2', vinculos_perfil_interesse=[], vinculos_perfil_curso=[])
+        perfil_repo = Mock(find_profiles_by_guids=AsyncMock(return_value=[perfil_1, perfil_2]))
+        perfil_service = PerfilService(
+            perfil_repo=perfil_repo, environment=Mock(PROFILE_BATCH_MAX_SIZE=10)
+        )
+
+        perfil_batch = await perfil_service.get_profiles_batch(['g2', 'g3', 'g2'], ['u1', 'u2', 'u4'])
+
+        perfil_repo.find_profiles_by_guids.assert_awaited_once_with(['g2', 'g3'], ['u1', 'u2', 'u4'], None)
+        assert perfil_batch['items'] == [perfil_2, perfil_1]
+        assert perfil_batch['not_found_guids'] == ['g3']
+        assert perfil_batch['not_found_guids_usuario'] == ['u4']
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_get_profiles_batch_too_large():
+        perfil_repo = Mock(find_profiles_by_guids=AsyncMock())
+        perfil_service = PerfilService(
+            perfil_repo=perfil_repo, environment=Mock(PROFILE_BATCH_MAX_SIZE=2)
+        )
+
+        with pytest.raises(exceptions.ProfileBatchTooLargeException):
+            await perfil_service.get_profiles_batch(['g1', 'g2'], ['u1'])
+
+        perfil_repo.find_profiles_by_guids.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.parametrize('fields_param, expected_fields', [
+        (None, None),
+        ('', None),
+        ('nome_exibicao, imagem_perfil', {'guid', 'guid_usuario', 'nome_exibicao', 'imagem_perfil'}),
+    ])
+    def test_get_fields_by_param(fields_param, expected_fields):
+        assert PerfilService.get_fields_by_param(fields_param) == expected_fields
+
+    @staticmethod
+    def test_get_fields_by_param_invalid_field():
+        with pytest.raises(exceptions.InvalidProfileFieldsException):
+            PerfilService.get_fields_by_param('nome_exibicao,senha')
+
+    @staticmethod
+    @pytest.mark.parametrize('fields, expected_loaded_relationships', [
+        (None, {'vinculos_perfil_curso', 'vinculos_perfil_interesse', 'phones', 'emails', 'imagem_perfil'}),
+        ({'guid', 'guid_usuario', 'nome_exibicao'}, set()),
+        ({'guid', 'cursos', 'imagem_perfil'}, {'vinculos_perfil_curso', 'imagem_perfil'}),
+    ])
+    def test_all_entities_select_statement_loads_only_requested_relationships(fields, expected_loaded_relationships):
+        stmt = PerfilRepository.get_all_entities_select_statement(fields)
+
+        loaded_relationships = {
+            option.path[0].key for option in stmt._with_options
+            if option._to_bind[0].strategy == (('lazy', 'selectin'),)
+        }
+        assert loaded_relationships == expected_loaded_relationships
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_replace_profile_courses():
+        perfil_repo = Mock(
+            find_profile_by_guid_usuario=AsyncMock(return_value=Mock(id=7)),
+            insert_vinculos_perfil=AsyncMock(),
+            delete_vinculos_perfil=AsyncMock(),
+            atualiza_search_vector=AsyncMock(),
+            find_cursos_by_id_perfil=AsyncMock(return_value=['curso_1', 'curso_2'])
+        )
+        curso_repo = Mock(
+            find_all_courses_by_filters=AsyncMock(return_value=[Mock(id=1), Mock(id=2)])
+        )
+        perfil_service = PerfilService(perfil_repo=perfil_repo, curso_repo=curso_repo)
+
+        cursos = await perfil_service.replace_profile_courses('u1', [2, 1, 2])
+
+        perfil_repo.insert_vinculos_perfil.assert_awaited_once_with(VinculoPerfilCurso, 'id_curso', 7, [2, 1])
+        perfil_repo.delete_vinculos_perfil.assert_awaited_once_with(
+            VinculoPerfilCurso, 'id_curso', 7, [2, 1], keep_ids=True
+        )
+        perfil_repo.atualiza_search_vector.assert_awaited_once_with(7)
+        assert cursos == ['curso_1', 'curso_2']
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_patch_profile_interests_unknown_interest():
+        perfil_repo = Mock(insert_vinculos_perfil=AsyncMock(), delete_vinculos_perfil=AsyncMock())
+        interesse_repo = Mock(
+            find_all_interests_by_filters=AsyncMock(return_value=[Mock(id=1)])
+        )
+        perfil_service = PerfilService(perfil_repo=perfil_repo, interesse_repo=interesse_repo)
+
+        with pytest.raises(exceptions.InterestNotFoundException):
+            await perfil_service.patch_profile_interests('u1', [1, 3], [2])
+
+        perfil_repo.insert_vinculos_perfil.assert_not_called()
+        perfil_repo.delete_vinculos_perfil.assert_not_called()
+
+    @staticmethod
+    def test_vinculos_patch_input_rejects_ids_in_add_and_remove():
+        with pytest.raises(ValueError):
+            VinculosPerfilPatchInput(add=[1, 2], remove=[2])
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_link_course_to_profile_conflict():
+        perfil_repo = Mock(
+            find_profile_by_guid_usuario=AsyncMock(return_value=Mock(id=7)),
+            insert_vinculo_perfil_curso=AsyncMock(return_value=False),
+            atualiza_search_vector=AsyncMock()
+        )
+        curso_repo = Mock(find_all_courses_by_filters=AsyncMock(return_value=[Mock(id=1)]))
+        perfil_service = PerfilService(perfil_repo=perfil_repo, curso_repo=curso_repo)
+
+        with pytest.raises(exceptions.CourseLinkConflictException):
+            await perfil_service.link_course_to_profile('u1', 1)
+
+        perfil_repo.insert_vinculo_perfil_curso.assert_awaited_once_with(1, 7)
+        perfil_repo.atualiza_search_vector.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_delete_profile_interest_link_not_found():
+        perfil_repo = Mock(
+            find_profile_by_guid_usuario=AsyncMock(return_value=Mock(id=7)),
+            delete_vinculo_perfil_interesse=AsyncMock(return_value=False),
+            atualiza_search_vector=AsyncMock()
+        )
+        interesse_repo = Mock(find_all_interests_by_filters=AsyncMock(return_value=[Mock(id=3)]))
+        perfil_service = PerfilService(perfil_repo=perfil_repo, interesse_repo=interesse_repo)
+
+        with pytest.raises(exceptions.InterestLinkNotFoundException):
+            await perfil_service.delete_profile_interest_link('u1', 3)
+
+        perfil_repo.delete_vinculo_perfil_interesse.assert_awaited_once_with(3, 7)
+        perfil_repo.atualiza_search_vector.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_delete_profile_by_guid_usuario_not_found():
+        perfil_repo = Mock(delete_perfil_by_guid_usuario=AsyncMock(return_value=None))
+        perfil_cache = Mock(invalidate=AsyncMock())
+        perfil_service = PerfilService(perfil_repo=perfil_repo, perfil_cache=perfil_cache)
+
+        with pytest.raises(exceptions.ProfileNotFoundException):
+            await perfil_service.delete_profile_by_guid_usuario('u1')
+
+        perfil_cache.invalidate.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_import_profiles():
+        def perfil_usuario_input(guid_usuario, username):
+            return PerfilUsuarioImportItemInput(
+                user={'guid': guid_usuario, 'nome': 'Teste', 'username': username},
+                profile={'guid_usuario': guid_usuario, 'nome_exibicao': 'João'}
+            )
+
+        created_guid, existing_guid, conflict_guid = (str(uuid.uuid4()) for _ in range(3))
+        usuario_repo = Mock(
+            insere_usuarios_if_not_exist=AsyncMock(return_value=[created_guid]),
+            find_existing_guids=AsyncMock(return_value={existing_guid})
+        )
+        perfil_repo = Mock(
+            insere_perfis_if_not_exist=AsyncMock(
+                return_value=[Mock(id=1, guid='p1', guid_usuario=uuid.UUID(created_guid))]
+            ),
+            atualiza_search_vector_by_ids=AsyncMock()
+        )
+        perfil_service = PerfilService(
+            perfil_repo=perfil_repo, usuario_repo=usuario_repo,
+            environment=Mock(PROFILE_IMPORT_MAX_SIZE=10)
+        )
+
+        output = await perfil_service.import_profiles([
+            perfil_usuario_input(created_guid, 'a'),
+            perfil_usuario_input(existing_guid, 'b'),
+            perfil_usuario_input(conflict_guid, 'c'),
+        ])
+
+        usuario_repo.find_existing_guids.assert_awaited_once_with([existing_guid, conflict_guid])
+        inserted_profile_dicts = perfil_repo.insere_perfis_if_not_exist.await_args.args[0]
+        assert [str(profile_dict['guid_usuario']) for profile_dict in inserted_profile_dicts] == [
+            created_guid, existing_guid
+        ]
+        assert inserted_profile_dicts[0]['nome_exibicao_normalized'] == 'Joao'
+        perfil_repo.atualiza_search_vector_by_ids.assert_awaited_once_with([1])
+        assert [item['status'] for item in output['items']] == ['created', 'already_exists', 'user_conflict']
+        assert output['created'] == 1
+
+    @staticmethod
+    def test_import_input_rejects_duplicated_profiles():
+        guid_usuario = str(uuid.uuid4())
+        item = {
+            'user': {'guid': guid_usuario, 'nome': 'Teste', 'username': 'teste'},
+            'profile': {'guid_usuario': guid_usuario}
+        }
+        with pytest.raises(ValueError):
+            PerfilUsuarioImportInput(items=[item, item])
+
+    @staticmethod
+    @pytest.mark.parametrize('profile', [
+        {'guid_usuario': str(uuid.uuid4())},
+        {'guid_usuario': GUID_USUARIO_IMPORT, 'id_imagem_perfil': 1},
+        {'guid_usuario': GUID_USUARIO_IMPORT, 'imagem_perfil': {
+            'file_name': 'foto.png', 'file_type': 'image/png', 'b64_content': ''
+        }},
+    ])
+    def test_import_input_rejects_invalid_profile(profile):
+        with pytest.raises(ValueError):
+            PerfilUsuarioImportItemInput(
+                user={'guid': GUID_USUARIO_IMPORT, 'nome': 'Teste', 'username': 'teste'}, profile=profile
+            )
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_patch_profile_builds_response_from_returning_row():
+        perfil_returning = Perfil(id=1, guid=uuid.uuid4(), guid_usuario=uuid.uuid4(), nome_exibicao='João', bio='Bio')
+        perfil_repo = Mock(
+            atualiza_perfil_by_guid_usuario=AsyncMock(return_value=perfil_returning),
+            atualiza_search_vector=AsyncMock(),
+            find_profile_by_guid_usuario=AsyncMock()
+        )
+        perfil_service = PerfilService(perfil_repo=perfil_repo)
+
+        perfil = await perfil_service.patch_profile_by_guid_usuario(
+            Mock(guid='guid'), PerfilPatchInput(nome_exibicao='João'),
+            PerfilService.get_fields_by_param('nome_exibicao')
+        )
+
+        perfil_repo.find_profile_by_guid_usuario.assert_not_called()
+        assert perfil == {
+            'guid': perfil_returning.guid,
+            'guid_usuario': perfil_returning.guid_usuario,
+            'nome_exibicao': 'João'
+        }
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_patch_profile_loads_only_requested_relationships():
+        perfil_returning = Perfil(id=1, guid=uuid.uuid4(), guid_usuario=uuid.uuid4(), nome_exibicao='João')
+        vinculo = VinculoPerfilCurso(id=1, id_perfil=1, id_curso=2)
+        vinculo.curso = Curso(id=2, nome_referencia='computacao', nome_exibicao='Computação')
+        db_session = Mock(execute=AsyncMock(return_value=Mock(
+            scalars=Mock(return_value=Mock(all=Mock(return_value=[vinculo])))
+        )))
+        perfil_repo = PerfilRepository(db_session)
+        perfil_repo.atualiza_perfil_by_guid_usuario = AsyncMock(return_value=perfil_returning)
+        perfil_repo.find_profile_by_guid_usuario = AsyncMock()
+        perfil_service = PerfilService(perfil_repo=perfil_repo)
+
+        perfil = await perfil_service.patch_profile_by_guid_usuario(
+            Mock(guid='guid'), PerfilPatchInput(url_imagem='https://teste.com.br'),
+            PerfilService.get_fields_by_param('nome_exibicao,cursos')
+        )
+
+        perfil_repo.find_profile_by_guid_usuario.assert_not_called()
+        db_session.execute.assert_awaited_once()
+        assert perfil['nome_exibicao'] == 'João'
+        assert [curso['id'] for curso in perfil['cursos']] == [2]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_insert_profile_does_not_reload_new_profile():
+        guid_usuario = uuid.uuid4()
+        perfil_repo = Mock(
+            insere_perfil=AsyncMock(
+                return_value=Perfil(id=1, guid=uuid.uuid4(), guid_usuario=guid_usuario, nome_exibicao='João')
+            ),
+            atualiza_search_vector=AsyncMock(),
+            find_profile_by_guid=AsyncMock(),
+            find_profile_by_guid_usuario=AsyncMock()
+        )
+        perfil_service = PerfilService(perfil_repo=perfil_repo, usuario_repo=Mock(insere_usuario=AsyncMock()))
+
+        perfil = await perfil_service.insert_profile(
+            NotOwnerPerfilPostInput(guid_usuario=guid_usuario, nome_exibicao='João'),
+            UsuarioPostInput(guid=guid_usuario, nome='João', username='joao')
+        )
+
+        perfil_repo.find_profile_by_guid.assert_not_called()
+        perfil_repo.find_profile_by_guid_usuario.assert_not_called()
+        perfil_output = PerfilOutput.from_orm(perfil)
+        assert (perfil_output.nome_exibicao, perfil_output.cursos, perfil_output.imagem_perfil) == ('João', [], None)
+
+    @staticmethod
+    def test_get_profile_json_content_omits_unselected_fields():
+        perfil = Perfil(id=1, guid=uuid.uuid4(), guid_usuario=uuid.uuid4(), nome_exibicao='João', bio='Bio')
+        fields = PerfilService.get_fields_by_param('nome_exibicao')
+
+        full_content = PerfilService.get_profile_json_content(PerfilService.handle_profile_body(perfil))
+        sparse_content = PerfilService.get_profile_json_content(
+            PerfilService.select_profile_fields(perfil, fields)
+        )
+
+        assert b'"bio": "Bio"' in full_content and b'"cursos": []' in full_content
+        assert b'bio' not in sparse_content and b'"nome_exibicao": "Jo' in sparse_content
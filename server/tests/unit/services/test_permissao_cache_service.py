@@ -0,0 +1,94 @@
+import pytest
+
+from mock import Mock, AsyncMock, MagicMock, patch
+from server.services.permissao_cache_service import PermissaoCacheService
+
+
+"""
+    Fixtures
+"""
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def permission_repo():
+    """
+        (F1 -> P1, P2)
+        (F2 -> P3)
+    """
+    return Mock(
+        find_permissions_by_roles_list=AsyncMock(return_value=[Mock(nome='P1'), Mock(nome='P2')]),
+        find_all_role_permission_names=AsyncMock(return_value=[(1, 'P1'), (1, 'P2'), (2, 'P3')])
+    )
+
+
+class TestPermissaoCacheService:
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_get_permissions_by_roles_opens_session_only_on_miss(fake_clock, permission_repo):
+        permission_cache = PermissaoCacheService(ttl_in_seconds=60, clock=fake_clock)
+        session_maker = MagicMock()
+
+        with patch(
+            'server.services.permissao_cache_service.PermissaoRepository',
+            return_value=permission_repo
+        ):
+            first = await permission_cache.get_permissions_by_roles([1, 3], session_maker)
+            second = await permission_cache.get_permissions_by_roles([3, 1], session_maker)
+
+        assert first == second == frozenset({'P1', 'P2'})
+        session_maker.assert_called_once()
+        permission_repo.find_permissions_by_roles_list.assert_awaited_once()
+        assert permission_cache.get_stats()['hits'] == 1
+        assert permission_cache.get_stats()['misses'] == 1
+
+    @staticmethod
+    def test_get_cached_permissions_expires_after_ttl(fake_clock):
+        permission_cache = PermissaoCacheService(ttl_in_seconds=60, clock=fake_clock)
+        permission_cache.set_cached_permissions([1], ['P1'])
+
+        fake_clock.now = 59
+        assert permission_cache.get_cached_permissions([1]) == frozenset({'P1'})
+
+        fake_clock.now = 60
+        assert permission_cache.get_cached_permissions([1]) is None
+
+    @staticmethod
+    def test_invalidate(fake_clock):
+        permission_cache = PermissaoCacheService(ttl_in_seconds=60, clock=fake_clock)
+        permission_cache.set_cached_permissions([1], ['P1'])
+        permission_cache.set_cached_permissions([2], ['P3'])
+
+        permission_cache.invalidate([1])
+        assert permission_cache.get_cached_permissions([1]) is None
+        assert permission_cache.get_cached_permissions([2]) == frozenset({'P3'})
+
+        permission_cache.invalidate()
+        assert permission_cache.get_stats()['entries'] == 0
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_load_all_refreshes_cached_role_sets(fake_clock, permission_repo):
+        permission_cache = PermissaoCacheService(ttl_in_seconds=60, clock=fake_clock)
+        permission_cache.set_cached_permissions([1, 2, 3], ['OLD'])
+
+        await permission_cache.load_all(permission_repo)
+
+        assert permission_cache.get_cached_permissions([1]) == frozenset({'P1', 'P2'})
+        assert permission_cache.get_cached_permissions([2]) == frozenset({'P3'})
+        assert permission_cache.get_cached_permissions([1, 2, 3]) == frozenset({'P1', 'P2', 'P3'})
+        permission_repo.find_permissions_by_roles_list.assert_not_called()
@@ -0,0 +1,250 @@
+import time
+import boto3
+import requests
+import asyncio
+import pytest
+
+from mock import Mock, patch
+from moto import mock_s3
+from concurrent.futures import ThreadPoolExecutor
+from server.configuration import exceptions
+from server.schemas.arquivo_schema import FileUploaderInput, FileStreamUploaderInput
+from server.services.file_uploader.s3_uploader.client import FIleUploaderClient
+from server.services.file_uploader.s3_uploader.s3_uploader_service import S3FileUploaderService
+
+
+"""
+    Fixtures
+"""
+
+
+@pytest.fixture
+def s3_environment():
+    return Mock(
+        AWS_ACCESS_KEY_ID='testing',
+        AWS_SECRET_KEY='testing',
+        AWS_REGION_NAME='us-east-1',
+        AWS_S3_BUCKET='bucket',
+        AWS_S3_ENDPOINT_URL=None,
+        AWS_S3_CONNECT_TIMEOUT_IN_SECONDS=5,
+        AWS_S3_READ_TIMEOUT_IN_SECONDS=5,
+        AWS_S3_MAX_POOL_CONNECTIONS=2,
+        AWS_S3_MAX_ATTEMPTS=1
+    )
+
+
+@pytest.fixture
+def s3_bucket(s3_environment):
+    """
+        Bucket criado no S3 local simulado pelo moto
+    """
+    with mock_s3():
+        s3_client = boto3.client('s3', region_name=s3_environment.AWS_REGION_NAME)
+        s3_client.create_bucket(Bucket=s3_environment.AWS_S3_BUCKET)
+        yield s3_client
+
+
+@pytest.fixture
+def file_input():
+    return FileUploaderInput(
+        target='bucket',
+        region='us-east-1',
+        key='u/guid/profile/uuid/foto.png',
+        type='image/png',
+        content=b'conteudo'
+    )
+
+
+@pytest.fixture
+def file_stream_input():
+    return FileStreamUploaderInput(
+        target='bucket',
+        region='us-east-1',
+        key='u/guid/profile/uuid/foto.png',
+        type='image/png'
+    )
+
+
+async def iter_chunks(chunks, fail_after=None):
+    for index, chunk in enumerate(chunks):
+        if fail_after is not None and index == fail_after:
+            raise RuntimeError('Falha na leitura do arquivo')
+        yield chunk
+
+
+def slow_upload_client(delay_in_seconds: float):
+    def upload(_):
+        time.sleep(delay_in_seconds)
+        return {}
+    return Mock(upload=upload)
+
+
+class TestS3FileUploaderService:
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upload_to_local_s3(s3_environment, s3_bucket, file_input):
+        s3_uploader_service = S3FileUploaderService(
+            _client=FIleUploaderClient(s3_environment),
+            _executor=ThreadPoolExecutor(max_workers=1),
+            _timeout_in_seconds=5
+        )
+
+        uploaded_file_output = await s3_uploader_service.upload(file_input)
+
+        assert uploaded_file_output.url == \
+            'https://bucket.s3.us-east-1.amazonaws.com/u/guid/profile/uuid/foto.png'
+        uploaded_object = s3_bucket.get_object(Bucket='bucket', Key=file_input.key)
+        assert uploaded_object['Body'].read() == b'conteudo'
+        assert uploaded_object['ContentType'] == 'image/png'
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upload_does_not_block_event_loop(file_input):
+        s3_uploader_service = S3FileUploaderService(
+            _client=slow_upload_client(0.3),
+            _executor=ThreadPoolExecutor(max_workers=1),
+            _timeout_in_seconds=5
+        )
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.02)
+
+        await asyncio.gather(s3_uploader_service.upload(file_input), ticker())
+
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.3
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upload_timeout(file_input):
+        s3_uploader_service = S3FileUploaderService(
+            _client=slow_upload_client(0.3),
+            _executor=ThreadPoolExecutor(max_workers=1),
+            _timeout_in_seconds=0.05
+        )
+
+        with pytest.raises(exceptions.FileUploadTimeoutException):
+            await s3_uploader_service.upload(file_input)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upload_concurrency_limited_by_executor(file_input):
+        s3_uploader_service = S3FileUploaderService(
+            _client=slow_upload_client(0.1),
+            _executor=ThreadPoolExecutor(max_workers=2),
+            _timeout_in_seconds=5
+        )
+
+        start = time.perf_counter()
+        await asyncio.gather(*[s3_uploader_service.upload(file_input) for _ in range(4)])
+
+        assert time.perf_counter() - start >= 0.2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_client_created_lazily_once(s3_environment, s3_bucket, file_input):
+        s3_uploader_client = FIleUploaderClient(s3_environment)
+        s3_uploader_service = S3FileUploaderService(
+            _client=s3_uploader_client,
+            _executor=ThreadPoolExecutor(max_workers=4),
+            _timeout_in_seconds=5
+        )
+
+        with patch.object(
+            FIleUploaderClient, 'build_s3_client', wraps=s3_uploader_client.build_s3_client
+        ) as build_s3_client:
+            assert s3_uploader_client._s3_client is None
+            await asyncio.gather(*[s3_uploader_service.upload(file_input) for _ in range(4)])
+
+        build_s3_client.assert_called_once()
+        assert s3_uploader_client.s3_client.meta.config.max_pool_connections == 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upload_stream_to_local_s3(s3_environment, s3_bucket, file_stream_input):
+        s3_uploader_service = S3FileUploaderService(
+            _client=FIleUploaderClient(s3_environment),
+            _executor=ThreadPoolExecutor(max_workers=1),
+            _timeout_in_seconds=5
+        )
+        chunks = [b'a' * 5 * 1024 * 1024, b'b' * 10]
+
+        uploaded_file_output = await s3_uploader_service.upload_stream(file_stream_input, iter_chunks(chunks))
+
+        assert uploaded_file_output.url.endswith(file_stream_input.key)
+        uploaded_object = s3_bucket.get_object(Bucket='bucket', Key=file_stream_input.key)
+        assert uploaded_object['Body'].read() == b''.join(chunks)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upload_stream_aborts_on_error(s3_environment, s3_bucket, file_stream_input):
+        s3_uploader_service = S3FileUploaderService(
+            _client=FIleUploaderClient(s3_environment),
+            _executor=ThreadPoolExecutor(max_workers=1),
+            _timeout_in_seconds=5
+        )
+
+        with pytest.raises(RuntimeError):
+            await s3_uploader_service.upload_stream(
+                file_stream_input, iter_chunks([b'a' * 5 * 1024 * 1024, b'b'], fail_after=1)
+            )
+
+        assert s3_bucket.list_multipart_uploads(Bucket='bucket').get('Uploads', []) == []
+        assert s3_bucket.list_objects_v2(Bucket='bucket')['KeyCount'] == 0
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_presigned_upload_to_local_s3(s3_environment, s3_bucket, file_stream_input):
+        s3_uploader_service = S3FileUploaderService(
+            _client=FIleUploaderClient(s3_environment),
+            _executor=ThreadPoolExecutor(max_workers=1),
+            _timeout_in_seconds=5
+        )
+
+        assert await s3_uploader_service.find_uploaded_file(file_stream_input) is None
+
+        presigned_upload = await s3_uploader_service.create_presigned_upload(file_stream_input, 1024, 60)
+        response = requests.post(
+            presigned_upload.url,
+            data=presigned_upload.fields,
+            files={'file': ('foto.png', b'conteudo')}
+        )
+        assert response.status_code in (200, 204)
+
+        uploaded_file = await s3_uploader_service.find_uploaded_file(file_stream_input)
+        assert uploaded_file.url.endswith(file_stream_input.key)
+        assert uploaded_file.additional_data['ContentType'] == 'image/png'
+        assert uploaded_file.additional_data['ContentLength'] == len(b'conteudo')
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_list_and_delete_files(s3_environment, s3_bucket):
+        s3_uploader_service = S3FileUploaderService(
+            _client=FIleUploaderClient(s3_environment),
+            _executor=ThreadPoolExecutor(max_workers=1),
+            _timeout_in_seconds=5
+        )
+        for key in ['u/guid/profile/a/foto.png', 'u/guid/profile/b/foto.png', 'outros/foto.png']:
+            s3_bucket.put_object(Bucket='bucket', Key=key, Body=b'conteudo')
+
+        listed_files = [
+            listed_file
+            async for page in s3_uploader_service.list_files('bucket', 'us-east-1', 'u/')
+            for listed_file in page
+        ]
+        deleted_keys = await s3_uploader_service.delete_files(
+            'bucket', [listed_file['key'] for listed_file in listed_files]
+        )
+
+        assert [listed_file['size'] for listed_file in listed_files] == [8, 8]
+        assert listed_files[0]['url'] == \
+            'https://bucket.s3.us-east-1.amazonaws.com/u/guid/profile/a/foto.png'
+        assert deleted_keys == ['u/guid/profile/a/foto.png', 'u/guid/profile/b/foto.png']
+        remaining_keys = [
+            s3_object['Key'] for s3_object in s3_bucket.list_objects_v2(Bucket='bucket')['Contents']
+        ]
+        assert remaining_keys == ['outros/foto.png']
@@ -0,0 +1,69 @@
+import pytest
+
+from mock import Mock
+from server.services.token_cache_service import TokenCacheService
+
+
+"""
+    Fixtures
+"""
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_clock():
+    return FakeClock()
+
+
+class TestTokenCacheService:
+
+    @staticmethod
+    def test_get_cached_user_hit_and_miss(fake_clock):
+        token_cache = TokenCacheService(max_size=10, max_ttl_in_seconds=60, clock=fake_clock)
+        current_user = Mock()
+
+        assert token_cache.get_cached_user('token') is None
+        token_cache.set_cached_user('token', current_user)
+
+        assert token_cache.get_cached_user('token') is current_user
+        assert token_cache.get_stats()['hits'] == 1
+        assert token_cache.get_stats()['misses'] == 1
+
+    @staticmethod
+    @pytest.mark.parametrize('exp, expired_at', [
+        (None, 1060),
+        (1030, 1030),
+        (5000, 1060),
+    ])
+    def test_get_cached_user_expires_at_token_exp(fake_clock, exp, expired_at):
+        token_cache = TokenCacheService(max_size=10, max_ttl_in_seconds=60, clock=fake_clock)
+        token_cache.set_cached_user('token', Mock(), exp)
+
+        fake_clock.now = expired_at - 1
+        assert token_cache.get_cached_user('token') is not None
+
+        fake_clock.now = expired_at
+        assert token_cache.get_cached_user('token') is None
+        assert token_cache.get_stats()['entries'] == 0
+
+    @staticmethod
+    def test_set_cached_user_evicts_least_recently_used(fake_clock):
+        token_cache = TokenCacheService(max_size=2, max_ttl_in_seconds=60, clock=fake_clock)
+        token_cache.set_cached_user('t1', Mock())
+        token_cache.set_cached_user('t2', Mock())
+        token_cache.get_cached_user('t1')
+
+        token_cache.set_cached_user('t3', Mock())
+
+        assert token_cache.get_cached_user('t2') is None
+        assert token_cache.get_cached_user('t1') is not None
+        assert token_cache.get_cached_user('t3') is not None
+        assert token_cache.get_stats()['evictions'] == 1
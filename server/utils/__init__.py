@@ -4,6 +4,7 @@
 
 from unicodedata import normalize
 import base64
+import hashlib
 
 
 def normalize_string(string: str):
@@ -13,3 +14,6 @@ def normalize_string(string: str):
 def decode_b64_str(b64_encoded_str) -> bytes:
     return base64.b64decode(b64_encoded_str)
 
+
+def get_strong_etag(content: bytes) -> str:
+    return f'"{hashlib.sha256(content).hexdigest()}"'